@@ -0,0 +1,55 @@
+# accounts/authentication.py
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .services import get_cached_user_row
+
+User = get_user_model()
+
+# Claims added to every token by RoleTokenObtainPairSerializer
+USER_CLAIMS = ('email', 'role')
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that builds request.user from the token claims instead of loading
+    the User row on every request.
+
+    The user is a User instance built with Model.from_db() from the user_id, email and role
+    claims. Fields not in the claims are deferred and load on first access, so the instance still
+    works as a normal user (foreign keys, filters, serializers). With ACCOUNTS_USER_CACHE_TIMEOUT
+    set, which requires the shared Redis cache, the cached user row is merged in and checked for
+    is_active. A save or delete of the user in any process invalidates that row, so a deactivation
+    applies on the next request. With the timeout set to 0
+    the claims are trusted for the lifetime of the token and no cache or database is touched.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = uuid.UUID(str(validated_token[api_settings.USER_ID_CLAIM]))
+        except (KeyError, ValueError):
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        values = {'id': user_id, 'is_active': True}
+        values.update((claim, validated_token[claim]) for claim in USER_CLAIMS if claim in validated_token)
+
+        # Tokens issued before the claims were added always need the row
+        missing_claims = any(claim not in validated_token for claim in USER_CLAIMS)
+        if settings.ACCOUNTS_USER_CACHE_TIMEOUT or missing_claims:
+            row = get_cached_user_row(user_id)
+            if row is None:
+                raise AuthenticationFailed(_('User not found'), code='user_not_found')
+            if not row['is_active']:
+                raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+            values.update(row)
+
+        # from_db() expects the loaded values in concrete field order
+        field_names = [field.attname for field in User._meta.concrete_fields if field.attname in values]
+        return User.from_db(DEFAULT_DB_ALIAS, field_names, [values[name] for name in field_names])
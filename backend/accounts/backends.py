@@ -0,0 +1,48 @@
+# accounts/backends.py
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from rest_framework.request import Request
+
+from .exceptions import SigninCapacityExceeded
+from .services import hash_password_bounded, verify_password_bounded
+
+UserModel = get_user_model()
+
+
+class BoundedHashModelBackend(ModelBackend):
+    """
+    ModelBackend that runs the password hash checks on the bounded signin executor
+    (see verify_password_bounded), so a burst of signins cannot take every thread of a web worker.
+    Hashes made with outdated hasher parameters are upgraded on a successful signin.
+    When the executor is saturated the DRF token signin gets a 429 (SigninCapacityExceeded); other
+    authenticate() callers, such as the admin login, outside DRF's exception handling get a failed
+    signin instead of a 500.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        try:
+            return self._authenticate(username, password, **kwargs)
+        except SigninCapacityExceeded:
+            if isinstance(request, Request):
+                raise
+            return None
+
+    def _authenticate(self, username, password, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Hash anyway so unknown and known emails take the same time (#20760)
+            hash_password_bounded(password)
+            return
+
+        is_correct, must_update = verify_password_bounded(password, user.password)
+        if not is_correct or not self.user_can_authenticate(user):
+            return
+        if must_update:
+            user.password = hash_password_bounded(password)
+            user.save(update_fields=['password'])
+        return user
@@ -0,0 +1,7 @@
+# accounts/exceptions.py
+from rest_framework.exceptions import Throttled
+
+
+class SigninCapacityExceeded(Throttled):
+    default_detail = 'Too many sign-ins are being processed, please retry shortly.'
+    default_code = 'signin_capacity_exceeded'
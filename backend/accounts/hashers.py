@@ -0,0 +1,15 @@
+# accounts/hashers.py
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 with the work factor taken from the PASSWORD_HASH_ITERATIONS setting.
+    It keeps the pbkdf2_sha256 algorithm name, so existing hashes still verify. Hashes with a
+    different iteration count are rehashed to the tuned value on the next successful signin.
+    """
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASH_ITERATIONS
@@ -0,0 +1,79 @@
+# accounts/management/commands/import_users.py
+import csv
+import json
+import os
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.services import IMPORT_CHUNK_SIZE, import_users
+
+
+def read_csv_rows(stream):
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def read_ndjson_rows(stream):
+    for line, text in enumerate(stream, start=1):
+        if not text.strip():
+            continue
+        try:
+            yield line, json.loads(text)
+        except json.JSONDecodeError:
+            # Reported as a malformed row by import_users
+            yield line, None
+
+
+READERS = {'csv': read_csv_rows, 'ndjson': read_ndjson_rows}
+
+
+class Command(BaseCommand):
+    help = (
+        'Imports users from a CSV or NDJSON file with email, role and password (or password_hash) '
+        'columns, streaming the file and inserting users and group links in chunks.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import, or '-' for standard input.")
+        parser.add_argument(
+            '--format', choices=sorted(READERS), default=None,
+            help='File format. Defaults to the file extension (.csv, .ndjson or .jsonl).'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=IMPORT_CHUNK_SIZE,
+            help='Number of users hashed and inserted per transaction.'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count(),
+            help='Processes hashing plain passwords. 0 hashes in this process.'
+        )
+
+    def handle(self, *args, path, format, chunk_size, workers, **options):
+        if format is None:
+            extension = os.path.splitext(path)[1].lower()
+            format = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}.get(extension)
+            if format is None:
+                raise CommandError('Cannot tell the file format, pass --format')
+
+        def progress(result):
+            rate = result['created'] / result['seconds'] if result['seconds'] else 0
+            self.stdout.write(f"Imported {result['created']} user(s)... ({rate:.0f} rows/sec)")
+
+        try:
+            stream = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8')
+        except OSError as e:
+            raise CommandError(f'Cannot open {path}: {e}')
+        with stream:
+            result = import_users(READERS[format](stream), chunk_size=chunk_size, workers=workers, progress=progress)
+
+        for line, reason in result['skipped']:
+            self.stderr.write(f'Line {line}: {reason}')
+
+        rows = result['created'] + len(result['skipped'])
+        rate = rows / result['seconds'] if result['seconds'] else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result['created']} user(s), skipped {len(result['skipped'])} row(s) "
+            f"in {result['seconds']:.2f}s ({rate:.0f} rows/sec)"
+        ))
@@ -1,6 +1,8 @@
 # accounts/models.py
 import uuid  # Add this import
+from django.contrib.postgres.indexes import OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin, Group
 
 
@@ -47,6 +49,15 @@ class User(AbstractBaseUser, PermissionsMixin):
     
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['role']
+
+    class Meta:
+        indexes = [
+            # Case-insensitive prefix search on emails (UserListView ?q=): email__istartswith compiles
+            # to UPPER(email) LIKE 'Q%', which text_pattern_ops can range-scan in any collation.
+            # Not partial on role, as PostgreSQL only gathers the statistics that make the planner
+            # pick this index for expression indexes covering the whole table
+            models.Index(OpClass(Upper('email'), name='text_pattern_ops'), name='user_email_prefix_idx'),
+        ]
     
     objects = UserManager()
     
@@ -56,6 +67,12 @@ class User(AbstractBaseUser, PermissionsMixin):
     @property
     def is_staff(self):
         "Is the user a member of staff?"
-        # Use group-based authorization - staff access granted to superusers and members of Staff group
-        return self.is_superuser or self.groups.filter(name='Staff').exists()
+        # Use group-based authorization - staff access granted to superusers and members of Staff group.
+        # Membership is looked up once per instance (each request loads its own user) and reset by
+        # accounts.signals when this user's groups change.
+        if self.is_superuser:
+            return True
+        if '_is_staff_member' not in self.__dict__:
+            self._is_staff_member = self.groups.filter(name='Staff').exists()
+        return self._is_staff_member
 
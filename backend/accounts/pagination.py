@@ -0,0 +1,13 @@
+# accounts/pagination.py
+from rest_framework.pagination import CursorPagination
+
+
+class EmailCursorPagination(CursorPagination):
+    """
+    Cursor pagination over the unique email, so every page is a range scan from the
+    previous page's last email and there are no ties to page through with an OFFSET.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = 'email'
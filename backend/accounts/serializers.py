@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from .services import create_user_with_group
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
 User = get_user_model()
 
@@ -24,10 +25,22 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
 class UserListSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
-        fields = ['id', 'email', 'role', 'created_at']
+        fields = ['id', 'email']
 
 class UserDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'email', 'role', 'created_at', 'updated_at']
-      
\ No newline at end of file
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Adds the email and role claims read by ClaimsJWTAuthentication. Access tokens minted
+    from the refresh token on token/refresh/ inherit them.
+    """
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token['email'] = user.email
+        token['role'] = user.role
+        return token
+
@@ -1,6 +1,18 @@
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import threading
+import time
+
+import django
 from django.db import transaction
 from django.contrib.auth.models import Group
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import identify_hasher, make_password, verify_password
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from .exceptions import SigninCapacityExceeded
 
 User = get_user_model()
 
@@ -24,4 +36,213 @@ def create_user_with_group(email, password, role):
             group = Group.objects.create(name=group_name)
             user.groups.add(group)
 
-        return user
\ No newline at end of file
+        return user
+
+# Columns kept in the user cache, enough to authenticate and to render the user without a query
+USER_CACHE_FIELDS = ('id', 'email', 'role', 'is_active', 'is_superuser', 'created_at', 'updated_at')
+
+
+def _user_cache_key(user_id):
+    return f'accounts:user:{user_id}'
+
+
+def get_cached_user_row(user_id):
+    """
+    Returns the USER_CACHE_FIELDS of a user as a dict, from the cache when present and from the
+    database otherwise (then cached for ACCOUNTS_USER_CACHE_TIMEOUT seconds). None if there is no such user.
+    """
+    key = _user_cache_key(user_id)
+    row = cache.get(key)
+    if row is None:
+        row = User.objects.filter(id=user_id).values(*USER_CACHE_FIELDS).first()
+        if row is not None and settings.ACCOUNTS_USER_CACHE_TIMEOUT:
+            cache.set(key, row, settings.ACCOUNTS_USER_CACHE_TIMEOUT)
+    return row
+
+
+def invalidate_cached_user(user_id):
+    """
+    Drops a user from the cache. Called once every save and delete of a User commits; call it after
+    committing a queryset.update() of users, which sends no signals.
+    """
+    cache.delete(_user_cache_key(user_id))
+
+
+IMPORT_CHUNK_SIZE = 1000
+
+ImportRow = namedtuple('ImportRow', ['line', 'email', 'role', 'password', 'password_hash'])
+
+
+def _parse_import_row(line, row, roles):
+    if not isinstance(row, dict):
+        raise ValueError('malformed row')
+
+    email = User.objects.normalize_email((row.get('email') or '').strip())
+    try:
+        validate_email(email)
+    except ValidationError:
+        raise ValueError(f'invalid email {email!r}')
+
+    role = (row.get('role') or '').strip().lower()
+    if role not in roles:
+        raise ValueError(f'invalid role {role!r}')
+
+    password = row.get('password') or None
+    password_hash = row.get('password_hash') or None
+    if password_hash:
+        try:
+            identify_hasher(password_hash)
+        except ValueError:
+            raise ValueError('unrecognized password_hash')
+    elif not password:
+        raise ValueError('password or password_hash is required')
+
+    return ImportRow(line, email, role, password, password_hash)
+
+
+def _import_user_chunk(chunk, groups, pool, workers, skipped):
+    """
+    Hashes the plain passwords of a chunk (across the process pool when there is one) and inserts
+    its users and their group links with one bulk insert each. Returns the number of users created.
+    Emails taken by a concurrent signup or import after the existence check are skipped too.
+    """
+    existing = set(User.objects.filter(email__in=[item.email for item in chunk]).values_list('email', flat=True))
+    new = []
+    for item in chunk:
+        if item.email in existing:
+            skipped.append((item.line, 'email already exists'))
+        else:
+            new.append(item)
+
+    passwords = [item.password for item in new if not item.password_hash]
+    if pool:
+        hashes = iter(pool.map(make_password, passwords, chunksize=max(1, len(passwords) // (workers * 4))))
+    else:
+        hashes = map(make_password, passwords)
+
+    users = [
+        User(email=item.email, role=item.role, password=item.password_hash or next(hashes))
+        for item in new
+    ]
+    with transaction.atomic():
+        User.objects.bulk_create(users, batch_size=IMPORT_CHUNK_SIZE, ignore_conflicts=True)
+        # ON CONFLICT DO NOTHING reports nothing back; the ids are set client side, so the rows
+        # that made it in are the ids now present
+        inserted = set(User.objects.filter(id__in=[user.id for user in users]).values_list('id', flat=True))
+        User.groups.through.objects.bulk_create(
+            [User.groups.through(user_id=user.id, group_id=groups[user.role].id) for user in users if user.id in inserted],
+            batch_size=IMPORT_CHUNK_SIZE
+        )
+    for item, user in zip(new, users):
+        if user.id not in inserted:
+            skipped.append((item.line, 'email already exists'))
+    return len(inserted)
+
+
+def import_users(rows, chunk_size=IMPORT_CHUNK_SIZE, workers=0, progress=None):
+    """
+    Creates users from an iterable of (line, row) pairs, row being a dict with email, role and either
+    a plain password or an already hashed password_hash. Rows are consumed as a stream, chunk_size at a
+    time: plain passwords are hashed across `workers` processes (in process when 0), role groups are
+    resolved once, and each chunk is inserted in its own transaction. Invalid rows, emails seen earlier
+    in the stream and existing users are skipped. progress, if given, is called with the running result
+    after every chunk.
+    Returns {'created': int, 'skipped': [(line, reason)], 'seconds': float}.
+    """
+    started = time.perf_counter()
+    roles = {role for role, _ in User.ROLE_CHOICES}
+    groups = {role: Group.objects.get_or_create(name=role.capitalize())[0] for role in roles}
+    result = {'created': 0, 'skipped': [], 'seconds': 0.0}
+    seen = set()
+
+    def flush(chunk):
+        result['created'] += _import_user_chunk(chunk, groups, pool, workers, result['skipped'])
+        result['seconds'] = time.perf_counter() - started
+        if progress:
+            progress(result)
+
+    # Children only hash; django.setup() covers start methods that do not fork
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=django.setup) if workers else None
+    try:
+        chunk = []
+        for line, row in rows:
+            try:
+                item = _parse_import_row(line, row, roles)
+            except ValueError as e:
+                result['skipped'].append((line, str(e)))
+                continue
+            if item.email in seen:
+                result['skipped'].append((line, 'duplicate email in file'))
+                continue
+            seen.add(item.email)
+
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                flush(chunk)
+                chunk = []
+        if chunk:
+            flush(chunk)
+    finally:
+        if pool:
+            pool.shutdown()
+
+    result['seconds'] = time.perf_counter() - started
+    return result
+
+
+# Signin password hashing: SIGNIN_HASH_WORKERS threads per process (hashlib releases the GIL while
+# hashing) and at most SIGNIN_HASH_QUEUE more checks waiting for one. Anything beyond that is
+# rejected with a 429. The signin's request thread still waits for its hash, so the cap bounds how
+# many threads of a gthread worker signins hold; the rest keep serving. Under uvicorn workers all
+# sync views of a worker share one thread, which a waiting signin blocks whatever the cap.
+_signin_lock = threading.Lock()
+_signin_executor = None
+_signin_slots = None
+
+
+def _get_signin_executor():
+    global _signin_executor, _signin_slots
+    with _signin_lock:
+        if _signin_executor is None:
+            _signin_executor = ThreadPoolExecutor(
+                max_workers=settings.SIGNIN_HASH_WORKERS, thread_name_prefix='signin-hash'
+            )
+            _signin_slots = threading.BoundedSemaphore(settings.SIGNIN_HASH_WORKERS + settings.SIGNIN_HASH_QUEUE)
+        return _signin_executor, _signin_slots
+
+
+def reset_signin_executor():
+    """
+    Drops the signin executor so the next signin builds one from the current settings.
+    """
+    global _signin_executor, _signin_slots
+    with _signin_lock:
+        if _signin_executor is not None:
+            _signin_executor.shutdown(wait=False)
+        _signin_executor = _signin_slots = None
+
+
+def _run_signin_hash(fn, *args):
+    executor, slots = _get_signin_executor()
+    if not slots.acquire(blocking=False):
+        raise SigninCapacityExceeded(wait=1)
+    try:
+        return executor.submit(fn, *args).result()
+    finally:
+        slots.release()
+
+
+def verify_password_bounded(password, encoded):
+    """
+    verify_password() on the signin executor: returns (is_correct, must_update).
+    Raises SigninCapacityExceeded when the executor is saturated.
+    """
+    return _run_signin_hash(verify_password, password, encoded)
+
+
+def hash_password_bounded(password):
+    """
+    make_password() on the signin executor, with the current preferred hasher.
+    """
+    return _run_signin_hash(make_password, password)
+
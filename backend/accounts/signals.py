@@ -0,0 +1,31 @@
+# accounts/signals.py
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.core.signals import setting_changed
+from django.contrib.auth import get_user_model
+from .services import invalidate_cached_user, reset_signin_executor
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    # Deactivations, role and email changes must reach the JWT authentication on the next request.
+    # Evicting before the commit would let a request in between cache the old row again.
+    user_id = instance.pk
+    transaction.on_commit(lambda: invalidate_cached_user(user_id), using=kwargs.get('using'))
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def reset_staff_membership(sender, instance, action, reverse, **kwargs):
+    # Changes made from the Group side cannot reach loaded users; they see it on their next request
+    if not reverse and action in ('post_add', 'post_remove', 'post_clear'):
+        instance.__dict__.pop('_is_staff_member', None)
+
+
+@receiver(setting_changed)
+def resize_signin_executor(setting, **kwargs):
+    if setting in ('SIGNIN_HASH_WORKERS', 'SIGNIN_HASH_QUEUE'):
+        reset_signin_executor()
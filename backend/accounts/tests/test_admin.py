@@ -0,0 +1,59 @@
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.db import connection
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+
+User = get_user_model()
+
+def staff_membership_queries(captured):
+    return [
+        query['sql'] for query in captured.captured_queries
+        if '"auth_group"."name" = ' in query['sql'] and 'Staff' in query['sql']
+    ]
+
+class StaffMembershipTests(TestCase):
+    def setUp(self):
+        self.staff_group = Group.objects.create(name='Staff')
+        self.staff_group.permissions.add(Permission.objects.get(codename='view_group'))
+        for i in range(20):
+            Group.objects.create(name=f'Group {i}')
+
+        self.staff = User.objects.create_user(
+            email='staff@test.com',
+            password='password123',
+            role='staff'
+        )
+        self.staff.groups.add(self.staff_group)
+
+    def test_admin_changelist_checks_membership_once(self):
+        self.client.force_login(self.staff)
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(reverse('admin:auth_group_changelist'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(staff_membership_queries(captured)), 1)
+
+    def test_is_staff_is_memoized(self):
+        user = User.objects.get(id=self.staff.id)
+        with self.assertNumQueries(1):
+            for _ in range(5):
+                self.assertTrue(user.is_staff)
+
+    def test_group_changes_reset_membership(self):
+        self.assertTrue(self.staff.is_staff)
+
+        self.staff.groups.remove(self.staff_group)
+        self.assertFalse(self.staff.is_staff)
+
+        self.staff.groups.add(self.staff_group)
+        self.assertTrue(self.staff.is_staff)
+
+        self.staff.groups.clear()
+        self.assertFalse(self.staff.is_staff)
+
+    def test_superuser_needs_no_query(self):
+        superuser = User.objects.create_superuser(email='admin@test.com', password='password123')
+        with self.assertNumQueries(0):
+            self.assertTrue(superuser.is_staff)
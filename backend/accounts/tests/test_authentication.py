@@ -0,0 +1,152 @@
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from accounts.serializers import RoleTokenObtainPairSerializer
+
+User = get_user_model()
+
+# The test process is the only one, so its local cache sees every eviction
+@override_settings(ACCOUNTS_USER_CACHE_TIMEOUT=60)
+class ClaimsJWTAuthenticationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.email = 'user@test.com'
+        self.password = 'password123'
+        self.user = User.objects.create_user(
+            email=self.email,
+            password=self.password,
+            role='user'
+        )
+        self.merchant = User.objects.create_user(
+            email='merchant@test.com',
+            password='password123',
+            role='merchant'
+        )
+        self.me_url = reverse('accounts:me')
+
+    def signin(self, email, password='password123'):
+        response = self.client.post(
+            reverse('accounts:token_obtain_pair'), {'email': email, 'password': password}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def authorize(self, access):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+
+    def test_tokens_carry_email_and_role_claims(self):
+        tokens = self.signin(self.email)
+        for token in (AccessToken(tokens['access']), RefreshToken(tokens['refresh']).access_token):
+            self.assertEqual(token['email'], self.email)
+            self.assertEqual(token['role'], 'user')
+
+    def test_cached_user_skips_user_query(self):
+        self.authorize(self.signin(self.email)['access'])
+        # Cold cache: one user row lookup
+        with self.assertNumQueries(1):
+            response = self.client.get(self.me_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.me_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['email'], self.email)
+        self.assertEqual(response.data['role'], 'user')
+        self.assertEqual(response.data['id'], str(self.user.id))
+        self.assertIsNotNone(response.data['created_at'])
+
+    def test_plan_list_needs_no_user_query(self):
+        self.authorize(self.signin('merchant@test.com')['access'])
+        self.client.get(reverse('plans:list-payment-plans'))
+
+        # The plan list's validators and page, no user query
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('plans:list-payment-plans'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_deactivated_user_is_rejected(self):
+        self.authorize(self.signin(self.email)['access'])
+        self.assertEqual(self.client.get(self.me_url).status_code, status.HTTP_200_OK)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+
+        response = self.client.get(self.me_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_cache_is_evicted_on_commit(self):
+        self.authorize(self.signin(self.email)['access'])
+        self.client.get(self.me_url)
+        key = f'accounts:user:{self.user.id}'
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+            # Still the committed row: evicting now would let a concurrent request cache it again
+            self.assertTrue(cache.get(key)['is_active'])
+
+        self.assertIsNone(cache.get(key))
+
+    def test_deleted_user_is_rejected(self):
+        self.authorize(self.signin(self.email)['access'])
+        self.assertEqual(self.client.get(self.me_url).status_code, status.HTTP_200_OK)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
+
+        response = self.client.get(self.me_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_role_change_applies_before_token_expiry(self):
+        self.authorize(self.signin(self.email)['access'])
+        self.client.get(self.me_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.role = 'merchant'
+            self.user.save()
+
+        response = self.client.get(self.me_url)
+        self.assertEqual(response.data['role'], 'merchant')
+
+    def test_token_without_claims_falls_back_to_user_row(self):
+        self.authorize(AccessToken.for_user(self.user))
+        response = self.client.get(self.me_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['role'], 'user')
+
+    @override_settings(ACCOUNTS_USER_CACHE_TIMEOUT=0)
+    def test_stateless_mode_trusts_claims(self):
+        self.authorize(self.signin('merchant@test.com')['access'])
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('plans:list-payment-plans'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(cache.get(f'accounts:user:{self.merchant.id}'))
+
+    def test_permission_uses_role_claim(self):
+        self.authorize(self.signin(self.email)['access'])
+        response = self.client.get(reverse('accounts:user-list'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.authorize(self.signin('merchant@test.com')['access'])
+        response = self.client.get(reverse('accounts:user-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(ACCOUNTS_USER_CACHE_TIMEOUT=0)
+    def test_me_loads_only_fields_missing_from_claims(self):
+        self.authorize(self.signin(self.email)['access'])
+        # created_at and updated_at are not claims
+        with self.assertNumQueries(1):
+            response = self.client.get(self.me_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['created_at'], self.user.created_at.isoformat().replace('+00:00', 'Z'))
+
+    async def test_me_over_asgi(self):
+        access = RoleTokenObtainPairSerializer.get_token(self.user).access_token
+        response = await self.async_client.get(self.me_url, headers={'Authorization': f'Bearer {access}'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['email'], self.email)
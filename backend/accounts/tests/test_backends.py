@@ -0,0 +1,101 @@
+import threading
+
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.test import override_settings
+from rest_framework import status
+from accounts.services import _run_signin_hash
+
+User = get_user_model()
+
+TUNED_HASHERS = ['accounts.hashers.TunedPBKDF2PasswordHasher', 'django.contrib.auth.hashers.MD5PasswordHasher']
+
+class BoundedHashModelBackendTests(APITestCase):
+    def setUp(self):
+        self.email = 'user@test.com'
+        self.password = 'password123'
+        self.user = User.objects.create_user(
+            email=self.email,
+            password=self.password,
+            role='user'
+        )
+        self.url = reverse('accounts:token_obtain_pair')
+
+    def signin(self, password=None):
+        return self.client.post(self.url, {'email': self.email, 'password': password or self.password}, format='json')
+
+    def test_signin(self):
+        self.assertEqual(self.signin().status_code, status.HTTP_200_OK)
+        self.assertEqual(self.signin('wrong').status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_unknown_email(self):
+        response = self.client.post(self.url, {'email': 'nobody@test.com', 'password': 'x'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_inactive_user(self):
+        User.objects.filter(id=self.user.id).update(is_active=False)
+        self.assertEqual(self.signin().status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(SIGNIN_HASH_WORKERS=1, SIGNIN_HASH_QUEUE=0)
+    def test_saturated_executor_rejects_signin(self):
+        started, release = threading.Event(), threading.Event()
+
+        def hold():
+            started.set()
+            release.wait(5)
+
+        holder = threading.Thread(target=_run_signin_hash, args=(hold,))
+        holder.start()
+        try:
+            started.wait(5)
+            response = self.signin()
+        finally:
+            release.set()
+            holder.join()
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertEqual(self.signin().status_code, status.HTTP_200_OK)
+
+    @override_settings(SIGNIN_HASH_WORKERS=1, SIGNIN_HASH_QUEUE=0)
+    def test_saturated_executor_fails_admin_login(self):
+        staff = User.objects.create_user(email='staff@test.com', password='password123', role='staff')
+        started, release = threading.Event(), threading.Event()
+
+        def hold():
+            started.set()
+            release.wait(5)
+
+        holder = threading.Thread(target=_run_signin_hash, args=(hold,))
+        holder.start()
+        try:
+            started.wait(5)
+            response = self.client.post(reverse('admin:login'), {'username': staff.email, 'password': 'password123'})
+        finally:
+            release.set()
+            holder.join()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.wsgi_request.user.is_authenticated)
+
+    @override_settings(PASSWORD_HASHERS=TUNED_HASHERS, PASSWORD_HASH_ITERATIONS=1000)
+    def test_rehash_to_tuned_iterations(self):
+        self.user.password = make_password(self.password)
+        self.user.save()
+
+        with self.settings(PASSWORD_HASH_ITERATIONS=2000):
+            self.assertEqual(self.signin().status_code, status.HTTP_200_OK)
+            self.user.refresh_from_db()
+            self.assertTrue(self.user.password.startswith('pbkdf2_sha256$2000$'))
+            self.assertEqual(self.signin().status_code, status.HTTP_200_OK)
+
+    @override_settings(PASSWORD_HASHERS=TUNED_HASHERS, PASSWORD_HASH_ITERATIONS=1000)
+    def test_rehash_from_older_hasher(self):
+        self.user.password = make_password(self.password, hasher='md5')
+        self.user.save()
+
+        self.assertEqual(self.signin().status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$1000$'))
@@ -2,6 +2,13 @@ from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
 from accounts.services import create_user_with_group
+from django.contrib.auth.hashers import make_password
+from unittest.mock import patch
+from django.core.management import call_command
+from io import StringIO
+import json
+import os
+import tempfile
 
 User = get_user_model()
 
@@ -48,4 +55,115 @@ class CreateUserWithGroupTests(TestCase):
         self.assertEqual(user.role, role)
         self.assertTrue(Group.objects.filter(name='User').exists())
         self.assertTrue(user.groups.filter(name='User').exists())
-        self.assertEqual(user.groups.count(), 1)
\ No newline at end of file
+        self.assertEqual(user.groups.count(), 1)
+
+
+class ImportUsersCommandTests(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        User.objects.create_user(email='existing@test.com', password='foo', role='user')
+
+    def write(self, name, text):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+    def run_import(self, path, **options):
+        out, err = StringIO(), StringIO()
+        call_command('import_users', path, stdout=out, stderr=err, **options)
+        return out.getvalue(), err.getvalue()
+
+    def test_import_csv(self):
+        path = self.write('users.csv', (
+            'email,role,password\n'
+            'one@test.com,user,secret1\n'
+            'shop@test.com,Merchant,secret2\n'
+        ))
+        out, err = self.run_import(path, workers=0)
+
+        self.assertIn('Imported 2 user(s), skipped 0 row(s)', out)
+        self.assertIn('rows/sec', out)
+        merchant = User.objects.get(email='shop@test.com')
+        self.assertEqual(merchant.role, 'merchant')
+        self.assertTrue(merchant.check_password('secret2'))
+        self.assertEqual(list(merchant.groups.values_list('name', flat=True)), ['Merchant'])
+
+    def test_import_ndjson_with_pre_hashed_passwords(self):
+        rows = [
+            {'email': 'hashed@test.com', 'role': 'user', 'password_hash': make_password('prehashed')},
+            {'email': 'plain@test.com', 'role': 'user', 'password': 'plain'},
+        ]
+        path = self.write('users.ndjson', '\n'.join(json.dumps(row) for row in rows) + '\n')
+        self.run_import(path, workers=0)
+
+        self.assertTrue(User.objects.get(email='hashed@test.com').check_password('prehashed'))
+        self.assertTrue(User.objects.get(email='plain@test.com').check_password('plain'))
+        self.assertEqual(Group.objects.get(name='User').user_set.count(), 2)
+
+    def test_invalid_rows_are_skipped(self):
+        path = self.write('users.jsonl', '\n'.join([
+            json.dumps({'email': 'ok@test.com', 'role': 'user', 'password': 'x'}),
+            json.dumps({'email': 'ok@test.com', 'role': 'user', 'password': 'x'}),
+            json.dumps({'email': 'existing@test.com', 'role': 'user', 'password': 'x'}),
+            json.dumps({'email': 'not-an-email', 'role': 'user', 'password': 'x'}),
+            json.dumps({'email': 'role@test.com', 'role': 'admin', 'password': 'x'}),
+            json.dumps({'email': 'nopass@test.com', 'role': 'user'}),
+            json.dumps({'email': 'badhash@test.com', 'role': 'user', 'password_hash': 'plain'}),
+            '{not json',
+        ]))
+        out, err = self.run_import(path, workers=0, chunk_size=2)
+
+        self.assertIn('Imported 1 user(s), skipped 7 row(s)', out)
+        for reason in [
+            'Line 2: duplicate email in file', 'Line 3: email already exists', "Line 4: invalid email",
+            "Line 5: invalid role 'admin'", 'Line 6: password or password_hash is required',
+            'Line 7: unrecognized password_hash', 'Line 8: malformed row',
+        ]:
+            self.assertIn(reason, err)
+        self.assertEqual(User.objects.count(), 2)
+
+    def test_process_pool_hashing(self):
+        path = self.write('users.csv', 'email,role,password\n' + ''.join(
+            f'user{i}@test.com,user,secret{i}\n' for i in range(10)
+        ))
+        out, err = self.run_import(path, workers=2, chunk_size=4)
+
+        self.assertIn('Imported 10 user(s)', out)
+        self.assertTrue(User.objects.get(email='user7@test.com').check_password('secret7'))
+        self.assertEqual(Group.objects.get(name='User').user_set.count(), 10)
+
+    def test_queries_per_chunk(self):
+        Group.objects.create(name='User')
+        Group.objects.create(name='Merchant')
+        Group.objects.create(name='Staff')
+        path = self.write('users.csv', 'email,role,password\n' + ''.join(
+            f'user{i}@test.com,user,secret{i}\n' for i in range(50)
+        ))
+        # 3 group lookups, then per chunk: existing emails, savepoint, users, inserted ids, group links, release
+        with self.assertNumQueries(3 + 6):
+            self.run_import(path, workers=0, chunk_size=50)
+
+
+    def test_email_taken_after_the_existence_check_is_skipped(self):
+        path = self.write('users.csv', (
+            'email,role,password\n'
+            'race@test.com,user,secret1\n'
+            'other@test.com,user,secret2\n'
+        ))
+
+        def signup_then_hash(password):
+            # A signup commits the email while the chunk is being hashed
+            if not User.objects.filter(email='race@test.com').exists():
+                User.objects.create_user(email='race@test.com', password='mine', role='user')
+            return make_password(password)
+
+        with patch('accounts.services.make_password', signup_then_hash):
+            out, err = self.run_import(path, workers=0)
+
+        self.assertIn('Imported 1 user(s), skipped 1 row(s)', out)
+        self.assertIn('Line 2: email already exists', err)
+        self.assertTrue(User.objects.get(email='race@test.com').check_password('mine'))
+        self.assertTrue(User.objects.get(email='other@test.com').groups.filter(name='User').exists())
+        self.assertFalse(User.objects.get(email='race@test.com').groups.exists())
@@ -3,6 +3,7 @@ from django.urls import reverse
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
 from rest_framework import status
+from django.db import connection
 
 User = get_user_model()
 
@@ -198,13 +199,69 @@ class UserListViewTests(APITestCase):
         response = self.client.get(self.url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)  # Should return both users
-        self.assertNotIn('password', response.data[0])  # Ensure password is not exposed
+        self.assertEqual(len(response.data['results']), 2)  # Should return both users
+        self.assertEqual(set(response.data['results'][0]), {'id', 'email'})  # Only what a merchant needs
         
-        # Verify the returned data contains our test users
-        emails = [user['email'] for user in response.data]
-        self.assertIn(self.user1.email, emails)
-        self.assertIn(self.user2.email, emails)
+        # Verify the returned data contains our test users, ordered by email
+        emails = [user['email'] for user in response.data['results']]
+        self.assertEqual(emails, [self.user1.email, self.user2.email])
+
+    def test_pages_follow_the_cursor(self):
+        """Test the list is paged by email and the next link continues after the last email"""
+        for i in range(3, 6):
+            User.objects.create_user(email=f'user{i}@test.com', password='password123', role='user')
+        self.client.force_authenticate(user=self.merchant)
+
+        emails = []
+        url = f'{self.url}?page_size=2'
+        while url:
+            with self.assertNumQueries(1):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data['results']), 2)
+            emails += [user['email'] for user in response.data['results']]
+            url = response.data['next']
+
+        self.assertEqual(emails, [f'user{i}@test.com' for i in range(1, 6)])
+
+    def test_search_by_email_prefix(self):
+        """Test ?q= keeps customers whose email starts with it, ignoring case"""
+        User.objects.create_user(email='Alice@shop.com', password='password123', role='user')
+        User.objects.create_user(email='alicia@shop.com', password='password123', role='user')
+        User.objects.create_user(email='alice@merchant.com', password='password123', role='merchant')
+        User.objects.create_user(email='bob.alice@shop.com', password='password123', role='user')
+        self.client.force_authenticate(user=self.merchant)
+
+        response = self.client.get(self.url, {'q': 'ALI'})
+        self.assertEqual([user['email'] for user in response.data['results']], ['Alice@shop.com', 'alicia@shop.com'])
+
+        response = self.client.get(self.url, {'q': 'alice@'})
+        self.assertEqual([user['email'] for user in response.data['results']], ['Alice@shop.com'])
+
+        response = self.client.get(self.url, {'q': '  '})
+        self.assertEqual(len(response.data['results']), 5)
+
+    def test_search_uses_email_prefix_index(self):
+        """Test the search is planned as a range scan of the email prefix index"""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO accounts_user (id, password, is_superuser, email, role, is_active, created_at, updated_at)
+                SELECT gen_random_uuid(), '', false, 'customer' || n || '@test.com', 'user', true, now(), now()
+                FROM generate_series(1, 20000) n
+                """
+            )
+            cursor.execute('ANALYZE accounts_user')
+        self.client.force_authenticate(user=self.merchant)
+
+        with self.assertNumQueries(1) as captured:
+            response = self.client.get(self.url, {'q': 'Customer1234'})
+        self.assertEqual(len(response.data['results']), 11)
+
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN ' + captured.captured_queries[0]['sql'])
+            plan = '\n'.join(row[0] for row in cursor.fetchall())
+        self.assertIn('user_email_prefix_idx', plan)
 
     def test_user_cannot_list_users(self):
         """Test that a regular user cannot access the list users endpoint"""
@@ -1,5 +1,6 @@
 from rest_framework import generics, permissions
 from .serializers import UserDetailSerializer, UserRegistrationSerializer, UserListSerializer
+from .pagination import EmailCursorPagination
 from .permissions import IsMerchantRole
 from django.contrib.auth import get_user_model
 
@@ -10,13 +11,30 @@ class UserRegistrationView(generics.CreateAPIView):
     serializer_class = UserRegistrationSerializer
 
 class UserListView(generics.ListAPIView):
+    """
+    Lists customer accounts (role 'user') for merchants picking who to create a plan for, ordered
+    by email one cursor page at a time. ?q= keeps the emails starting with it, case-insensitively,
+    answered by a range scan of the email prefix index.
+    """
     permission_classes = [permissions.IsAuthenticated, IsMerchantRole]
     serializer_class = UserListSerializer
-    queryset = User.objects.filter(role='user')
+    pagination_class = EmailCursorPagination
+
+    def get_queryset(self):
+        queryset = User.objects.filter(role='user').only('id', 'email')
+        query = self.request.query_params.get('q', '').strip()
+        if query:
+            queryset = queryset.filter(email__istartswith=query)
+        return queryset
 
 class MeView(generics.RetrieveAPIView):
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = UserDetailSerializer
 
     def get_object(self):
-        return self.request.user
\ No newline at end of file
+        # request.user is built from the token claims; load any serialized field it does not carry yet
+        user = self.request.user
+        deferred = user.get_deferred_fields() & set(self.get_serializer_class().Meta.fields)
+        if deferred:
+            user.refresh_from_db(fields=deferred)
+        return user
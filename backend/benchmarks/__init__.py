@@ -0,0 +1,20 @@
+"""
+Micro-benchmarks for hot paths of the backend.
+
+Run from the backend directory against a configured database, e.g.:
+    python -m benchmarks.bulk_create
+Every benchmark runs inside a transaction that is rolled back, so no data is left behind.
+"""
+import os
+
+import django
+from django.apps import apps
+from django.test.utils import setup_test_environment
+
+# Configure Django before any benchmark module imports DRF or the apps.
+# The test runner also imports this package while discovering tests, with Django already set up.
+if not apps.ready:
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+    django.setup()
+    # Allows the 'testserver' host used by the request factories
+    setup_test_environment()
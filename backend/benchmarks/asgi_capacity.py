@@ -0,0 +1,237 @@
+# benchmarks/asgi_capacity.py
+"""
+Compares how many concurrent client connections the WSGI deployment (gunicorn gthread workers) and
+the ASGI deployment (gunicorn with uvicorn workers) sustain on the same machine, on the read
+views: the plan list, plan detail and /api/accounts/me/.
+
+Both servers run as subprocesses with the same number of worker processes. A TCP proxy in front
+of PostgreSQL delays every database round-trip by --db-latency-ms, standing in for a database on
+another host. Each of --connections keep-alive clients requests the three endpoints in turn
+for --seconds; a request that fails or takes longer than --timeout counts as an error.
+
+    python -m benchmarks.asgi_capacity --connections 10 50 200 --seconds 10 --db-latency-ms 5
+
+The clients, the proxy and the servers share the machine, so compare the two deployments
+with each other rather than reading the numbers as absolute capacity. The benchmark data
+is committed for the run and deleted afterwards.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from datetime import date
+from decimal import Decimal
+
+from django.conf import settings
+
+from accounts.serializers import RoleTokenObtainPairSerializer
+from benchmarks.utils import create_users, percentile
+from plans.models import PaymentPlan
+from plans.services import create_payment_plan
+
+PLANS = 100
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_latency_proxy(target_host, target_port, latency):
+    """
+    Starts a TCP proxy to the database in a background thread and returns its port. Every chunk
+    sent to the database is held for `latency` seconds first, so each query round-trip pays it once.
+    """
+    port = free_port()
+    ready = threading.Event()
+
+    async def pipe(reader, writer, delay):
+        try:
+            while data := await reader.read(65536):
+                if delay:
+                    await asyncio.sleep(delay)
+                writer.write(data)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def handle(client_reader, client_writer):
+        server_reader, server_writer = await asyncio.open_connection(target_host, target_port)
+        await asyncio.gather(
+            pipe(client_reader, server_writer, latency),
+            pipe(server_reader, client_writer, 0),
+        )
+
+    async def serve():
+        server = await asyncio.start_server(handle, '127.0.0.1', port, backlog=1024)
+        ready.set()
+        async with server:
+            await server.serve_forever()
+
+    threading.Thread(target=asyncio.run, args=(serve(),), daemon=True).start()
+    ready.wait()
+    return port
+
+
+SERVERS = {
+    'wsgi': lambda workers, threads: [
+        'core.wsgi:application', '-k', 'gthread', '--workers', str(workers), '--threads', str(threads)
+    ],
+    'asgi': lambda workers, threads: [
+        'core.asgi:application', '-k', 'uvicorn.workers.UvicornWorker', '--workers', str(workers)
+    ],
+}
+
+
+def start_server(kind, workers, threads, db_port, env=None):
+    port = free_port()
+    env = {
+        **os.environ,
+        'DB_PORT': str(db_port),
+        'DEBUG': 'False',
+        'ALLOWED_HOSTS': '127.0.0.1',
+        'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'core.settings'),
+        **(env or {}),
+    }
+    process = subprocess.Popen(
+        [
+            sys.executable, '-m', 'gunicorn', *SERVERS[kind](workers, threads),
+            '-b', f'127.0.0.1:{port}', '--backlog', '2048', '--log-level', 'warning',
+        ],
+        env=env, cwd=settings.BASE_DIR,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return process, port
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f'{kind} server did not start')
+
+
+async def read_response(reader):
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split()[1])
+    headers = dict(line.lower().split(': ', 1) for line in lines[1:] if line)
+    if 'content-length' in headers:
+        await reader.readexactly(int(headers['content-length']))
+    elif headers.get('transfer-encoding') == 'chunked':
+        while size := int((await reader.readuntil(b'\r\n')).strip(), 16):
+            await reader.readexactly(size + 2)
+        await reader.readuntil(b'\r\n')
+    return status
+
+
+async def client(port, paths, token, stop_at, timeout, samples, counts):
+    reader = writer = None
+    requests = [
+        (
+            f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n'
+            f'Authorization: Bearer {token}\r\nConnection: keep-alive\r\n\r\n'
+        ).encode()
+        for path in paths
+    ]
+    sent = 0
+    while time.perf_counter() < stop_at:
+        request = requests[sent % len(requests)]
+        sent += 1
+        start = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.wait_for(asyncio.open_connection('127.0.0.1', port), timeout)
+            writer.write(request)
+            status = await asyncio.wait_for(read_response(reader), timeout)
+        except (OSError, ValueError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError):
+            counts['errors'] += 1
+            if writer is not None:
+                writer.close()
+            reader = writer = None
+            continue
+        if status == 200:
+            samples.append(time.perf_counter() - start)
+        else:
+            counts['errors'] += 1
+    if writer is not None:
+        writer.close()
+
+
+async def run_scenario(port, paths, token, connections, seconds, timeout):
+    samples = []
+    counts = {'errors': 0}
+    stop_at = time.perf_counter() + seconds
+    await asyncio.gather(*(
+        client(port, paths, token, stop_at, timeout, samples, counts) for _ in range(connections)
+    ))
+    return {
+        'ok': len(samples),
+        'rps': len(samples) / seconds,
+        'p50': percentile(samples, 50) * 1000 if samples else float('nan'),
+        'p99': percentile(samples, 99) * 1000 if samples else float('nan'),
+        'errors': counts['errors'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--connections', type=int, nargs='+', default=[10, 50, 200])
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--timeout', type=float, default=5, help='Seconds before a request counts as an error.')
+    parser.add_argument('--workers', type=int, default=2, help='Worker processes per server.')
+    parser.add_argument('--threads', type=int, default=8, help='Threads per gthread (WSGI) worker.')
+    parser.add_argument('--db-latency-ms', type=float, default=5)
+    args = parser.parse_args()
+
+    merchant = create_users(1, role='merchant', prefix='capacity')[0]
+    user = create_users(1, prefix='capacity')[0]
+    try:
+        for _ in range(PLANS):
+            plan = create_payment_plan(merchant, user, Decimal('400.00'), 4, date.today())
+        paths = ['/api/plans/?page_size=20', f'/api/plans/{plan.id}/', '/api/accounts/me/']
+
+        database = settings.DATABASES['default']
+        db_port = start_latency_proxy(
+            database['HOST'] or '127.0.0.1', int(database['PORT'] or 5432), args.db_latency_ms / 1000
+        )
+
+        print(
+            f'{args.workers} worker(s) per server ({args.threads} threads per WSGI worker), '
+            f'{args.db_latency_ms:g} ms per database round-trip, {args.seconds:.0f}s per scenario, latency in ms'
+        )
+        print(f'{"server":<8}{"conns":>7}{"ok":>9}{"req/s":>9}{"p50":>9}{"p99":>9}{"errors":>8}')
+        for kind in SERVERS:
+            process, port = start_server(kind, args.workers, args.threads, db_port)
+            try:
+                # Warm up every worker (imports, first connections) before measuring
+                token = str(RoleTokenObtainPairSerializer.get_token(user).access_token)
+                asyncio.run(run_scenario(port, paths, token, args.workers * 2, 2, args.timeout))
+                for connections in args.connections:
+                    # Tokens outlive a scenario but not necessarily the whole run
+                    token = str(RoleTokenObtainPairSerializer.get_token(user).access_token)
+                    result = asyncio.run(
+                        run_scenario(port, paths, token, connections, args.seconds, args.timeout)
+                    )
+                    print(
+                        f'{kind:<8}{connections:>7}{result["ok"]:>9}{result["rps"]:>9.1f}'
+                        f'{result["p50"]:>9.2f}{result["p99"]:>9.2f}{result["errors"]:>8}'
+                    )
+            finally:
+                process.terminate()
+                process.wait()
+    finally:
+        PaymentPlan.objects.filter(merchant=merchant).delete()
+        merchant.delete()
+        user.delete()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+# benchmarks/bulk_create.py
+"""
+Compares plans/sec of per-plan create_payment_plan calls against create_payment_plans_bulk.
+
+    python -m benchmarks.bulk_create --sizes 1000 10000
+"""
+import argparse
+from decimal import Decimal
+
+from django.utils import timezone
+
+from benchmarks.utils import create_users, rolled_back, timed
+from plans.services import create_payment_plan, create_payment_plans_bulk
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--installments', type=int, default=4)
+    args = parser.parse_args()
+
+    start_date = timezone.now().date()
+    for size in args.sizes:
+        with rolled_back():
+            merchant = create_users(1, role='merchant')[0]
+            users = create_users(min(size, 1000))
+            plans_data = [
+                {
+                    'user': users[i % len(users)].id,
+                    'total_amount': Decimal('1000.00'),
+                    'number_of_installments': args.installments,
+                    'start_date': start_date,
+                }
+                for i in range(size)
+            ]
+
+            with timed(f'create_payment_plan x {size}', size):
+                for i, item in enumerate(plans_data):
+                    create_payment_plan(
+                        merchant=merchant,
+                        user=users[i % len(users)],
+                        total_amount=item['total_amount'],
+                        number_of_installments=item['number_of_installments'],
+                        start_date=item['start_date']
+                    )
+
+            with timed(f'create_payment_plans_bulk x {size}', size):
+                created, errors = create_payment_plans_bulk(merchant, plans_data)
+            assert not errors and len(created) == size
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+# benchmarks/db_pool.py
+"""
+Measures requests/sec on the read endpoints (plan list, plan detail, me) with each database
+connection mode: a new connection per request (DB_POOL=False, DB_CONN_MAX_AGE=0), persistent
+connections (DB_POOL=False, DB_CONN_MAX_AGE=60) and the psycopg pool (DB_POOL=True).
+
+Reuses the servers, clients and database latency proxy of benchmarks.asgi_capacity, so every
+connection handshake pays --db-latency-ms per round-trip like a database on another host.
+After the pooled run it prints the pool counters of one worker from /api/db-pool/.
+
+    python -m benchmarks.db_pool --server wsgi --connections 16 --seconds 10 --db-latency-ms 2
+"""
+import argparse
+import asyncio
+import http.client
+import json
+from datetime import date
+from decimal import Decimal
+
+from django.conf import settings
+
+from accounts.serializers import RoleTokenObtainPairSerializer
+from benchmarks.asgi_capacity import SERVERS, run_scenario, start_latency_proxy, start_server
+from benchmarks.utils import create_users
+from plans.models import PaymentPlan
+from plans.services import create_payment_plan
+
+PLANS = 100
+
+MODES = [
+    ('new connection', {'DB_POOL': 'False', 'DB_CONN_MAX_AGE': '0'}),
+    ('persistent', {'DB_POOL': 'False', 'DB_CONN_MAX_AGE': '60'}),
+    ('pool', {'DB_POOL': 'True'}),
+]
+
+
+def fetch_pool_stats(port, token):
+    conn = http.client.HTTPConnection('127.0.0.1', port)
+    conn.request('GET', '/api/db-pool/', headers={'Host': '127.0.0.1', 'Authorization': f'Bearer {token}'})
+    response = conn.getresponse()
+    return json.loads(response.read())['pool']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--server', choices=sorted(SERVERS), default='wsgi')
+    parser.add_argument('--connections', type=int, default=16)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--timeout', type=float, default=5)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--db-latency-ms', type=float, default=2)
+    args = parser.parse_args()
+
+    merchant = create_users(1, role='merchant', prefix='dbpool')[0]
+    user = create_users(1, prefix='dbpool')[0]
+    staff = create_users(1, role='staff', prefix='dbpool')[0]
+    try:
+        for _ in range(PLANS):
+            plan = create_payment_plan(merchant, user, Decimal('400.00'), 4, date.today())
+        paths = ['/api/plans/?page_size=20', f'/api/plans/{plan.id}/', '/api/accounts/me/']
+
+        database = settings.DATABASES['default']
+        db_port = start_latency_proxy(
+            database['HOST'] or '127.0.0.1', int(database['PORT'] or 5432), args.db_latency_ms / 1000
+        )
+
+        print(
+            f'{args.server}, {args.workers} worker(s), {args.connections} connections, '
+            f'{args.db_latency_ms:g} ms per database round-trip, {args.seconds:.0f}s per mode, latency in ms'
+        )
+        print(f'{"mode":<16}{"req/s":>9}{"p50":>9}{"p99":>9}{"errors":>8}')
+        for label, env in MODES:
+            process, port = start_server(args.server, args.workers, args.threads, db_port, env=env)
+            try:
+                token = str(RoleTokenObtainPairSerializer.get_token(user).access_token)
+                # Warm up every worker before measuring
+                asyncio.run(run_scenario(port, paths, token, args.workers * 2, 2, args.timeout))
+                result = asyncio.run(
+                    run_scenario(port, paths, token, args.connections, args.seconds, args.timeout)
+                )
+                print(
+                    f'{label:<16}{result["rps"]:>9.1f}{result["p50"]:>9.2f}'
+                    f'{result["p99"]:>9.2f}{result["errors"]:>8}'
+                )
+                if env['DB_POOL'] == 'True':
+                    staff_token = str(RoleTokenObtainPairSerializer.get_token(staff).access_token)
+                    stats = fetch_pool_stats(port, staff_token)
+                    print(
+                        f'  pool of pid {stats["pid"]}: {stats["checkouts"]} checkouts, '
+                        f'{stats["checkouts_queued"]} queued, {stats["wait_ms_avg"]:.2f} ms average wait, '
+                        f'{stats["connections_opened"]} connections opened, {stats["checkout_errors"]} timeouts'
+                    )
+            finally:
+                process.terminate()
+                process.wait()
+    finally:
+        PaymentPlan.objects.filter(merchant=merchant).delete()
+        merchant.delete()
+        user.delete()
+        staff.delete()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+# benchmarks/json_render.py
+"""
+Compares DRF's JSONRenderer and JSONParser with core.renderers.ORJSONRenderer and
+core.parsers.ORJSONParser on responses of --installments installments, 4 per plan:
+
+- plans: the plan list with nested installments, as PaymentPlanListView serializes it
+- calendar: the installment calendar, as InstallmentCalendarView serializes it
+- native: the calendar rows straight from values(), with UUID, date and Decimal objects left to
+  the renderer
+
+Only rendering (and parsing the rendered body back) is timed, as the median of --repeat runs;
+the data is serialized once beforehand.
+
+    python -m benchmarks.json_render --installments 10000 --repeat 20
+
+The plans are created in a transaction that is rolled back.
+"""
+import argparse
+import io
+import statistics
+import time
+from datetime import date
+from decimal import Decimal
+
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from benchmarks.utils import create_users, rolled_back
+from core.parsers import ORJSONParser
+from core.renderers import ORJSONRenderer
+from plans.models import Installment, PaymentPlan
+from plans.rows import installment_rows, plan_rows, serialize_plan_rows
+from plans.serializers import InstallmentCalendarSerializer
+from plans.services import create_payment_plans_bulk
+
+INSTALLMENTS_PER_PLAN = 4
+
+PAIRS = {
+    'json': (JSONRenderer(), JSONParser()),
+    'orjson': (ORJSONRenderer(), ORJSONParser()),
+}
+
+
+def median_ms(run, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--installments', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with rolled_back():
+        merchant = create_users(1, role='merchant')[0]
+        user = create_users(1)[0]
+        plan_data = {
+            'user': user.id,
+            'total_amount': Decimal('400.00'),
+            'number_of_installments': INSTALLMENTS_PER_PLAN,
+            'start_date': date.today(),
+        }
+        create_payment_plans_bulk(merchant, [plan_data] * (args.installments // INSTALLMENTS_PER_PLAN))
+
+        plans = list(plan_rows(PaymentPlan.objects.filter(merchant=merchant).order_by('-created_at', '-id')))
+        calendar = list(
+            Installment.objects.filter(plan__merchant=merchant)
+            .order_by('due_date', 'id')
+            .values('id', 'plan_id', 'due_date', 'amount', 'status')
+        )
+        payloads = {
+            'plans': serialize_plan_rows(plans, installment_rows([row.id for row in plans])),
+            'calendar': InstallmentCalendarSerializer(calendar, many=True).data,
+            'native': calendar,
+        }
+
+    print(f'{args.installments} installments, {INSTALLMENTS_PER_PLAN} per plan, median of {args.repeat} run(s)')
+    print(f'{"payload":<10}{"pair":<8}{"render ms":>11}{"parse ms":>10}{"KB":>8}')
+    for label, payload in payloads.items():
+        rendered = {}
+        for name, (renderer, body_parser) in PAIRS.items():
+            body = rendered[name] = renderer.render(payload)
+            render_ms = median_ms(lambda: renderer.render(payload), args.repeat)
+            parse_ms = median_ms(lambda: body_parser.parse(io.BytesIO(body)), args.repeat)
+            print(f'{label:<10}{name:<8}{render_ms:>11.2f}{parse_ms:>10.2f}{len(body) / 1024:>8.0f}')
+        assert rendered['json'] == rendered['orjson']
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,348 @@
+# benchmarks/load_test.py
+"""
+End-to-end load test of the API with a mix of the main client flows:
+
+- signin: POST /api/accounts/signin/ as a customer
+- refresh_token: POST /api/accounts/token/refresh/ with the customer's refresh token
+- list_plans: GET /api/plans/?page_size=20 as the customer
+- create_plan: POST /api/plans/create/ as a merchant, for the customer
+- pay_installment: POST /api/plans/installments/<id>/pay/ as the customer
+
+Each of --clients virtual clients has its own customer and merchant and signs in once, then
+picks the next flow at random with the --mix weights for --seconds, after --warmup seconds whose
+requests are not recorded. Every client draws from its own generator seeded from --seed, so two
+runs with the same arguments send the same sequence of requests per client. Customers pay
+installments of --plans-per-client plans created for them beforehand; once those are paid,
+pay_installment lists plans instead.
+
+Throughput and p50/p95/p99 latency per flow (successful requests only), status counts and the
+run's settings are written as JSON to --output. Two result files are compared with --compare:
+
+    python -m benchmarks.load_test --clients 20 --seconds 30 --output before.json
+    python -m benchmarks.load_test --clients 20 --seconds 30 --output after.json
+    python -m benchmarks.load_test --compare before.json after.json
+
+By default the API is started locally with gunicorn (--server wsgi, as deployed, or asgi; --workers processes)
+on the configured database. --url targets a stack that is already running instead, which must
+use the same database, as the clients' accounts and plans are committed there for the run and
+deleted afterwards. The clients share the machine with the server, so compare runs made on the
+same machine with each other rather than reading the numbers as absolute capacity.
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import subprocess
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from urllib.parse import urlsplit
+
+from django.conf import settings
+
+from accounts.serializers import RoleTokenObtainPairSerializer
+from benchmarks.asgi_capacity import SERVERS, start_server
+from benchmarks.utils import create_users, percentile
+from plans.models import Installment, PaymentPlan
+from plans.services import create_payment_plans_bulk
+
+PASSWORD = 'load-test-password-123'
+DEFAULT_MIX = 'list_plans=40,create_plan=20,pay_installment=20,refresh_token=15,signin=5'
+# Access tokens live five minutes; clients renew theirs well before
+TOKEN_RENEW_AFTER = 240
+
+
+def parse_mix(value):
+    mix = {}
+    for item in value.split(','):
+        name, _, weight = item.partition('=')
+        if name not in VirtualClient.FLOWS:
+            raise argparse.ArgumentTypeError(f'unknown flow {name!r}, expected one of {", ".join(VirtualClient.FLOWS)}')
+        mix[name] = float(weight)
+    return mix
+
+
+class Recorder:
+    """
+    Collects per-flow latencies of successful requests and status counts from all clients.
+    Nothing is recorded before start(), so warm-up requests are left out.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.recording = False
+        self.samples = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+
+    def start(self):
+        self.recording = True
+
+    def add(self, flow, status, elapsed):
+        if not self.recording:
+            return
+        with self.lock:
+            self.statuses[flow][status] += 1
+            if isinstance(status, int) and 200 <= status < 300:
+                self.samples[flow].append(elapsed)
+
+    def summary(self, seconds):
+        flows = {}
+        for flow in sorted(self.statuses):
+            samples = self.samples[flow]
+            requests = sum(self.statuses[flow].values())
+            flows[flow] = {
+                'requests': requests,
+                'ok': len(samples),
+                'errors': requests - len(samples),
+                'rps': len(samples) / seconds,
+                'p50_ms': percentile(samples, 50) * 1000 if samples else None,
+                'p95_ms': percentile(samples, 95) * 1000 if samples else None,
+                'p99_ms': percentile(samples, 99) * 1000 if samples else None,
+                'max_ms': max(samples) * 1000 if samples else None,
+                'statuses': {str(status): count for status, count in sorted(self.statuses[flow].items(), key=str)},
+            }
+        return flows
+
+
+class VirtualClient:
+    """
+    One keep-alive connection acting for a customer and a merchant.
+    """
+    FLOWS = ('signin', 'refresh_token', 'list_plans', 'create_plan', 'pay_installment')
+
+    def __init__(self, host, port, customer, merchant, installment_ids, rng, recorder, timeout):
+        self.host, self.port, self.timeout = host, port, timeout
+        self.conn = None
+        self.customer = customer
+        self.merchant = merchant
+        self.installment_ids = installment_ids
+        self.rng = rng
+        self.recorder = recorder
+        self.access = self.refresh = None
+        self.access_at = 0
+        self.merchant_access = None
+        self.merchant_access_at = 0
+
+    def request(self, flow, method, path, body=None, token=None):
+        headers = {'Host': self.host, 'Content-Type': 'application/json'}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        payload = json.dumps(body) if body is not None else None
+        start = time.perf_counter()
+        try:
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self.conn.request(method, path, body=payload, headers=headers)
+            response = self.conn.getresponse()
+            content = response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+            self.recorder.add(flow, 'error', time.perf_counter() - start)
+            return None, None
+        self.recorder.add(flow, status, time.perf_counter() - start)
+        return status, content
+
+    def signin(self):
+        status, content = self.request(
+            'signin', 'POST', '/api/accounts/signin/', {'email': self.customer.email, 'password': PASSWORD}
+        )
+        if status == 200:
+            tokens = json.loads(content)
+            self.access, self.refresh = tokens['access'], tokens['refresh']
+            self.access_at = time.monotonic()
+        elif status == 429:
+            # Signins are shed when password hashing is saturated; back off like a real client
+            time.sleep(0.1)
+
+    def refresh_token(self):
+        status, content = self.request(
+            'refresh_token', 'POST', '/api/accounts/token/refresh/', {'refresh': self.refresh}
+        )
+        if status == 200:
+            self.access = json.loads(content)['access']
+            self.access_at = time.monotonic()
+
+    def list_plans(self):
+        self.request('list_plans', 'GET', '/api/plans/?page_size=20', token=self.access)
+
+    def create_plan(self):
+        if time.monotonic() - self.merchant_access_at > TOKEN_RENEW_AFTER:
+            # Merchants are not part of the signin flow, so their tokens are issued directly
+            self.merchant_access = str(RoleTokenObtainPairSerializer.get_token(self.merchant).access_token)
+            self.merchant_access_at = time.monotonic()
+        body = {
+            'user': str(self.customer.id),
+            'total_amount': str(self.rng.choice((100, 250, 400, 1200))) + '.00',
+            'number_of_installments': self.rng.choice((2, 3, 4, 6)),
+            'start_date': date.today().isoformat(),
+        }
+        self.request('create_plan', 'POST', '/api/plans/create/', body, token=self.merchant_access)
+
+    def pay_installment(self):
+        if not self.installment_ids:
+            return self.list_plans()
+        installment_id = self.installment_ids.pop()
+        self.request('pay_installment', 'POST', f'/api/plans/installments/{installment_id}/pay/', {}, token=self.access)
+
+    def run(self, mix, stop):
+        flows, weights = list(mix), list(mix.values())
+        while self.access is None and not stop.is_set():
+            self.signin()
+        while not stop.is_set():
+            if time.monotonic() - self.access_at > TOKEN_RENEW_AFTER:
+                self.refresh_token()
+            getattr(self, self.rng.choices(flows, weights)[0])()
+        if self.conn is not None:
+            self.conn.close()
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, cwd=settings.BASE_DIR, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(before_path, after_path):
+    with open(before_path) as file:
+        before = json.load(file)
+    with open(after_path) as file:
+        after = json.load(file)
+
+    def show(value):
+        if value is None:
+            return '-'
+        return f'{value:.2f}' if isinstance(value, float) else str(value)
+
+    def change(old, new):
+        if old is None or new is None or not old:
+            return ''
+        return f'{(new - old) / old * 100:+.0f}%'
+
+    print(f'{before_path} ({before["commit"] or "?"}) -> {after_path} ({after["commit"] or "?"})')
+    print(f'{"flow":<17}{"metric":<8}{"before":>10}{"after":>10}{"change":>9}')
+    for flow in sorted(set(before['flows']) | set(after['flows'])):
+        old, new = before['flows'].get(flow, {}), after['flows'].get(flow, {})
+        for metric in ('rps', 'p50_ms', 'p95_ms', 'p99_ms', 'errors'):
+            old_value, new_value = old.get(metric), new.get(metric)
+            print(
+                f'{flow:<17}{metric:<8}{show(old_value):>10}{show(new_value):>10}{change(old_value, new_value):>9}'
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'), help='Compare two result files and exit.')
+    parser.add_argument('--url', help='Base URL of a running stack; by default one is started locally.')
+    parser.add_argument('--server', choices=list(SERVERS), default='wsgi')
+    parser.add_argument('--workers', type=int, default=2, help='Worker processes of the local server.')
+    parser.add_argument('--threads', type=int, default=8, help='Threads per gthread (WSGI) worker.')
+    parser.add_argument('--clients', type=int, default=20)
+    parser.add_argument('--seconds', type=float, default=30)
+    parser.add_argument('--warmup', type=float, default=5)
+    parser.add_argument('--mix', type=parse_mix, default=DEFAULT_MIX, help=f'Flow weights (default: {DEFAULT_MIX}).')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--plans-per-client', type=int, default=25)
+    parser.add_argument('--timeout', type=float, default=10, help='Seconds before a request counts as an error.')
+    parser.add_argument('--output', help='Result file (default: load-test-<timestamp>.json).')
+    args = parser.parse_args()
+
+    if args.compare:
+        return compare(*args.compare)
+    mix = args.mix
+    started_at = datetime.now(timezone.utc)
+    output = args.output or f'load-test-{started_at:%Y%m%dT%H%M%SZ}.json'
+
+    customers = create_users(args.clients, prefix='loadtest', password=PASSWORD)
+    merchants = create_users(args.clients, role='merchant', prefix='loadtest')
+    process = None
+    try:
+        installment_ids = []
+        for customer, merchant in zip(customers, merchants):
+            plan = {
+                'user': customer.id,
+                'total_amount': Decimal('400.00'),
+                'number_of_installments': 4,
+                'start_date': date.today(),
+            }
+            create_payment_plans_bulk(merchant, [plan] * args.plans_per_client)
+            ids = Installment.objects.filter(plan__user=customer).order_by('due_date', 'id').values_list('id', flat=True)
+            installment_ids.append([str(pk) for pk in reversed(ids)])
+
+        if args.url:
+            url = urlsplit(args.url)
+            host, port = url.hostname, url.port or 80
+        else:
+            database = settings.DATABASES['default']
+            process, port = start_server(args.server, args.workers, args.threads, int(database['PORT'] or 5432))
+            host = '127.0.0.1'
+
+        recorder = Recorder()
+        stop = threading.Event()
+        clients = [
+            VirtualClient(
+                host, port, customer, merchant, ids, random.Random(f'{args.seed}-{i}'), recorder, args.timeout
+            )
+            for i, (customer, merchant, ids) in enumerate(zip(customers, merchants, installment_ids))
+        ]
+        threads = [threading.Thread(target=client.run, args=(mix, stop)) for client in clients]
+        for thread in threads:
+            thread.start()
+        time.sleep(args.warmup)
+        recorder.start()
+        time.sleep(args.seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+        PaymentPlan.objects.filter(merchant__in=merchants).delete()
+        for user in (*customers, *merchants):
+            user.delete()
+
+    flows = recorder.summary(args.seconds)
+    result = {
+        'started_at': started_at.isoformat(),
+        'commit': git_commit(),
+        'target': args.url or f'local {args.server}, {args.workers} worker(s)',
+        'clients': args.clients,
+        'seconds': args.seconds,
+        'warmup': args.warmup,
+        'mix': mix,
+        'seed': args.seed,
+        'environment': {
+            'python': platform.python_version(),
+            'cpus': os.cpu_count(),
+            'db_pool': settings.DB_POOL,
+            'json_renderer': settings.API_JSON_RENDERER,
+            'password_hash_iterations': settings.PASSWORD_HASH_ITERATIONS,
+        },
+        'requests': sum(flow['requests'] for flow in flows.values()),
+        'rps': sum(flow['rps'] for flow in flows.values()),
+        'flows': flows,
+    }
+    with open(output, 'w') as file:
+        json.dump(result, file, indent=2)
+
+    print(f'{args.clients} client(s), {args.seconds:.0f}s after {args.warmup:.0f}s warm-up, {result["target"]}, latency in ms')
+    print(f'{"flow":<17}{"ok":>8}{"errors":>8}{"req/s":>9}{"p50":>9}{"p95":>9}{"p99":>9}')
+    for name, flow in flows.items():
+        latencies = ''.join(
+            f'{"-" if flow[key] is None else f"{flow[key]:.2f}":>9}' for key in ('p50_ms', 'p95_ms', 'p99_ms')
+        )
+        print(f'{name:<17}{flow["ok"]:>8}{flow["errors"]:>8}{flow["rps"]:>9.1f}{latencies}')
+    print(f'written to {output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+# benchmarks/plan_list_pagination.py
+"""
+Compares PaymentPlanListView latency at page 1 and page 1000 for keyset pagination,
+LIMIT/OFFSET pagination and the old unpaginated response.
+
+    python -m benchmarks.plan_list_pagination --pages 1000 --page-size 50
+"""
+import argparse
+import statistics
+import time
+from decimal import Decimal
+from urllib.parse import parse_qs, urlparse
+
+from django.utils import timezone
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from benchmarks.utils import create_users, rolled_back
+from plans.models import PaymentPlan
+from plans.pagination import CreatedAtKeysetPagination
+from plans.views import PaymentPlanListView
+
+URL = '/api/plans/'
+
+
+def measure(view, request, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = view(request)
+        response.render()
+        assert response.status_code == 200, response.data
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, default=1000)
+    parser.add_argument('--page-size', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    factory = APIRequestFactory()
+    page_size = args.page_size
+    with rolled_back():
+        merchant = create_users(1, role='merchant')[0]
+        user = create_users(1)[0]
+        today = timezone.now().date()
+        PaymentPlan.objects.bulk_create(
+            (
+                PaymentPlan(
+                    merchant=merchant, user=user, total_amount=Decimal('100.00'),
+                    number_of_installments=1, start_date=today
+                )
+                for _ in range(args.pages * page_size)
+            ),
+            batch_size=5000
+        )
+
+        def request(params):
+            req = factory.get(URL, params)
+            force_authenticate(req, user=merchant)
+            return req
+
+        # The keyset cursor of the last page starts right after the last row of the page before it
+        boundary = PaymentPlan.objects.filter(merchant=merchant).order_by('-created_at', '-id')[(args.pages - 1) * page_size - 1]
+        paginator = CreatedAtKeysetPagination()
+        paginator.base_url = URL
+        last_cursor = parse_qs(urlparse(paginator.encode_cursor(boundary)).query)['cursor'][0]
+
+        keyset_view = PaymentPlanListView.as_view()
+        offset_view = PaymentPlanListView.as_view(pagination_class=LimitOffsetPagination)
+        unpaginated_view = PaymentPlanListView.as_view(pagination_class=None)
+
+        print(f'{args.pages * page_size} plans, page size {page_size}, median of {args.repeat} (ms)')
+        print(f'keyset page 1:          {measure(keyset_view, request({"page_size": page_size}), args.repeat):8.2f}')
+        print(f'keyset page {args.pages}:       {measure(keyset_view, request({"page_size": page_size, "cursor": last_cursor}), args.repeat):8.2f}')
+        print(f'limit/offset page 1:    {measure(offset_view, request({"limit": page_size}), args.repeat):8.2f}')
+        offset = (args.pages - 1) * page_size
+        print(f'limit/offset page {args.pages}: {measure(offset_view, request({"limit": page_size, "offset": offset}), args.repeat):8.2f}')
+        print(f'unpaginated:            {measure(unpaginated_view, request({}), 1):8.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+# benchmarks/plan_list_serialization.py
+"""
+Compares PaymentPlanListSerializer with the value-row path of plans.rows on plan lists with
+nested installments, from the queries to the rendered JSON.
+
+For every size, reports the CPU time of this process (median of --repeat runs, so time spent
+inside PostgreSQL is not counted), wall time, and the peak memory traced by tracemalloc in a
+separate run, as tracing slows everything down.
+
+    python -m benchmarks.plan_list_serialization --installments 1000 10000 100000
+
+The plans are created in a transaction that is rolled back.
+"""
+import argparse
+import statistics
+import time
+import tracemalloc
+from datetime import date
+from decimal import Decimal
+
+from rest_framework.renderers import JSONRenderer
+
+from benchmarks.utils import create_users, rolled_back
+from plans.models import PaymentPlan
+from plans.rows import installment_rows, plan_rows, serialize_plan_rows
+from plans.serializers import PaymentPlanListSerializer
+from plans.services import create_payment_plans_bulk
+
+INSTALLMENTS_PER_PLAN = 4
+
+
+def with_serializer(plans):
+    queryset = plans.select_related('user', 'merchant').prefetch_related('installments')
+    return JSONRenderer().render(PaymentPlanListSerializer(queryset, many=True).data)
+
+
+def with_rows(plans):
+    rows = list(plan_rows(plans))
+    return JSONRenderer().render(serialize_plan_rows(rows, installment_rows([row.id for row in rows])))
+
+
+def measure(run, plans, repeat):
+    cpu = []
+    wall = []
+    for _ in range(repeat):
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        body = run(plans)
+        cpu.append(time.process_time() - cpu_start)
+        wall.append(time.perf_counter() - wall_start)
+
+    tracemalloc.start()
+    run(plans)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'cpu_ms': statistics.median(cpu) * 1000,
+        'wall_ms': statistics.median(wall) * 1000,
+        'peak_mb': peak / 2**20,
+        'bytes': len(body),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--installments', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    paths = [('serializer', with_serializer), ('rows', with_rows)]
+    print(f'{INSTALLMENTS_PER_PLAN} installments per plan, median of {args.repeat} run(s)')
+    print(f'{"installments":>12}  {"path":<11}{"cpu ms":>10}{"wall ms":>10}{"peak MB":>10}{"KB":>10}')
+    for installments in args.installments:
+        with rolled_back():
+            merchant = create_users(1, role='merchant')[0]
+            user = create_users(1)[0]
+            plan_data = {
+                'user': user.id,
+                'total_amount': Decimal('400.00'),
+                'number_of_installments': INSTALLMENTS_PER_PLAN,
+                'start_date': date.today(),
+            }
+            create_payment_plans_bulk(merchant, [plan_data] * (installments // INSTALLMENTS_PER_PLAN))
+            plans = PaymentPlan.objects.filter(merchant=merchant).order_by('-created_at', '-id')
+
+            results = {label: measure(run, plans, args.repeat) for label, run in paths}
+            assert results['serializer']['bytes'] == results['rows']['bytes']
+            for label, result in results.items():
+                print(
+                    f'{installments:>12}  {label:<11}{result["cpu_ms"]:>10.1f}{result["wall_ms"]:>10.1f}'
+                    f'{result["peak_mb"]:>10.1f}{result["bytes"] / 1024:>10.0f}'
+                )
+
+
+if __name__ == '__main__':
+    main()
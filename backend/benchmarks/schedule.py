@@ -0,0 +1,60 @@
+# benchmarks/schedule.py
+"""
+Compares the per-month Decimal/relativedelta schedule loop that _calculate_installments used to run
+with the vectorized plans.schedule engine, and measures quote_payment_plans end to end.
+
+    python -m benchmarks.schedule --plans 10000 --installments 12
+"""
+import argparse
+from datetime import date, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+
+from dateutil.relativedelta import relativedelta
+
+from benchmarks.utils import timed
+from plans.schedule import build_schedules, to_minor_units
+from plans.services import quote_payment_plans
+
+
+def legacy_schedule(total_amount, number_of_installments, start_date):
+    installment_amount = (total_amount / number_of_installments).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    last_installment_amount = total_amount - installment_amount * (number_of_installments - 1)
+    return [
+        (start_date + relativedelta(months=i), last_installment_amount if i == number_of_installments - 1 else installment_amount)
+        for i in range(number_of_installments)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--plans', type=int, default=10000)
+    parser.add_argument('--installments', type=int, default=12)
+    args = parser.parse_args()
+
+    plans = [
+        {
+            'total_amount': Decimal(100000 + i) / 100,
+            'number_of_installments': args.installments,
+            'start_date': date(2025, 1, 1) + timedelta(days=i % 365),
+        }
+        for i in range(args.plans)
+    ]
+    rows = args.plans * args.installments
+
+    with timed(f'legacy loop, {rows} installments', rows):
+        for plan in plans:
+            legacy_schedule(plan['total_amount'], plan['number_of_installments'], plan['start_date'])
+
+    with timed(f'build_schedules, {rows} installments', rows):
+        build_schedules(
+            [to_minor_units(plan['total_amount']) for plan in plans],
+            [plan['number_of_installments'] for plan in plans],
+            [plan['start_date'] for plan in plans]
+        )
+
+    with timed(f'quote_payment_plans, {args.plans} plans', args.plans):
+        quote_payment_plans(plans)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+# benchmarks/signin_load.py
+"""
+Measures read-endpoint latency (GET /api/accounts/me/) while other clients hammer
+/api/accounts/signin/, served by gunicorn as deployed (--server wsgi: gthread workers) or with
+uvicorn workers (--server asgi).
+
+Runs three scenarios, each on a fresh server: no signin load, signins on the bounded executor
+(SIGNIN_HASH_WORKERS and SIGNIN_HASH_QUEUE from settings), and effectively unbounded signin hashing.
+
+    python -m benchmarks.signin_load --signin-clients 8 --read-clients 2 --seconds 10
+
+The bounded executor caps concurrent hashes, but the request thread still waits for its hash.
+Under gthread workers the other threads keep serving; under uvicorn workers every sync view of a
+worker shares one thread, so reads queue behind the hashes whatever the cap.
+
+Users are committed for the run (the server processes use their own connections) and deleted afterwards.
+"""
+import argparse
+import http.client
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+
+from accounts.serializers import RoleTokenObtainPairSerializer
+from benchmarks.asgi_capacity import SERVERS, start_server
+from benchmarks.utils import percentile
+
+User = get_user_model()
+
+PASSWORD = 'bench-password-123'
+HEADERS = {'Host': '127.0.0.1', 'Content-Type': 'application/json'}
+
+
+def run_scenario(port, access_token, email, signin_clients, read_clients, seconds):
+    stop = threading.Event()
+    read_samples = []
+    signin_counts = {'ok': 0, 'rejected': 0}
+    lock = threading.Lock()
+
+    def reader():
+        conn = http.client.HTTPConnection('127.0.0.1', port)
+        headers = {**HEADERS, 'Authorization': f'Bearer {access_token}'}
+        while not stop.is_set():
+            start = time.perf_counter()
+            conn.request('GET', '/api/accounts/me/', headers=headers)
+            response = conn.getresponse()
+            response.read()
+            assert response.status == 200, response.status
+            with lock:
+                read_samples.append(time.perf_counter() - start)
+
+    def signer():
+        conn = http.client.HTTPConnection('127.0.0.1', port)
+        body = json.dumps({'email': email, 'password': PASSWORD})
+        while not stop.is_set():
+            conn.request('POST', '/api/accounts/signin/', body=body, headers=HEADERS)
+            response = conn.getresponse()
+            response.read()
+            with lock:
+                if response.status == 200:
+                    signin_counts['ok'] += 1
+                elif response.status == 429:
+                    signin_counts['rejected'] += 1
+            if response.status == 429:
+                # Well-behaved clients back off on Retry-After
+                time.sleep(0.1)
+
+    threads = [threading.Thread(target=reader) for _ in range(read_clients)]
+    threads += [threading.Thread(target=signer) for _ in range(signin_clients)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return {
+        'reads': len(read_samples),
+        'p50': percentile(read_samples, 50) * 1000,
+        'p95': percentile(read_samples, 95) * 1000,
+        'p99': percentile(read_samples, 99) * 1000,
+        'signins': signin_counts['ok'],
+        'rejected': signin_counts['rejected'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--server', choices=list(SERVERS), default='wsgi')
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes of the server.')
+    parser.add_argument('--threads', type=int, default=8, help='Threads per gthread (WSGI) worker.')
+    parser.add_argument('--signin-clients', type=int, default=8)
+    parser.add_argument('--read-clients', type=int, default=2)
+    parser.add_argument('--seconds', type=float, default=10)
+    args = parser.parse_args()
+
+    db_port = int(settings.DATABASES['default']['PORT'] or 5432)
+    user = User.objects.create_user(email='signin-bench@bench.local', password=PASSWORD, role='user')
+    try:
+        access_token = str(RoleTokenObtainPairSerializer.get_token(user).access_token)
+        scenarios = [
+            ('no signin load', 0, {}),
+            (
+                f'bounded ({settings.SIGNIN_HASH_WORKERS} workers, queue {settings.SIGNIN_HASH_QUEUE})',
+                args.signin_clients, {}
+            ),
+            (
+                'unbounded',
+                args.signin_clients,
+                {'SIGNIN_HASH_WORKERS': str(args.signin_clients), 'SIGNIN_HASH_QUEUE': str(args.signin_clients)}
+            ),
+        ]
+        print(
+            f'{args.server}, {args.workers} worker(s), {args.read_clients} read client(s), '
+            f'{args.signin_clients} signin client(s), {args.seconds:.0f}s per scenario, read latency in ms'
+        )
+        print(f'{"scenario":<32}{"reads":>8}{"p50":>9}{"p95":>9}{"p99":>9}{"signins":>9}{"429s":>7}')
+        for label, signin_clients, env in scenarios:
+            process, port = start_server(args.server, args.workers, args.threads, db_port, env=env)
+            try:
+                result = run_scenario(
+                    port, access_token, user.email, signin_clients, args.read_clients, args.seconds
+                )
+            finally:
+                process.terminate()
+                process.wait()
+            print(
+                f'{label:<32}{result["reads"]:>8}{result["p50"]:>9.2f}{result["p95"]:>9.2f}'
+                f'{result["p99"]:>9.2f}{result["signins"]:>9}{result["rejected"]:>7}'
+            )
+    finally:
+        User.objects.filter(id=user.id).delete()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+# benchmarks/utils.py
+import time
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+User = get_user_model()
+
+
+@contextmanager
+def rolled_back():
+    """
+    Runs the enclosed block in a transaction that is always rolled back.
+    """
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+@contextmanager
+def timed(label, items=None):
+    """
+    Prints the wall time of the enclosed block, and the throughput when items is given.
+    """
+    start = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - start
+    if items:
+        print(f'{label}: {elapsed:.3f}s ({items / elapsed:,.0f}/sec)')
+    else:
+        print(f'{label}: {elapsed:.3f}s')
+
+
+def create_users(count, role='user', prefix='bench', password=None):
+    """
+    Creates users with a shared, pre-computed password hash so hashing does not dominate setup.
+    Without a password, the users cannot sign in.
+    """
+    password = make_password(password)
+    users = [
+        User(email=f'{prefix}-{role}-{i}@bench.local', role=role, password=password)
+        for i in range(count)
+    ]
+    return User.objects.bulk_create(users)
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
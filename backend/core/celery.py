@@ -1,10 +1,13 @@
 from __future__ import absolute_import, unicode_literals
 from datetime import datetime
+import logging
 import os
+import time
 
 import pytz
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import task_postrun, task_prerun, worker_init, worker_process_shutdown
 
 # Set the default Django settings module for the 'celery' program.
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
@@ -18,6 +21,58 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 # Load task modules from all registered Django app configs.
 app.autodiscover_tasks()
 
+logger = logging.getLogger(__name__)
+
+
+@worker_process_shutdown.connect
+def log_database_pool_stats(**kwargs):
+    # Each prefork child has its own connection pool; report its counters as it exits
+    from .db import get_pool_stats
+
+    stats = get_pool_stats()
+    if stats is not None:
+        logger.info(f'Database pool stats: {stats}')
+
+
+@worker_init.connect
+def start_metrics_server(**kwargs):
+    # Runs in the worker's main process before the prefork children start writing their samples
+    from django.conf import settings
+    from prometheus_client import start_http_server
+
+    from .metrics import metrics_registry, reset_multiprocess_dir
+
+    if settings.WORKER_METRICS_PORT:
+        reset_multiprocess_dir()
+        start_http_server(settings.WORKER_METRICS_PORT, registry=metrics_registry())
+
+
+@worker_process_shutdown.connect
+def mark_metrics_process_dead(pid=None, **kwargs):
+    from prometheus_client import multiprocess
+
+    from .metrics import multiprocess_dir
+
+    if multiprocess_dir() is not None:
+        multiprocess.mark_process_dead(pid or os.getpid())
+
+
+_task_started = {}
+
+
+@task_prerun.connect
+def start_task_timer(task_id=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def observe_task_duration(task_id=None, task=None, state=None, **kwargs):
+    from .metrics import TASK_DURATION
+
+    started = _task_started.pop(task_id, None)
+    if started is not None:
+        TASK_DURATION.labels(task.name, state or 'UNKNOWN').observe(time.perf_counter() - started)
+
 # Define a timezone-aware now function for pickling
 def get_asia_riyadh_now():
     return datetime.now(pytz.timezone('Asia/Riyadh'))
@@ -25,7 +80,7 @@ def get_asia_riyadh_now():
 # Configure periodic tasks
 app.conf.beat_schedule = {
     'update-installment-statuses': {
-        'task': 'plans.tasks.update_installment_statuses',
+        'task': 'plans.tasks.update_installment_statuses_task',
         'schedule': crontab(minute=5, hour=0, nowfun=get_asia_riyadh_now),
     },
     'check-upcoming-installments': {
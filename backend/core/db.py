@@ -0,0 +1,44 @@
+# core/db.py
+import os
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# psycopg_pool only reports counters that are non-zero
+POOL_STAT_NAMES = {
+    'pool_min': 'pool_min',
+    'pool_max': 'pool_max',
+    'pool_size': 'pool_size',
+    'pool_available': 'pool_available',
+    'requests_waiting': 'waiting',
+    'requests_num': 'checkouts',
+    'requests_queued': 'checkouts_queued',
+    'requests_wait_ms': 'wait_ms',
+    'requests_errors': 'checkout_errors',
+    'usage_ms': 'usage_ms',
+    'connections_num': 'connections_opened',
+    'connections_ms': 'connect_ms',
+    'connections_errors': 'connection_errors',
+    'connections_lost': 'connections_lost',
+    'returns_bad': 'returns_bad',
+}
+
+
+def get_pool_stats(alias=DEFAULT_DB_ALIAS):
+    """
+    Returns the connection pool counters of this process for a database, or None when the
+    database is not pooled. Counters are cumulative since the pool opened: checkouts counts
+    connections handed out, checkouts_queued those that had to wait for a free connection,
+    wait_ms the total time spent waiting and checkout_errors the checkouts that timed out.
+    """
+    pool = connections[alias].pool
+    if pool is None:
+        return None
+
+    raw = pool.get_stats()
+    stats = {name: raw.get(key, 0) for key, name in POOL_STAT_NAMES.items()}
+    stats['wait_ms_avg'] = stats['wait_ms'] / stats['checkouts'] if stats['checkouts'] else 0.0
+    stats['usage_ms_avg'] = stats['usage_ms'] / stats['checkouts'] if stats['checkouts'] else 0.0
+    stats['process_type'] = settings.PROCESS_TYPE
+    stats['pid'] = os.getpid()
+    return stats
@@ -0,0 +1,171 @@
+# core/metrics.py
+"""
+Prometheus metrics of the web and Celery processes.
+
+With several processes (gunicorn workers, Celery prefork children) every process writes its
+samples to files in PROMETHEUS_MULTIPROC_DIR and a scrape reads all of them, so /metrics
+reports the totals of the deployment whichever worker answers it. Without that variable, as
+under runserver or in tests, the metrics live in the memory of the process.
+"""
+import os
+import shutil
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess,
+)
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds',
+    'Time from the request reaching Django to the response, per route.',
+    ['method', 'route', 'status'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUEST_QUERIES = Histogram(
+    'http_request_db_queries',
+    'SQL queries run while serving a request, per route.',
+    ['route'],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+REQUEST_QUERY_SECONDS = Histogram(
+    'http_request_db_query_duration_seconds',
+    'Time spent in SQL queries while serving a request, per route.',
+    ['route'],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+TASK_DURATION = Histogram(
+    'celery_task_duration_seconds',
+    'Run time of Celery tasks, per task and final state.',
+    ['task', 'state'],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 900, 1800, 3600),
+)
+
+UNMATCHED_ROUTE = '<unmatched>'
+
+
+class QueryStats:
+    __slots__ = ('count', 'seconds')
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+# The stats of the request being served. The middleware sets it; sync_to_async copies the
+# context into the thread running the view under ASGI, so its queries count too.
+_request_queries = ContextVar('request_queries', default=None)
+
+
+def record_queries(execute, sql, params, many, context):
+    """
+    Database execute wrapper adding each query and its duration to the current request's stats.
+    """
+    stats = _request_queries.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.count += 1
+        stats.seconds += time.perf_counter() - start
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """
+    connection_created receiver wrapping the queries of every connection with record_queries.
+    Pooled connections are set up on every checkout, so the wrapper is only added once.
+    """
+    if record_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_queries)
+
+
+class MetricsMiddleware:
+    """
+    Observes the latency of every request and the number and time of its SQL queries, labelled
+    by the URL pattern that matched, e.g. api/plans/<uuid:id>/, so the label set stays bounded.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = QueryStats()
+        token = _request_queries.set(stats)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_queries.reset(token)
+        self.observe(request, response, time.perf_counter() - start, stats)
+        return response
+
+    async def __acall__(self, request):
+        stats = QueryStats()
+        token = _request_queries.set(stats)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_queries.reset(token)
+        self.observe(request, response, time.perf_counter() - start, stats)
+        return response
+
+    def observe(self, request, response, seconds, stats):
+        match = request.resolver_match
+        route = match.route if match else UNMATCHED_ROUTE
+        REQUEST_LATENCY.labels(request.method, route, response.status_code).observe(seconds)
+        REQUEST_QUERIES.labels(route).observe(stats.count)
+        REQUEST_QUERY_SECONDS.labels(route).observe(stats.seconds)
+
+
+def multiprocess_dir():
+    return os.environ.get('PROMETHEUS_MULTIPROC_DIR') or None
+
+
+def reset_multiprocess_dir():
+    """
+    Empties PROMETHEUS_MULTIPROC_DIR, creating it if needed. Called once as a server starts,
+    before any worker writes to it, so the totals of a previous run are not carried over.
+    """
+    path = multiprocess_dir()
+    if path is None:
+        return
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+
+def metrics_registry():
+    """
+    The registry to expose: all processes sharing PROMETHEUS_MULTIPROC_DIR, or this process.
+    """
+    if multiprocess_dir() is None:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint. Scrapes must send METRICS_TOKEN as a bearer token; without a
+    token the endpoint is open under DEBUG and closed otherwise.
+    """
+    if settings.METRICS_TOKEN:
+        expected = f'Bearer {settings.METRICS_TOKEN}'
+        if not constant_time_compare(request.headers.get('Authorization', ''), expected):
+            return HttpResponseForbidden()
+    elif not settings.DEBUG:
+        return HttpResponseForbidden()
+    return HttpResponse(generate_latest(metrics_registry()), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,16 @@
+# core/parsers.py
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+
+class ORJSONParser(JSONParser):
+    """
+    Parses JSON request bodies with orjson. Bodies must be UTF-8, as RFC 8259 requires; NaN and
+    Infinity are rejected, as JSONParser does under STRICT_JSON.
+    """
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
@@ -0,0 +1,277 @@
+# core/profiling.py
+"""
+On-demand profiling of single requests for staff.
+
+A request from a staff user carrying the X-Profile header is served under a pyinstrument
+sampling profiler while every SQL statement it runs is recorded with its duration and the
+project code that issued it. The profile is written to REQUEST_PROFILE_DIR as <id>.json
+(request, timings, statements) and <id>.html (the pyinstrument call tree), and the response
+names it in X-Profile-Id and summarizes it in Server-Timing. The statement recorder wraps
+the database connections of the serving thread for the profiled request only, so without
+the header a request costs one header lookup; with REQUEST_PROFILING off the middleware is
+not installed at all.
+
+Under ASGI the profiler samples the event loop thread: views, which ASGI runs in sync_to_async,
+show up as time awaiting them, and their statements are in the statement list.
+"""
+import os
+import re
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import orjson
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import Http404
+from pyinstrument import Profiler
+from rest_framework.exceptions import AuthenticationFailed
+
+from accounts.authentication import ClaimsJWTAuthentication
+from accounts.permissions import IsStaffRole
+from . import metrics
+
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+PROFILE_ID_RE = re.compile(r'^\d{8}T\d{6}-[0-9a-f]{8}$')
+# Frames of the project code kept as the origin of each statement, innermost last
+STACK_DEPTH = 6
+
+_SITE_PACKAGES = (f'{os.sep}site-packages{os.sep}', f'{os.sep}dist-packages{os.sep}')
+# The middleware and execute wrappers every statement passes through
+_PLUMBING_FILES = (__file__, metrics.__file__)
+
+
+class RequestProfile:
+    __slots__ = ('statements',)
+
+    def __init__(self):
+        self.statements = []
+
+
+# The profile of the request being served, copied by sync_to_async like core.metrics' stats
+_request_profile = ContextVar('request_profile', default=None)
+
+
+def _project_stack():
+    base_dir = str(settings.BASE_DIR)
+    stack = []
+    frame = sys._getframe(1)
+    while frame is not None and len(stack) < STACK_DEPTH:
+        filename = frame.f_code.co_filename
+        if (
+            filename.startswith(base_dir) and filename not in _PLUMBING_FILES
+            and not any(part in filename for part in _SITE_PACKAGES)
+        ):
+            stack.append(f'{os.path.relpath(filename, base_dir)}:{frame.f_lineno} in {frame.f_code.co_name}')
+        frame = frame.f_back
+    return stack[::-1]
+
+
+def record_statements(execute, sql, params, many, context):
+    """
+    Database execute wrapper recording each statement of a profiled request with its duration,
+    the number of its parameters and the project frames that issued it. The parameter values are
+    not kept: they carry password hashes and personal data into the profile files. A thread shared by several requests may run
+    statements of others while it is installed; those are passed through.
+    """
+    profile = _request_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.statements.append({
+            'sql': sql,
+            # Parameters per statement, or parameter sets of an executemany batch
+            'params': len(params) if params is not None else 0,
+            'many': many,
+            'ms': round((time.perf_counter() - start) * 1000, 3),
+            'database': context['connection'].alias,
+            'stack': _project_stack(),
+        })
+
+
+def wrap_connections():
+    """
+    Wraps the queries of the calling thread's connections with record_statements and returns them
+    for unwrap_connections. Connections are per thread, so under ASGI this runs in sync_to_async
+    next to the ORM calls of the request.
+    """
+    wrapped = [connections[alias] for alias in connections]
+    for connection in wrapped:
+        connection.execute_wrappers.append(record_statements)
+    return wrapped
+
+
+def unwrap_connections(wrapped):
+    for connection in wrapped:
+        # Removed by identity: connection_created receivers may have appended wrappers since
+        connection.execute_wrappers.remove(record_statements)
+
+
+def is_profiling_requested(request):
+    """
+    Whether the request asks for a profile and comes from a staff user, signed in to the admin
+    or sending a bearer token. Invalid tokens are not profiled; the view rejects them itself.
+    """
+    if PROFILE_HEADER not in request.META:
+        return False
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        try:
+            authenticated = ClaimsJWTAuthentication().authenticate(request)
+        except AuthenticationFailed:
+            return False
+        user = authenticated[0] if authenticated else None
+    return IsStaffRole().has_permission(SimpleNamespace(user=user), None)
+
+
+def profile_path(profile_id, extension):
+    if not PROFILE_ID_RE.match(profile_id):
+        raise Http404
+    return os.path.join(settings.REQUEST_PROFILE_DIR, f'{profile_id}.{extension}')
+
+
+def load_profile(profile_id):
+    try:
+        with open(profile_path(profile_id, 'json'), 'rb') as f:
+            return orjson.loads(f.read())
+    except FileNotFoundError:
+        raise Http404
+
+
+def list_profiles():
+    """
+    Summaries of the stored profiles, newest first.
+    """
+    try:
+        names = os.listdir(settings.REQUEST_PROFILE_DIR)
+    except FileNotFoundError:
+        return []
+    profile_ids = sorted((name[:-5] for name in names if name.endswith('.json')), reverse=True)
+    summaries = []
+    for profile_id in profile_ids:
+        try:
+            profile = load_profile(profile_id)
+        except Http404:
+            # Pruned by another worker since the listing
+            continue
+        profile.pop('statements')
+        summaries.append(profile)
+    return summaries
+
+
+def _prune(directory, keep):
+    if not keep:
+        return
+    profile_ids = sorted({name.rsplit('.', 1)[0] for name in os.listdir(directory) if PROFILE_ID_RE.match(name[:24])})
+    for profile_id in profile_ids[:-keep]:
+        for extension in ('json', 'html'):
+            try:
+                os.remove(os.path.join(directory, f'{profile_id}.{extension}'))
+            except FileNotFoundError:
+                pass
+
+
+def save_profile(request, response, profiler, profile, seconds):
+    """
+    Writes the profile of a request to REQUEST_PROFILE_DIR, keeping the newest
+    REQUEST_PROFILE_KEEP (0 keeps all), and returns its summary.
+    """
+    now = datetime.now(timezone.utc)
+    profile_id = f'{now:%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}'
+    session = profiler.last_session
+    statements = profile.statements
+    summary = {
+        'id': profile_id,
+        'created_at': now.isoformat(),
+        'method': request.method,
+        'path': request.get_full_path(),
+        'status': response.status_code,
+        'user': str(request.user.pk) if getattr(request, 'user', None) and request.user.is_authenticated else None,
+        'duration_ms': round(seconds * 1000, 3),
+        'cpu_ms': round(session.cpu_time * 1000, 3) if session else None,
+        'sql_count': len(statements),
+        'sql_ms': round(sum(statement['ms'] for statement in statements), 3),
+    }
+    directory = settings.REQUEST_PROFILE_DIR
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, f'{profile_id}.json'), 'wb') as f:
+        f.write(orjson.dumps({**summary, 'statements': statements}, default=str))
+    if session:
+        with open(os.path.join(directory, f'{profile_id}.html'), 'w') as f:
+            f.write(profiler.output_html())
+    _prune(directory, settings.REQUEST_PROFILE_KEEP)
+    return summary
+
+
+def _annotate(response, summary):
+    response['X-Profile-Id'] = summary['id']
+    timings = [
+        f'total;dur={summary["duration_ms"]}',
+        f'sql;dur={summary["sql_ms"]};desc="{summary["sql_count"]} statements"',
+    ]
+    if summary['cpu_ms'] is not None:
+        timings.append(f'cpu;dur={summary["cpu_ms"]}')
+    response['Server-Timing'] = ', '.join(timings)
+    return response
+
+
+class RequestProfilingMiddleware:
+    """
+    Profiles the requests of staff users that send the X-Profile header (any value).
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if PROFILE_HEADER not in request.META or not is_profiling_requested(request):
+            return self.get_response(request)
+        profile = RequestProfile()
+        profiler = Profiler(interval=settings.REQUEST_PROFILE_INTERVAL, async_mode='disabled')
+        token = _request_profile.set(profile)
+        wrapped = wrap_connections()
+        start = time.perf_counter()
+        profiler.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.stop()
+            unwrap_connections(wrapped)
+            _request_profile.reset(token)
+        seconds = time.perf_counter() - start
+        return _annotate(response, save_profile(request, response, profiler, profile, seconds))
+
+    async def __acall__(self, request):
+        if PROFILE_HEADER not in request.META or not await sync_to_async(is_profiling_requested)(request):
+            return await self.get_response(request)
+        profile = RequestProfile()
+        profiler = Profiler(interval=settings.REQUEST_PROFILE_INTERVAL, async_mode='enabled')
+        token = _request_profile.set(profile)
+        wrapped = await sync_to_async(wrap_connections)()
+        start = time.perf_counter()
+        profiler.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            profiler.stop()
+            await sync_to_async(unwrap_connections)(wrapped)
+            _request_profile.reset(token)
+        seconds = time.perf_counter() - start
+        summary = await sync_to_async(save_profile)(request, response, profiler, profile, seconds)
+        return _annotate(response, summary)
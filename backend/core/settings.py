@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+from django.core.exceptions import ImproperlyConfigured
 from datetime import timedelta
 from pathlib import Path
 import os
@@ -31,7 +32,7 @@ DEBUG = os.environ.get('DEBUG', 'False') == 'True'
 
 
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = [host for host in os.environ.get('ALLOWED_HOSTS', '').split(',') if host]
 
 
 # Application definition
@@ -43,6 +44,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     # Third-party apps
     'rest_framework',
     'rest_framework_simplejwt',
@@ -50,11 +52,13 @@ INSTALLED_APPS = [
     'drf_yasg',  # Added for Swagger documentation
     'django_celery_beat',  # Added for Celery beat scheduler
     # Your apps
+    'core',
     'accounts', 
     'plans',
 ]
 
 MIDDLEWARE = [
+    'core.metrics.MetricsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -63,6 +67,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.profiling.RequestProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'core.urls'
@@ -114,6 +119,56 @@ else:
         },
     }
 
+# Database connections: each process keeps a psycopg connection pool sized for its process type
+# (PROCESS_TYPE: web, celery_worker or celery_beat); DB_POOL_* variables override the defaults.
+# Health checks cost a round-trip per checkout, so only processes whose connections sit idle
+# between tasks check by default; DB_HEALTH_CHECKS overrides. With DB_POOL=False connections
+# persist for DB_CONN_MAX_AGE seconds instead (0 opens one per request or task), checked before reuse.
+PROCESS_TYPE = os.environ.get('PROCESS_TYPE', 'web')
+DATABASE_POOL_DEFAULTS = {
+    # One connection per gthread thread or in-flight ASGI request
+    'web': {'min_size': 2, 'max_size': 10, 'timeout': 10, 'health_checks': False},
+    # Prefork children run one task at a time
+    'celery_worker': {'min_size': 1, 'max_size': 2, 'timeout': 30, 'health_checks': True},
+    'celery_beat': {'min_size': 0, 'max_size': 1, 'timeout': 30, 'health_checks': True},
+}
+DB_POOL = os.environ.get('DB_POOL', 'True') == 'True'
+if DB_POOL:
+    pool_defaults = DATABASE_POOL_DEFAULTS[PROCESS_TYPE]
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'name': PROCESS_TYPE,
+            'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', pool_defaults['min_size'])),
+            'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', pool_defaults['max_size'])),
+            'timeout': float(os.environ.get('DB_POOL_TIMEOUT', pool_defaults['timeout'])),
+            'max_idle': float(os.environ.get('DB_POOL_MAX_IDLE', 300)),
+            'max_lifetime': float(os.environ.get('DB_POOL_MAX_LIFETIME', 1800)),
+        },
+    }
+    health_checks = pool_defaults['health_checks']
+else:
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.environ.get('DB_CONN_MAX_AGE', 60))
+    health_checks = True
+DATABASES['default']['CONN_HEALTH_CHECKS'] = os.environ.get('DB_HEALTH_CHECKS', str(health_checks)) == 'True'
+
+# Password hashing: PBKDF2 with a tunable work factor. Hashes with another iteration count
+# or an older hasher are upgraded on the next successful signin.
+PASSWORD_HASH_ITERATIONS = int(os.environ.get('PASSWORD_HASH_ITERATIONS', 1_000_000))
+PASSWORD_HASHERS = [
+    'accounts.hashers.TunedPBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+# Signin hashes run on a bounded per-process executor: SIGNIN_HASH_WORKERS at a time and up to
+# SIGNIN_HASH_QUEUE more waiting; further signins get a 429. Each waits on its request thread, so keep
+# the sum below the threads of a gthread web worker (8) for other requests to keep being served.
+AUTHENTICATION_BACKENDS = ['accounts.backends.BoundedHashModelBackend']
+SIGNIN_HASH_WORKERS = int(os.environ.get('SIGNIN_HASH_WORKERS', 2))
+SIGNIN_HASH_QUEUE = int(os.environ.get('SIGNIN_HASH_QUEUE', 4))
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -156,10 +211,24 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 AUTH_USER_MODEL = 'accounts.User'
 
+# JSON rendering and parsing of the API: core.renderers.ORJSONRenderer and core.parsers.ORJSONParser,
+# or DRF's json-module based rest_framework.renderers.JSONRenderer and rest_framework.parsers.JSONParser
+API_JSON_RENDERER = os.environ.get('API_JSON_RENDERER', 'core.renderers.ORJSONRenderer')
+API_JSON_PARSER = os.environ.get('API_JSON_PARSER', 'core.parsers.ORJSONParser')
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
+        'accounts.authentication.ClaimsJWTAuthentication',
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        API_JSON_RENDERER,
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        API_JSON_PARSER,
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 SWAGGER_SETTINGS = {
@@ -183,8 +252,34 @@ SIMPLE_JWT = {
     'USER_AUTHENTICATION_RULE': 'rest_framework_simplejwt.authentication.default_user_authentication_rule', # Default
     'AUTH_HEADER_TYPES': ('Bearer',),
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
+    # Adds the email and role claims that let ClaimsJWTAuthentication skip the user lookup
+    'TOKEN_OBTAIN_SERIALIZER': 'accounts.serializers.RoleTokenObtainPairSerializer',
 }
 
+# Process-local cache unless REDIS_CACHE_URL points at a shared Redis
+if os.environ.get('REDIS_CACHE_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_CACHE_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Seconds a user row stays cached for JWT authentication. 0 trusts the token claims until expiry.
+# Saving or deleting a user evicts its row from the shared cache only: a process-local cache would
+# keep serving a deactivated user in every other process, so caching needs REDIS_CACHE_URL.
+ACCOUNTS_USER_CACHE_TIMEOUT = int(
+    os.environ.get('ACCOUNTS_USER_CACHE_TIMEOUT', 60 if os.environ.get('REDIS_CACHE_URL') else 0)
+)
+if ACCOUNTS_USER_CACHE_TIMEOUT and not os.environ.get('REDIS_CACHE_URL'):
+    raise ImproperlyConfigured('ACCOUNTS_USER_CACHE_TIMEOUT needs a shared cache; set REDIS_CACHE_URL or use 0.')
+
 # Celery Configuration
 CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', 'redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', 'redis://localhost:6379/0')
@@ -193,6 +288,39 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 
+# Upcoming installment reminders: plans.notifications.LogNotificationBackend,
+# EmailNotificationBackend or WebhookOutboxNotificationBackend
+UPCOMING_INSTALLMENT_NOTIFICATION_BACKEND = os.environ.get(
+    'UPCOMING_INSTALLMENT_NOTIFICATION_BACKEND', 'plans.notifications.LogNotificationBackend'
+)
+
+# Prometheus metrics (core.metrics) at /metrics. Processes sharing PROMETHEUS_MULTIPROC_DIR (an
+# environment variable read by prometheus_client) report together; each service needs its own.
+# Scrapes must send METRICS_TOKEN as a bearer token; without one /metrics is only served under
+# DEBUG. Celery workers serve the metrics of their children on WORKER_METRICS_PORT (0 turns that
+# off), which is meant for the internal network only.
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+WORKER_METRICS_PORT = int(os.environ.get('WORKER_METRICS_PORT', 0))
+if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+    # Metrics without labels write their file as soon as they are imported
+    os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+# On-demand request profiling (core.profiling): requests of staff users sending an X-Profile header
+# record their SQL statements and a pyinstrument sample every REQUEST_PROFILE_INTERVAL seconds. The
+# newest REQUEST_PROFILE_KEEP profiles (0 keeps all) stay in REQUEST_PROFILE_DIR of the serving host.
+# Statements are recorded only while a profiled request runs; REQUEST_PROFILING=False removes the
+# middleware.
+REQUEST_PROFILING = os.environ.get('REQUEST_PROFILING', 'True') == 'True'
+REQUEST_PROFILE_DIR = os.environ.get('REQUEST_PROFILE_DIR', str(BASE_DIR / 'profiles'))
+REQUEST_PROFILE_KEEP = int(os.environ.get('REQUEST_PROFILE_KEEP', 200))
+REQUEST_PROFILE_INTERVAL = float(os.environ.get('REQUEST_PROFILE_INTERVAL', 0.001))
+
+# Email, delivered to a local SMTP catcher (mailpit) outside production
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
+EMAIL_HOST = os.environ.get('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.environ.get('EMAIL_PORT', 1025))
+DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'no-reply@bnpl.local')
+
 # Set this to False if you are specifying allowed origins
 if DJANGO_ENVIRONMENT == 'production':
     CORS_ALLOW_ALL_ORIGINS = False
@@ -0,0 +1,11 @@
+from django.test import SimpleTestCase
+
+from core.celery import app
+
+
+class BeatScheduleTests(SimpleTestCase):
+    def test_scheduled_tasks_are_registered(self):
+        app.loader.import_default_modules()
+        for name, entry in app.conf.beat_schedule.items():
+            with self.subTest(name):
+                self.assertIn(entry['task'], app.tasks)
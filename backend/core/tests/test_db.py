@@ -0,0 +1,45 @@
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.db import get_pool_stats
+
+User = get_user_model()
+
+
+class DatabasePoolStatsTests(APITestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(email='staff@test.com', password='p', role='staff')
+        self.user = User.objects.create_user(email='user@test.com', password='p', role='user')
+        self.url = reverse('db-pool-stats')
+
+    def test_pool_stats(self):
+        stats = get_pool_stats()
+        pool_options = settings.DATABASES['default']['OPTIONS']['pool']
+        self.assertEqual(stats['process_type'], settings.PROCESS_TYPE)
+        self.assertEqual(stats['pool_max'], pool_options['max_size'])
+        # The test case's own connection came from the pool
+        self.assertGreaterEqual(stats['checkouts'], 1)
+        self.assertGreaterEqual(stats['connections_opened'], 1)
+        for name in ('wait_ms', 'wait_ms_avg', 'checkouts_queued', 'checkout_errors', 'waiting'):
+            self.assertGreaterEqual(stats[name], 0)
+
+    def test_no_stats_without_pool(self):
+        with mock.patch.object(type(connections['default']), 'pool', new_callable=mock.PropertyMock, return_value=None):
+            self.assertIsNone(get_pool_stats())
+
+    def test_staff_can_read_pool_stats(self):
+        self.client.force_authenticate(user=self.staff)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['pool']['process_type'], settings.PROCESS_TYPE)
+
+    def test_other_roles_cannot_read_pool_stats(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,122 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.serializers import RoleTokenObtainPairSerializer
+from plans.models import Installment
+from plans.services import create_payment_plan
+from plans.tasks import check_upcoming_installments_task, update_installment_statuses_task
+
+User = get_user_model()
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class RequestMetricsTests(APITestCase):
+    def setUp(self):
+        self.merchant = User.objects.create_user(email='m@test.com', password='p', role='merchant')
+        self.user = User.objects.create_user(email='u@test.com', password='p', role='user')
+        self.plan = create_payment_plan(self.merchant, self.user, Decimal('100.00'), 2, date.today())
+
+    def test_latency_and_queries_per_route(self):
+        route = 'api/plans/<uuid:id>/'
+        labels = {'method': 'GET', 'route': route, 'status': '200'}
+        requests = sample('http_request_duration_seconds_count', **labels)
+        queries = sample('http_request_db_queries_sum', route=route)
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse('plans:payment-plan-detail', kwargs={'id': self.plan.id}))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(sample('http_request_duration_seconds_count', **labels), requests + 1)
+        # Validators, then the plan with user and merchant, then its installments
+        self.assertEqual(sample('http_request_db_queries_sum', route=route), queries + 3)
+        self.assertGreater(sample('http_request_db_query_duration_seconds_sum', route=route), 0)
+
+    async def test_queries_over_asgi_are_counted(self):
+        route = 'api/plans/'
+        queries = sample('http_request_db_queries_sum', route=route)
+        access = RoleTokenObtainPairSerializer.get_token(self.user).access_token
+
+        response = await self.async_client.get(
+            reverse('plans:list-payment-plans'), headers={'Authorization': f'Bearer {access}'}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertGreater(sample('http_request_db_queries_sum', route=route), queries)
+
+    def test_unmatched_routes_share_a_label(self):
+        labels = {'method': 'GET', 'route': '<unmatched>', 'status': '404'}
+        before = sample('http_request_duration_seconds_count', **labels)
+        self.client.get('/no/such/page/')
+        self.client.get('/another/missing/page/')
+        self.assertEqual(sample('http_request_duration_seconds_count', **labels), before + 2)
+
+
+class BusinessMetricsTests(APITestCase):
+    def setUp(self):
+        self.merchant = User.objects.create_user(email='m@test.com', password='p', role='merchant')
+        self.user = User.objects.create_user(email='u@test.com', password='p', role='user')
+
+    def test_plans_created_and_installments_paid_count_on_commit(self):
+        created = sample('bnpl_plans_created_total')
+        paid = sample('bnpl_installments_paid_total')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            plan = create_payment_plan(self.merchant, self.user, Decimal('100.00'), 2, date.today())
+        self.assertEqual(sample('bnpl_plans_created_total'), created + 1)
+
+        installment = Installment.objects.filter(plan=plan).first()
+        self.client.force_authenticate(user=self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('plans:pay-installment', kwargs={'id': installment.id}))
+        self.assertEqual(sample('bnpl_installments_paid_total'), paid + 1)
+
+    def test_uncommitted_plans_are_not_counted(self):
+        created = sample('bnpl_plans_created_total')
+        with self.captureOnCommitCallbacks(execute=False):
+            create_payment_plan(self.merchant, self.user, Decimal('100.00'), 2, date.today())
+        self.assertEqual(sample('bnpl_plans_created_total'), created)
+
+
+class TaskMetricsTests(APITestCase):
+    def test_task_durations(self):
+        for task in (update_installment_statuses_task, check_upcoming_installments_task):
+            labels = {'task': task.name, 'state': 'SUCCESS'}
+            before = sample('celery_task_duration_seconds_count', **labels)
+            task.apply()
+            self.assertEqual(sample('celery_task_duration_seconds_count', **labels), before + 1)
+
+
+class MetricsEndpointTests(APITestCase):
+    @override_settings(METRICS_TOKEN='scrape-secret')
+    def test_exposes_metrics(self):
+        self.client.get('/no/such/page/')
+        response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer scrape-secret')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        content = response.content.decode()
+        for name in ('http_request_duration_seconds_bucket', 'bnpl_plans_created_total', 'bnpl_installments_paid_total'):
+            self.assertIn(name, content)
+
+    @override_settings(METRICS_TOKEN='scrape-secret')
+    def test_token_required_when_configured(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer wrong')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer scrape-secret')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(METRICS_TOKEN='')
+    def test_without_token_served_only_under_debug(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, status.HTTP_403_FORBIDDEN)
+        with override_settings(DEBUG=True):
+            self.assertEqual(self.client.get(reverse('metrics')).status_code, status.HTTP_200_OK)
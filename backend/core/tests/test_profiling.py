@@ -0,0 +1,134 @@
+import os
+import shutil
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from accounts.serializers import RoleTokenObtainPairSerializer
+from core.profiling import record_statements
+
+User = get_user_model()
+
+
+def bearer(user):
+    return {'Authorization': f'Bearer {RoleTokenObtainPairSerializer.get_token(user).access_token}'}
+
+
+class RequestProfilingTests(APITestCase):
+    def setUp(self):
+        self.profile_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.profile_dir)
+        settings_override = override_settings(REQUEST_PROFILE_DIR=self.profile_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.staff = User.objects.create_user(email='s@test.com', password='p', role='staff')
+        self.staff.groups.add(Group.objects.get_or_create(name='Staff')[0])
+        self.user = User.objects.create_user(email='u@test.com', password='p', role='user')
+
+    def stored(self):
+        return sorted(os.listdir(self.profile_dir))
+
+    def profile(self, response):
+        return self.client.get(
+            reverse('profile-detail', kwargs={'profile_id': response['X-Profile-Id']}), headers=bearer(self.staff)
+        ).json()
+
+    @override_settings(ACCOUNTS_USER_CACHE_TIMEOUT=0)
+    async def test_staff_requests_over_asgi_are_profiled(self):
+        # Token users carry their claims only, so the view loads the rest of the row
+        response = await self.async_client.get(reverse('accounts:me'), headers={**bearer(self.staff), 'X-Profile': '1'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        profile_id = response['X-Profile-Id']
+        self.assertEqual(self.stored(), [f'{profile_id}.html', f'{profile_id}.json'])
+        self.assertIn('sql;dur=', response['Server-Timing'])
+        self.assertIn('cpu;dur=', response['Server-Timing'])
+
+        profile = self.profile(response)
+        self.assertEqual(profile['path'], '/api/accounts/me/')
+        self.assertEqual(profile['user'], str(self.staff.id))
+        self.assertGreater(profile['sql_count'], 0)
+        self.assertEqual(profile['sql_count'], len(profile['statements']))
+        self.assertTrue(all(statement['ms'] >= 0 for statement in profile['statements']))
+
+    def test_statements_carry_their_origin(self):
+        # The admin signs in with a session; is_staff looks up the Staff group
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('admin:index'), headers={'X-Profile': '1'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        statements = self.profile(response)['statements']
+        group_lookups = [statement for statement in statements if '"auth_group"."name"' in statement['sql']]
+        self.assertEqual(len(group_lookups), 1)
+        self.assertIsInstance(group_lookups[0]['params'], int)
+        self.assertNotIn('Staff', str(statements))
+        self.assertTrue(group_lookups[0]['stack'][-1].startswith('accounts/models.py:'))
+
+    def test_parameter_values_are_not_stored(self):
+        # A staff member profiling a registration
+        response = self.client.post(
+            reverse('accounts:register'), {'email': 'new@test.com', 'password': 'secret', 'role': 'user'},
+            format='json', headers={**bearer(self.staff), 'X-Profile': '1'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        with open(os.path.join(self.profile_dir, f'{response["X-Profile-Id"]}.json')) as f:
+            stored = f.read()
+        self.assertIn('INSERT INTO', stored)
+        self.assertNotIn(User.objects.get(email='new@test.com').password, stored)
+        self.assertNotIn('new@test.com', stored)
+
+    def test_call_tree_is_served(self):
+        response = self.client.get(reverse('db-pool-stats'), headers={**bearer(self.staff), 'X-Profile': '1'})
+        call_tree = self.client.get(
+            reverse('profile-call-tree', kwargs={'profile_id': response['X-Profile-Id']}), headers=bearer(self.staff)
+        )
+        self.assertEqual(call_tree.status_code, status.HTTP_200_OK)
+        self.assertIn(b'pyinstrument', call_tree.content)
+
+    def test_only_staff_with_the_header_are_profiled(self):
+        responses = [
+            self.client.get(reverse('plans:list-payment-plans'), headers={**bearer(self.user), 'X-Profile': '1'}),
+            self.client.get(reverse('plans:list-payment-plans'), headers={'Authorization': 'Bearer bad', 'X-Profile': '1'}),
+            self.client.get(reverse('plans:list-payment-plans'), headers={'X-Profile': '1'}),
+            self.client.get(reverse('plans:list-payment-plans'), headers=bearer(self.staff)),
+        ]
+        for response in responses:
+            self.assertNotIn('X-Profile-Id', response)
+            self.assertNotIn('Server-Timing', response)
+        self.assertEqual(self.stored(), [])
+
+    def test_statements_are_recorded_only_during_profiled_requests(self):
+        self.client.force_login(self.staff)
+        self.assertNotIn(record_statements, connection.execute_wrappers)
+        response = self.client.get(reverse('admin:index'), headers={'X-Profile': '1'})
+
+        self.assertGreater(self.profile(response)['sql_count'], 0)
+        self.assertNotIn(record_statements, connection.execute_wrappers)
+
+    @override_settings(REQUEST_PROFILE_KEEP=2)
+    def test_keeps_the_newest_profiles(self):
+        profile_ids = [
+            self.client.get(reverse('db-pool-stats'), headers={**bearer(self.staff), 'X-Profile': '1'})['X-Profile-Id']
+            for _ in range(3)
+        ]
+        self.assertEqual(len(self.stored()), 4)
+        listed = self.client.get(reverse('profile-list'), headers=bearer(self.staff)).json()
+        self.assertEqual([profile['id'] for profile in listed], sorted(profile_ids, reverse=True)[:2])
+        self.assertNotIn('statements', listed[0])
+
+    def test_profiles_are_staff_only(self):
+        response = self.client.get(reverse('db-pool-stats'), headers={**bearer(self.staff), 'X-Profile': '1'})
+        url = reverse('profile-detail', kwargs={'profile_id': response['X-Profile-Id']})
+
+        self.assertEqual(self.client.get(url, headers=bearer(self.user)).status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.client.get(reverse('profile-list')).status_code, status.HTTP_401_UNAUTHORIZED)
+        missing = reverse('profile-detail', kwargs={'profile_id': '..'})
+        self.assertEqual(self.client.get(missing, headers=bearer(self.staff)).status_code, status.HTTP_404_NOT_FOUND)
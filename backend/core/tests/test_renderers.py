@@ -0,0 +1,81 @@
+import io
+import uuid
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from zoneinfo import ZoneInfo
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework import serializers, status
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from core.parsers import ORJSONParser
+from core.renderers import ORJSONRenderer
+
+User = get_user_model()
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def test_same_bytes_as_json_renderer(self):
+        data = {
+            'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'amount': Decimal('100.10'),
+            'zero': Decimal('0.00'),
+            'due_date': date(2025, 5, 1),
+            'created_at': datetime(2025, 5, 1, 12, 30, 5, 123456, tzinfo=dt_timezone.utc),
+            'local': datetime(2025, 5, 1, 12, 30, tzinfo=ZoneInfo('Europe/Istanbul')),
+            'offset': datetime(2025, 5, 1, 12, 30, tzinfo=dt_timezone(timedelta(hours=-5))),
+            'at': time(9, 15),
+            'counts': {1: 2, 3: 4},
+            'label': gettext_lazy('Due'),
+            'nested': [{'email': 'ü@test.com', 'paid': True, 'next': None, 'ratio': 0.25}],
+            'separators': 'a\u2028b\u2029c',
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_serialized_decimals_stay_strings(self):
+        amount = serializers.DecimalField(max_digits=10, decimal_places=2).to_representation(Decimal('12.5'))
+        self.assertEqual(ORJSONRenderer().render({'amount': amount}), b'{"amount":"12.50"}')
+
+    def test_none_renders_empty(self):
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+    def test_indent_from_accept_header(self):
+        rendered = ORJSONRenderer().render({'a': 1}, 'application/json; indent=4')
+        self.assertEqual(rendered, b'{\n  "a": 1\n}')
+
+
+class ORJSONParserTests(SimpleTestCase):
+    def test_same_data_as_json_parser(self):
+        body = '{"amount": "10.00", "items": [1, 2.5, null, true], "email": "ü@test.com"}'.encode()
+        self.assertEqual(ORJSONParser().parse(io.BytesIO(body)), JSONParser().parse(io.BytesIO(body)))
+
+    def test_invalid_json_raises_parse_error(self):
+        for body in (b'{"a": ', b'{"a": NaN}'):
+            with self.assertRaises(ParseError):
+                ORJSONParser().parse(io.BytesIO(body))
+
+
+class APIJSONTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email='u@test.com', password='p', role='user')
+        self.client.force_authenticate(user=self.user)
+
+    def test_api_renders_with_orjson(self):
+        response = self.client.get(reverse('accounts:me'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(response.accepted_renderer, ORJSONRenderer)
+        self.assertEqual(response.json()['email'], self.user.email)
+
+    def test_invalid_body_is_400(self):
+        merchant = User.objects.create_user(email='m@test.com', password='p', role='merchant')
+        self.client.force_authenticate(user=merchant)
+        response = self.client.post(
+            reverse('plans:create-payment-plan'), data=b'{"user": ', content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
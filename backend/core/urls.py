@@ -19,6 +19,8 @@ from django.urls import path, include
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
+from .metrics import metrics_view
+from .views import DatabasePoolStatsView, ProfileCallTreeView, ProfileDetailView, ProfileListView
 
 schema_view = get_schema_view(
     openapi.Info(
@@ -37,6 +39,11 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/accounts/', include('accounts.urls')),
     path('api/plans/', include('plans.urls')),
+    path('api/db-pool/', DatabasePoolStatsView.as_view(), name='db-pool-stats'),
+    path('api/profiles/', ProfileListView.as_view(), name='profile-list'),
+    path('api/profiles/<str:profile_id>/', ProfileDetailView.as_view(), name='profile-detail'),
+    path('api/profiles/<str:profile_id>/call-tree/', ProfileCallTreeView.as_view(), name='profile-call-tree'),
+    path('metrics', metrics_view, name='metrics'),
     
     # Swagger documentation URLs
     path('swagger<format>/', schema_view.without_ui(cache_timeout=0), name='schema-json'),
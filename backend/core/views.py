@@ -0,0 +1,55 @@
+# core/views.py
+from django.http import Http404, HttpResponse
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from accounts.permissions import IsStaffRole
+from .db import get_pool_stats
+from .profiling import list_profiles, load_profile, profile_path
+
+
+class DatabasePoolStatsView(APIView):
+    """
+    Returns the database connection pool counters of the web worker process that served the
+    request; with several workers, each reports its own pool. pool is null when pooling is off.
+    """
+    permission_classes = [permissions.IsAuthenticated, IsStaffRole]
+
+    def get(self, request, *args, **kwargs):
+        return Response({'pool': get_pool_stats()})
+
+
+class ProfileListView(APIView):
+    """
+    Lists the request profiles stored by the web worker host that served the request, newest
+    first, without their statements.
+    """
+    permission_classes = [permissions.IsAuthenticated, IsStaffRole]
+
+    def get(self, request, *args, **kwargs):
+        return Response(list_profiles())
+
+
+class ProfileDetailView(APIView):
+    """
+    Returns a stored request profile with every SQL statement, its duration and origin.
+    """
+    permission_classes = [permissions.IsAuthenticated, IsStaffRole]
+
+    def get(self, request, profile_id, *args, **kwargs):
+        return Response(load_profile(profile_id))
+
+
+class ProfileCallTreeView(APIView):
+    """
+    Returns the pyinstrument call tree of a stored request profile as an HTML page.
+    """
+    permission_classes = [permissions.IsAuthenticated, IsStaffRole]
+
+    def get(self, request, profile_id, *args, **kwargs):
+        try:
+            with open(profile_path(profile_id, 'html')) as f:
+                return HttpResponse(f.read())
+        except FileNotFoundError:
+            raise Http404
@@ -0,0 +1,18 @@
+# gunicorn.conf.py
+# Read by gunicorn from its working directory. Workers write their Prometheus samples to
+# PROMETHEUS_MULTIPROC_DIR (see core.metrics), which starts empty on every server start.
+
+
+def on_starting(server):
+    from core.metrics import reset_multiprocess_dir
+
+    reset_multiprocess_dir()
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    from core.metrics import multiprocess_dir
+
+    if multiprocess_dir() is not None:
+        multiprocess.mark_process_dead(worker.pid)
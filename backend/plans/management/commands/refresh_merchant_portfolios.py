@@ -0,0 +1,21 @@
+# plans/management/commands/refresh_merchant_portfolios.py
+from django.core.management.base import BaseCommand
+
+from plans.services import refresh_merchant_portfolios
+
+
+class Command(BaseCommand):
+    help = (
+        'Backfills or repairs the merchant portfolio totals behind /api/plans/analytics/ from the '
+        'summary columns of the plans. Run refresh_plan_summaries first if those may have drifted.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--merchant', dest='merchant_ids', action='append', default=None,
+            help='Only refresh the given merchant id. May be repeated.'
+        )
+
+    def handle(self, *args, merchant_ids, **options):
+        refreshed = refresh_merchant_portfolios(merchant_ids)
+        self.stdout.write(self.style.SUCCESS(f'Refreshed {refreshed} merchant portfolio(s)'))
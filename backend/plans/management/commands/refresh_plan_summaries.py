@@ -0,0 +1,47 @@
+# plans/management/commands/refresh_plan_summaries.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from plans.models import PaymentPlan
+from plans.services import refresh_plan_summaries
+
+
+class Command(BaseCommand):
+    help = (
+        'Backfills or repairs the paid_amount, paid_count, late_count and next_due_date '
+        'summary columns of payment plans from their installments.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of plans refreshed per transaction.'
+        )
+        parser.add_argument(
+            '--plan', dest='plan_ids', action='append', default=None,
+            help='Only refresh the given plan id. May be repeated.'
+        )
+
+    def handle(self, *args, batch_size, plan_ids, **options):
+        if plan_ids:
+            updated = refresh_plan_summaries(plan_ids)
+            self.stdout.write(self.style.SUCCESS(f'Refreshed {updated} plan(s)'))
+            return
+
+        # Walk the plans in primary key order so each batch is a short, bounded transaction
+        updated = 0
+        last_id = None
+        while True:
+            plans = PaymentPlan.objects.order_by('id')
+            if last_id is not None:
+                plans = plans.filter(id__gt=last_id)
+            batch = list(plans.values_list('id', flat=True)[:batch_size])
+            if not batch:
+                break
+
+            with transaction.atomic():
+                updated += refresh_plan_summaries(batch)
+            last_id = batch[-1]
+            self.stdout.write(f'Refreshed {updated} plan(s)...')
+
+        self.stdout.write(self.style.SUCCESS(f'Refreshed {updated} plan(s)'))
@@ -0,0 +1,60 @@
+# plans/management/commands/seed_portfolio.py
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from plans.seeding import seed_portfolio
+
+
+class Command(BaseCommand):
+    help = (
+        'Loads synthetic merchants, customers, payment plans and installments for benchmarks with '
+        'PostgreSQL COPY. The same seed, sizes and --today always produce the same rows.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--merchants', type=int, default=100)
+        parser.add_argument('--users', type=int, default=100_000)
+        parser.add_argument(
+            '--plans', type=int, default=1_000_000,
+            help='Number of plans, with about 4.6 installments each on average.'
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Seed of the generated data. Each seed can be loaded once per database.'
+        )
+        parser.add_argument(
+            '--today', type=date.fromisoformat, default=None,
+            help='Reference date (YYYY-MM-DD) of the installment statuses. Defaults to the current date.'
+        )
+        parser.add_argument('--password', default=None, help='Password of every account. Unusable by default.')
+        parser.add_argument(
+            '--defer-indexes', action='store_true',
+            help='Drop the secondary indexes of plans and installments during the load and rebuild them at the end.'
+        )
+
+    def handle(self, *args, merchants, users, plans, seed, today, password, defer_indexes, **options):
+        if merchants < 1 or users < 1:
+            raise CommandError('At least one merchant and one user are needed')
+
+        def progress(result):
+            rate = result['installments'] / result['seconds'] if result['seconds'] else 0
+            self.stdout.write(
+                f"Loaded {result['plans']} plan(s), {result['installments']} installment(s)... "
+                f"({rate:.0f} installments/sec)"
+            )
+
+        try:
+            result = seed_portfolio(
+                merchants, users, plans, seed=seed, today=today, password=password,
+                defer_indexes=defer_indexes, progress=progress
+            )
+        except IntegrityError:
+            raise CommandError(f'Seed {seed} is already loaded; pass another --seed')
+
+        rate = result['installments'] / result['seconds'] if result['seconds'] else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Loaded {result['users']} user(s), {result['plans']} plan(s) and {result['installments']} "
+            f"installment(s) in {result['seconds']:.2f}s ({rate:.0f} installments/sec)"
+        ))
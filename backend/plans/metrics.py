@@ -0,0 +1,13 @@
+# plans/metrics.py
+from django.db import transaction
+from prometheus_client import Counter
+
+PLANS_CREATED = Counter('bnpl_plans_created', 'Payment plans created.')
+INSTALLMENTS_PAID = Counter('bnpl_installments_paid', 'Installments paid.')
+
+
+def count_on_commit(counter, amount=1):
+    """
+    Increments a counter once the current transaction commits, so rolled back work is not counted.
+    """
+    transaction.on_commit(lambda: counter.inc(amount))
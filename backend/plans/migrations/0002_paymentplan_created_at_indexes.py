@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-18 04:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('plans', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='paymentplan',
+            index=models.Index(fields=['merchant', '-created_at', '-id'], name='plan_merchant_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='paymentplan',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='plan_user_created_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2 on 2026-10-18 04:16
+
+from decimal import Decimal
+from django.db import migrations, models
+
+
+def backfill_plan_summaries(apps, schema_editor):
+    # Plans paid in part before the columns existed would otherwise start at paid_count=0 and
+    # never be marked Paid by the payment paths
+    from plans.services import plan_summary_updates
+
+    PaymentPlan = apps.get_model('plans', 'PaymentPlan')
+    Installment = apps.get_model('plans', 'Installment')
+    PaymentPlan.objects.update(**plan_summary_updates(installment_model=Installment))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('plans', '0002_paymentplan_created_at_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='paymentplan',
+            name='late_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='paymentplan',
+            name='next_due_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='paymentplan',
+            name='paid_amount',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=10),
+        ),
+        migrations.AddField(
+            model_name='paymentplan',
+            name='paid_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_plan_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2 on 2026-10-18 04:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('plans', '0003_paymentplan_summary_columns'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatusSweepCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('run_date', models.DateField()),
+                ('partition_start', models.DateField()),
+                ('partition_end', models.DateField()),
+                ('last_due_date', models.DateField(blank=True, null=True)),
+                ('last_installment_id', models.UUIDField(blank=True, null=True)),
+                ('rows_updated', models.IntegerField(default=0)),
+                ('chunks', models.IntegerField(default=0)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('run_date', 'partition_start', 'partition_end'), name='unique_status_sweep_partition')],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2 on 2026-10-18 05:10
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('plans', '0004_statussweepcheckpoint'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='installment',
+            index=models.Index(condition=models.Q(('status', 'Paid'), _negated=True), fields=['due_date', 'id'], name='installment_unpaid_due_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='installment',
+            index=models.Index(fields=['plan', 'status'], name='installment_plan_status_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2 on 2026-10-18 06:02
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('plans', '0006_installmentreminder_webhookoutbox'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='paymentplan',
+            index=models.Index(fields=['merchant', 'updated_at'], name='plan_merchant_updated_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='paymentplan',
+            index=models.Index(fields=['user', 'updated_at'], name='plan_user_updated_idx'),
+        ),
+    ]
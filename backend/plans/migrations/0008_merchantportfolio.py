@@ -0,0 +1,30 @@
+# Generated by Django 5.2 on 2026-10-18 05:27
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('plans', '0007_paymentplan_updated_at_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MerchantPortfolio',
+            fields=[
+                ('merchant', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='portfolio', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('plan_count', models.IntegerField(default=0)),
+                ('installment_count', models.IntegerField(default=0)),
+                ('paid_count', models.IntegerField(default=0)),
+                ('late_count', models.IntegerField(default=0)),
+                ('total_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('collected_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
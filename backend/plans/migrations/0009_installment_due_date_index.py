@@ -0,0 +1,20 @@
+# Generated by Django 5.2 on 2026-10-18 05:38
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('plans', '0008_merchantportfolio'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='installment',
+            index=models.Index(fields=['due_date'], name='installment_due_date_idx'),
+        ),
+    ]
@@ -1,4 +1,8 @@
 from .payment_plan import PaymentPlan
 from .installment import Installment
+from .status_sweep_checkpoint import StatusSweepCheckpoint
+from .installment_reminder import InstallmentReminder
+from .webhook_outbox import WebhookOutbox
+from .merchant_portfolio import MerchantPortfolio
 
-__all__ = ['PaymentPlan', 'Installment']
\ No newline at end of file
+__all__ = ['PaymentPlan', 'Installment', 'StatusSweepCheckpoint', 'InstallmentReminder', 'WebhookOutbox', 'MerchantPortfolio']
@@ -25,5 +25,19 @@ class Installment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Status sweep and upcoming reminders only ever look at unpaid rows
+            models.Index(
+                fields=['due_date', 'id'],
+                condition=~models.Q(status='Paid'),
+                name='installment_unpaid_due_idx'
+            ),
+            # Calendar windows, which include paid rows, joined to the plans for ownership
+            models.Index(fields=['due_date'], name='installment_due_date_idx'),
+            # Per-plan lookups: next unpaid installment and summary refreshes
+            models.Index(fields=['plan', 'status'], name='installment_plan_status_idx'),
+        ]
+
     def __str__(self):
         return f'Installment for Plan {self.plan.id} - Due: {self.due_date} - Status: {self.status}'
\ No newline at end of file
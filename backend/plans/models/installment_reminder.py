@@ -0,0 +1,20 @@
+from django.db import models
+from .installment import Installment
+
+
+class InstallmentReminder(models.Model):
+    """
+    Idempotency record of an upcoming-installment reminder. Written in the same transaction
+    that hands the reminder to the delivery backend, so a re-run never reminds twice.
+    """
+    installment = models.OneToOneField(
+        Installment,
+        on_delete=models.CASCADE,
+        related_name='reminder'
+    )
+    due_date = models.DateField()
+    backend = models.CharField(max_length=100)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'Reminder for Installment {self.installment_id} - Due: {self.due_date} - Via: {self.backend}'
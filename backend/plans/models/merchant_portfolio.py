@@ -0,0 +1,38 @@
+from decimal import Decimal
+from django.conf import settings
+from django.db import models
+
+
+class MerchantPortfolio(models.Model):
+    """
+    Running totals over all payment plans of one merchant, adjusted by plans.services whenever plans
+    are created, installments are paid or turn late, so portfolio analytics read a single row.
+    Repaired by refresh_merchant_portfolios.
+    """
+    merchant = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='portfolio'
+    )
+    plan_count = models.IntegerField(default=0)
+    installment_count = models.IntegerField(default=0)
+    paid_count = models.IntegerField(default=0)
+    late_count = models.IntegerField(default=0)
+    total_amount = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    collected_amount = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def outstanding_amount(self):
+        return self.total_amount - self.collected_amount
+
+    @property
+    def late_ratio(self):
+        # Share of the installments still to be paid that are late
+        unpaid = self.installment_count - self.paid_count
+        return self.late_count / unpaid if unpaid else 0.0
+
+    def __str__(self):
+        return f'Portfolio of merchant {self.merchant_id} - {self.plan_count} plan(s)'
@@ -35,9 +35,29 @@ class PaymentPlan(models.Model):
         default='Active'
     )
 
+    # Summary of the installments, maintained by plans.services and repaired by refresh_plan_summaries
+    paid_amount = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
+    paid_count = models.IntegerField(default=0)
+    late_count = models.IntegerField(default=0)
+    next_due_date = models.DateField(null=True, blank=True)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Back the keyset pagination of the plan list on (created_at, id) per owner
+            models.Index(fields=['merchant', '-created_at', '-id'], name='plan_merchant_created_idx'),
+            models.Index(fields=['user', '-created_at', '-id'], name='plan_user_created_idx'),
+            # Answer the plan list's MAX(updated_at) validator with an index-only scan per owner
+            models.Index(fields=['merchant', 'updated_at'], name='plan_merchant_updated_idx'),
+            models.Index(fields=['user', 'updated_at'], name='plan_user_updated_idx'),
+        ]
+
+    @property
+    def remaining_amount(self):
+        return self.total_amount - self.paid_amount
+
     def __str__(self):
         user_email = self.user.email if self.user else 'N/A'
         return f'Plan for {user_email} by Merchant {self.merchant.email} - Amount: {self.total_amount}'
\ No newline at end of file
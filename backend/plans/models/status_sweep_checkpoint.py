@@ -0,0 +1,31 @@
+from django.db import models
+
+
+class StatusSweepCheckpoint(models.Model):
+    """
+    Progress of one installment status sweep over a due_date partition, so an interrupted
+    sweep resumes after the last committed chunk instead of starting over.
+    """
+    run_date = models.DateField()
+    partition_start = models.DateField()
+    partition_end = models.DateField()
+    # Keyset position of the last installment processed, in (due_date, id) order
+    last_due_date = models.DateField(null=True, blank=True)
+    last_installment_id = models.UUIDField(null=True, blank=True)
+    rows_updated = models.IntegerField(default=0)
+    chunks = models.IntegerField(default=0)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['run_date', 'partition_start', 'partition_end'],
+                name='unique_status_sweep_partition'
+            ),
+        ]
+
+    def __str__(self):
+        return f'Status sweep {self.run_date} [{self.partition_start}, {self.partition_end}) - {self.rows_updated} row(s)'
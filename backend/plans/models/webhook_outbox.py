@@ -0,0 +1,24 @@
+from django.db import models
+
+
+class WebhookOutbox(models.Model):
+    """
+    Webhook events waiting to be delivered. Rows are written inside the transaction that
+    produced the event and picked up by a relay, oldest undelivered first.
+    """
+    event = models.CharField(max_length=100)
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['created_at'],
+                condition=models.Q(delivered_at__isnull=True),
+                name='webhook_outbox_pending_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.event} - Created: {self.created_at} - Delivered: {self.delivered_at}'
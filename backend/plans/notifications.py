@@ -0,0 +1,99 @@
+# plans/notifications.py
+"""
+Delivery backends for upcoming-installment reminders.
+
+The notifier hands each backend a batch of UserReminder tuples, one per user, and records an
+InstallmentReminder per installment in the same transaction. A backend raising rolls the
+batch back so it is retried on the next run. Pick the backend with the
+UPCOMING_INSTALLMENT_NOTIFICATION_BACKEND setting.
+"""
+from collections import namedtuple
+import logging
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils.module_loading import import_string
+
+from .models import WebhookOutbox
+
+logger = logging.getLogger(__name__)
+
+UpcomingInstallment = namedtuple('UpcomingInstallment', ['id', 'plan_id', 'amount', 'due_date', 'merchant_email'])
+UserReminder = namedtuple('UserReminder', ['user_id', 'email', 'days_ahead', 'installments'])
+
+
+def format_reminder(reminder) -> str:
+    items = ', '.join(
+        f'${installment.amount} (Due date: {installment.due_date})' for installment in reminder.installments
+    )
+    return (
+        f'User {reminder.email} has {len(reminder.installments)} installment(s) '
+        f'due in {reminder.days_ahead} days: {items}'
+    )
+
+
+class BaseNotificationBackend:
+    name = None
+
+    def send(self, reminders):
+        raise NotImplementedError('Notification backends must implement send()')
+
+
+class LogNotificationBackend(BaseNotificationBackend):
+    """
+    Logs one line per user.
+    """
+    name = 'log'
+
+    def send(self, reminders):
+        for reminder in reminders:
+            logger.info(f'UPCOMING INSTALLMENT NOTIFICATION: {format_reminder(reminder)}')
+
+
+class EmailNotificationBackend(BaseNotificationBackend):
+    """
+    Emails one message per user over a single connection per batch. Goes through Django's
+    EMAIL_BACKEND, which points at a local SMTP catcher outside production.
+    """
+    name = 'email'
+    subject = 'Upcoming installment reminder'
+
+    def send(self, reminders):
+        messages = [
+            EmailMessage(self.subject, format_reminder(reminder), settings.DEFAULT_FROM_EMAIL, [reminder.email])
+            for reminder in reminders
+        ]
+        get_connection(fail_silently=False).send_messages(messages)
+
+
+class WebhookOutboxNotificationBackend(BaseNotificationBackend):
+    """
+    Writes one webhook event per user to the WebhookOutbox table. Because the outbox rows commit
+    with the reminder records, each reminder is enqueued exactly once.
+    """
+    name = 'webhook_outbox'
+    event = 'installments.upcoming'
+
+    def send(self, reminders):
+        WebhookOutbox.objects.bulk_create([
+            WebhookOutbox(event=self.event, payload={
+                'user_id': str(reminder.user_id),
+                'email': reminder.email,
+                'days_ahead': reminder.days_ahead,
+                'installments': [
+                    {
+                        'id': str(installment.id),
+                        'plan_id': str(installment.plan_id),
+                        'amount': str(installment.amount),
+                        'due_date': installment.due_date.isoformat(),
+                        'merchant_email': installment.merchant_email,
+                    }
+                    for installment in reminder.installments
+                ],
+            })
+            for reminder in reminders
+        ])
+
+
+def get_notification_backend(path=None):
+    return import_string(path or settings.UPCOMING_INSTALLMENT_NOTIFICATION_BACKEND)()
@@ -0,0 +1,101 @@
+# plans/pagination.py
+from base64 import b64decode, b64encode
+from datetime import datetime
+import uuid
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class CreatedAtKeysetPagination(CursorPagination):
+    """
+    Keyset pagination over (created_at, id), newest first.
+
+    Unlike DRF's CursorPagination, which positions on the first ordering field and
+    falls back to an OFFSET for ties, every page here is a single range scan on the
+    (owner, created_at, id) indexes of PaymentPlan, so page 1000 costs the same as page 1.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    ordering = ('-created_at', '-id')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset, position = self.page_queryset(queryset, request)
+        return self.set_page(list(queryset[:self.page_size + 1]), position)
+
+    def page_queryset(self, queryset, request):
+        """
+        Returns the queryset filtered and ordered from the cursor position, and the position.
+        One row past the page size is fetched to tell whether another page follows.
+        """
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.request = request
+
+        position, self.reverse = self.decode_cursor(request)
+        if position is None:
+            queryset = queryset.order_by('-created_at', '-id')
+        else:
+            created_at, pk = position
+            if self.reverse:
+                # The outer created_at bound keeps the scan a plain index range
+                queryset = queryset.filter(
+                    Q(created_at__gte=created_at) & (Q(created_at__gt=created_at) | Q(id__gt=pk))
+                ).order_by('created_at', 'id')
+            else:
+                queryset = queryset.filter(
+                    Q(created_at__lte=created_at) & (Q(created_at__lt=created_at) | Q(id__lt=pk))
+                ).order_by('-created_at', '-id')
+        return queryset, position
+
+    def set_page(self, results, position):
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if self.reverse:
+            self.page.reverse()
+
+        # Walking backwards from a cursor means there is at least one row after this page
+        if self.reverse:
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+
+        try:
+            direction, created_at, pk = b64decode(encoded.encode('ascii')).decode('ascii').split('|')
+            if direction not in ('n', 'p'):
+                raise ValueError(direction)
+            return (datetime.fromisoformat(created_at), uuid.UUID(pk)), direction == 'p'
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, instance, reverse=False):
+        direction = 'p' if reverse else 'n'
+        raw = f'{direction}|{instance.created_at.isoformat()}|{instance.id}'
+        encoded = b64encode(raw.encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
@@ -0,0 +1,104 @@
+# plans/rows.py
+"""
+Model-free read path for plan lists. Plans and installments are fetched as value tuples, the
+installments are grouped under their plans through a dict keyed by plan id, and each row is turned
+straight into the dict PaymentPlanSummarySerializer (or PaymentPlanListSerializer, with installments)
+would produce, without building model instances or running DRF fields value by value.
+
+The serializers stay the reference for the JSON shape; test_rows checks both produce the same output.
+"""
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+from .models import Installment
+
+PLAN_ROW_FIELDS = (
+    'id', 'merchant__email', 'user__email', 'total_amount', 'number_of_installments', 'start_date', 'status',
+    'paid_amount', 'paid_count', 'late_count', 'next_due_date', 'created_at', 'updated_at',
+)
+INSTALLMENT_ROW_FIELDS = ('id', 'plan_id', 'due_date', 'amount', 'status', 'created_at', 'updated_at')
+
+
+
+def _datetime_renderer():
+    """
+    Returns a function rendering aware datetimes like DRF's DateTimeField does by default: ISO 8601
+    in the current time zone, UTC as Z. Any other DATETIME_FORMAT goes through the field itself.
+    """
+    if api_settings.DATETIME_FORMAT != ISO_8601 or not settings.USE_TZ:
+        return serializers.DateTimeField().to_representation
+
+    current = timezone.get_current_timezone()
+
+    def render(value):
+        text = value.astimezone(current).isoformat()
+        return text[:-6] + 'Z' if text.endswith('+00:00') else text
+
+    return render
+
+
+def plan_rows(plans):
+    """
+    Projects a PaymentPlan queryset to named tuples of PLAN_ROW_FIELDS. Named, so the keyset
+    pagination can still read the id and created_at of the rows.
+    """
+    return plans.values_list(*PLAN_ROW_FIELDS, named=True)
+
+
+def installment_rows(plan_ids):
+    """
+    Tuples of INSTALLMENT_ROW_FIELDS for the installments of the given plans, by due date.
+    """
+    return Installment.objects.filter(plan_id__in=plan_ids).order_by('due_date', 'id').values_list(
+        *INSTALLMENT_ROW_FIELDS
+    )
+
+
+def serialize_plan_rows(plans, installments=None):
+    """
+    Returns the serialized plans for rows of PLAN_ROW_FIELDS. When installments (rows of
+    INSTALLMENT_ROW_FIELDS) are given, each plan nests its own under 'installments'.
+    """
+    _datetime = _datetime_renderer()
+    data = []
+    nested = {}
+    for (
+        pk, merchant_email, user_email, total_amount, number_of_installments, start_date, status,
+        paid_amount, paid_count, late_count, next_due_date, created_at, updated_at
+    ) in plans:
+        plan = {
+            'id': str(pk),
+            'merchant_email': merchant_email,
+            'user_email': user_email,
+            'total_amount': str(total_amount),
+            'number_of_installments': number_of_installments,
+            'start_date': start_date.isoformat(),
+            'status': status,
+            'paid_amount': str(paid_amount),
+            'remaining_amount': str(total_amount - paid_amount),
+            'paid_count': paid_count,
+            'late_count': late_count,
+            'next_due_date': next_due_date.isoformat() if next_due_date else None,
+            'created_at': _datetime(created_at),
+            'updated_at': _datetime(updated_at),
+        }
+        if user_email is None:
+            # The serializer skips user.email when a plan has no user instead of rendering null
+            del plan['user_email']
+        if installments is not None:
+            plan['installments'] = nested[pk] = []
+        data.append(plan)
+
+    for pk, plan_id, due_date, amount, status, created_at, updated_at in installments or ():
+        nested[plan_id].append({
+            'id': str(pk),
+            'due_date': due_date.isoformat(),
+            'amount': str(amount),
+            'status': status,
+            'created_at': _datetime(created_at),
+            'updated_at': _datetime(updated_at),
+        })
+
+    return data
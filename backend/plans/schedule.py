@@ -0,0 +1,60 @@
+# plans/schedule.py
+"""
+Installment schedule engine.
+
+Computes the due dates and amounts of many plans at once with NumPy, without touching the ORM.
+Amounts are integer minor units (hundredths). Every installment gets the total divided by the
+number of installments rounded half up, and the last installment absorbs the remainder so the
+installments always sum to the total. Due dates fall monthly from the start date, clamped to the
+last day of shorter months like dateutil's relativedelta(months=i).
+"""
+from collections import namedtuple
+from decimal import Decimal, ROUND_HALF_UP
+
+import numpy as np
+
+Schedule = namedtuple('Schedule', ['plan_index', 'due_dates', 'amounts'])
+Schedule.__doc__ = """
+Flat installment arrays, grouped by plan in input order and ordered by due date within a plan.
+plan_index (int64) points back into the input arrays, due_dates are datetime64[D] and amounts
+are int64 minor units.
+"""
+
+
+def to_minor_units(amount) -> int:
+    return int((Decimal(amount) * 100).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+
+
+def from_minor_units(amount) -> Decimal:
+    return Decimal(int(amount)).scaleb(-2)
+
+
+def build_schedules(total_amounts, installment_counts, start_dates) -> Schedule:
+    """
+    Builds the installment schedules of many plans in one vectorized pass.
+    total_amounts are positive integer minor units, installment_counts positive integers
+    and start_dates dates (anything NumPy converts to datetime64[D]).
+    """
+    totals = np.asarray(total_amounts, dtype=np.int64)
+    counts = np.asarray(installment_counts, dtype=np.int64)
+    starts = np.asarray(start_dates, dtype='datetime64[D]')
+
+    # Integer division rounded half up, identical to quantizing total / n to cents with ROUND_HALF_UP
+    regular = (2 * totals + counts) // (2 * counts)
+    last = totals - regular * (counts - 1)
+
+    plan_index = np.repeat(np.arange(len(counts), dtype=np.int64), counts)
+    first_row = np.cumsum(counts) - counts
+    sequence = np.arange(len(plan_index), dtype=np.int64) - first_row[plan_index]
+
+    amounts = regular[plan_index]
+    amounts[first_row + counts - 1] = last
+
+    start_months = starts.astype('datetime64[M]')
+    start_days = (starts - start_months.astype('datetime64[D]')).astype(np.int64)
+    due_months = start_months[plan_index] + sequence.astype('timedelta64[M]')
+    month_starts = due_months.astype('datetime64[D]')
+    month_lengths = ((due_months + 1).astype('datetime64[D]') - month_starts).astype(np.int64)
+    due_dates = month_starts + np.minimum(start_days[plan_index], month_lengths - 1).astype('timedelta64[D]')
+
+    return Schedule(plan_index, due_dates, amounts)
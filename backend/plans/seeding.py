@@ -0,0 +1,239 @@
+# plans/seeding.py
+"""
+Synthetic merchants, customers, payment plans and installments for benchmarks, generated with
+NumPy and streamed into PostgreSQL with COPY.
+
+The data only depends on the seed, the requested sizes and the reference date: plans are
+generated in fixed-size chunks, each from its own generator seeded with (seed, chunk number),
+and every id and timestamp is drawn from those generators. Plans started over the two years
+before the reference date, mostly with 3 or 4 installments on the regular schedule
+(plans.schedule). Installments due before the reference date were paid, a few of them late in
+plans of riskier customers, or are still Late; the one due on the date is Due and later ones
+Pending, with a few paid early. Plan summary columns and merchant portfolios match the
+installments, as if every payment and status sweep had run.
+"""
+import time
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Installment, PaymentPlan
+from .schedule import build_schedules
+from .services import refresh_merchant_portfolios
+
+User = get_user_model()
+
+SEED_CHUNK_SIZE = 50_000
+COPY_BLOCK_SIZE = 10_000
+
+INSTALLMENT_COUNTS = np.array([2, 3, 4, 6, 12])
+INSTALLMENT_COUNT_WEIGHTS = np.array([0.10, 0.25, 0.40, 0.15, 0.10])
+HISTORY_DAYS = 730
+# Share of customers paying late, and how often they do
+RISKY_PLAN_SHARE = 0.15
+RISKY_LATE_RATE = 0.35
+ON_TIME_LATE_RATE = 0.01
+# Of the late installments, those still unpaid on the reference date (when due in the last 90 days)
+UNPAID_LATE_RATE = 0.6
+EARLY_PAYMENT_RATE = 0.03
+
+USER_COLUMNS = ('id', 'password', 'email', 'role', 'is_active', 'is_superuser', 'created_at', 'updated_at')
+PLAN_COLUMNS = (
+    'id', 'merchant_id', 'user_id', 'total_amount', 'number_of_installments', 'start_date', 'status',
+    'paid_amount', 'paid_count', 'late_count', 'next_due_date', 'created_at', 'updated_at',
+)
+INSTALLMENT_COLUMNS = ('id', 'plan_id', 'due_date', 'amount', 'status', 'created_at', 'updated_at')
+NULL = '\\N'
+
+
+def _copy(cursor, model, columns, lines):
+    """
+    Streams tab-separated lines into the columns of the model's table with COPY. Errors are
+    raised as Django's database exceptions, like those of queries.
+    """
+    table = connection.ops.quote_name(model._meta.db_table)
+    names = ', '.join(connection.ops.quote_name(column) for column in columns)
+    with connection.wrap_database_errors, cursor.copy(f'COPY {table} ({names}) FROM STDIN') as copy:
+        for start in range(0, len(lines), COPY_BLOCK_SIZE):
+            copy.write(''.join(lines[start:start + COPY_BLOCK_SIZE]))
+
+
+def _uuids(rng, count):
+    """
+    Random version 4 UUIDs as 32 hex digits, which PostgreSQL reads without hyphens.
+    """
+    raw = rng.integers(0, 256, size=(count, 16), dtype=np.uint8)
+    raw[:, 6] = raw[:, 6] & 0x0F | 0x40
+    raw[:, 8] = raw[:, 8] & 0x3F | 0x80
+    text = raw.tobytes().hex()
+    return [text[i:i + 32] for i in range(0, len(text), 32)]
+
+
+def _amounts(minor_units):
+    return [f'{amount // 100}.{amount % 100:02d}' for amount in minor_units.tolist()]
+
+
+def _dates(values):
+    return np.datetime_as_string(values, unit='D').tolist()
+
+
+def _timestamps(values):
+    return [f'{text}+00' for text in np.datetime_as_string(values, unit='s').tolist()]
+
+
+def _seed_users(cursor, rng, count, role, prefix, password, now):
+    ids = _uuids(rng, count)
+    # Accounts signed up over the history window, oldest first
+    created = now - np.sort(rng.integers(0, HISTORY_DAYS * 86400, size=count))[::-1].astype('timedelta64[s]')
+    created = _timestamps(created)
+    _copy(cursor, User, USER_COLUMNS, [
+        f'{pk}\t{password}\t{prefix}-{role}-{i}@seed.local\t{role}\tt\tf\t{at}\t{at}\n'
+        for i, (pk, at) in enumerate(zip(ids, created))
+    ])
+    group = Group.objects.get_or_create(name=role.capitalize())[0]
+    _copy(cursor, User.groups.through, ('user_id', 'group_id'), [f'{pk}\t{group.id}\n' for pk in ids])
+    return ids
+
+
+def _seed_plan_chunk(cursor, rng, count, merchant_ids, user_ids, today, now):
+    """
+    Generates and copies `count` plans and their installments. Returns the number of installments.
+    """
+    # A few large merchants and a long tail of small ones
+    merchants = (len(merchant_ids) * rng.random(count) ** 3).astype(np.int64)
+    users = rng.integers(0, len(user_ids), size=count)
+    counts = rng.choice(INSTALLMENT_COUNTS, size=count, p=INSTALLMENT_COUNT_WEIGHTS)
+    totals = np.clip(np.round(rng.lognormal(np.log(30_000), 0.9, size=count)), 2_000, 5_000_000).astype(np.int64)
+    # Whole currency units for most plans, as priced in shops
+    totals = np.where(rng.random(count) < 0.8, totals // 100 * 100, totals)
+    starts = today - rng.integers(-30, HISTORY_DAYS, size=count).astype('timedelta64[D]')
+    plan_created = (
+        starts.astype('datetime64[s]')
+        - rng.integers(0, 3 * 86400, size=count).astype('timedelta64[s]')
+    )
+    plan_created = np.minimum(plan_created, now)
+    risky = rng.random(count) < RISKY_PLAN_SHARE
+
+    schedule = build_schedules(totals, counts, starts)
+    plan_index, due_dates, amounts = schedule
+    rows = len(plan_index)
+
+    draw = rng.random(rows)
+    past = due_dates < today
+    late_rate = np.where(risky[plan_index], RISKY_LATE_RATE, ON_TIME_LATE_RATE)
+    was_late = past & (draw < late_rate)
+    # Only recent late installments are still open; older ones were eventually collected
+    still_late = was_late & (rng.random(rows) < UNPAID_LATE_RATE) & (due_dates >= today - np.timedelta64(90, 'D'))
+    paid = (past & ~still_late) | (~past & (rng.random(rows) < EARLY_PAYMENT_RATE))
+    status = np.where(
+        paid, 'Paid', np.where(still_late, 'Late', np.where(due_dates == today, 'Due', 'Pending'))
+    )
+
+    # Paid on time up to five days before the due date, late ones within a month after
+    due_seconds = due_dates.astype('datetime64[s]') + np.timedelta64(12 * 3600, 's')
+    paid_at = np.where(
+        was_late,
+        due_seconds + rng.integers(86400, 30 * 86400, size=rows).astype('timedelta64[s]'),
+        due_seconds - rng.integers(0, 5 * 86400, size=rows).astype('timedelta64[s]'),
+    )
+    created = plan_created[plan_index]
+    updated = np.where(
+        paid, paid_at, np.where(still_late, due_seconds + np.timedelta64(86400, 's'), created)
+    )
+    updated = np.clip(updated, created, now)
+
+    paid_amounts = np.bincount(plan_index, weights=np.where(paid, amounts, 0), minlength=count).astype(np.int64)
+    paid_counts = np.bincount(plan_index, weights=paid, minlength=count).astype(np.int64)
+    late_counts = np.bincount(plan_index, weights=still_late, minlength=count).astype(np.int64)
+    first_rows = np.cumsum(counts) - counts
+    unpaid_due = np.where(paid, np.datetime64('9999-12-31'), due_dates)
+    next_due = np.minimum.reduceat(unpaid_due, first_rows)
+    plan_updated = np.maximum.reduceat(updated, first_rows)
+
+    plan_ids = _uuids(rng, count)
+    plan_created_text = _timestamps(plan_created)
+    plan_updated_text = _timestamps(plan_updated)
+    next_due_text = _dates(next_due)
+    _copy(cursor, PaymentPlan, PLAN_COLUMNS, [
+        f'{plan_ids[i]}\t{merchant_ids[merchant]}\t{user_ids[user]}\t{total}\t{n}\t{start}\t'
+        f'{"Paid" if n_paid == n else "Active"}\t{paid_amount}\t{n_paid}\t{n_late}\t'
+        f'{NULL if n_paid == n else next_due_date}\t{plan_created_text[i]}\t{plan_updated_text[i]}\n'
+        for i, (merchant, user, total, n, start, paid_amount, n_paid, n_late, next_due_date) in enumerate(zip(
+            merchants.tolist(), users.tolist(), _amounts(totals), counts.tolist(), _dates(starts),
+            _amounts(paid_amounts), paid_counts.tolist(), late_counts.tolist(), next_due_text,
+        ))
+    ])
+
+    created_text = _timestamps(created)
+    _copy(cursor, Installment, INSTALLMENT_COLUMNS, [
+        f'{pk}\t{plan_ids[plan]}\t{due_date}\t{amount}\t{state}\t{created_at}\t{updated_at}\n'
+        for pk, plan, due_date, amount, state, created_at, updated_at in zip(
+            _uuids(rng, rows), plan_index.tolist(), _dates(due_dates), _amounts(amounts), status.tolist(),
+            created_text, _timestamps(updated),
+        )
+    ])
+    return rows
+
+
+def _deferred_indexes():
+    return [(model, index) for model in (PaymentPlan, Installment) for index in model._meta.indexes]
+
+
+def seed_portfolio(merchants, users, plans, seed=0, today=None, password=None, defer_indexes=False, progress=None):
+    """
+    Creates `merchants` merchants and `users` customers, then `plans` payment plans spread over
+    them with their installments, in committed chunks of SEED_CHUNK_SIZE plans, and refreshes
+    the portfolios of the new merchants. Emails are seed<seed>-<role>-<n>@seed.local, so a seed
+    can only be loaded once per database. Accounts get `password`, or an unusable one.
+    today is the reference date of the statuses and defaults to the current date; progress,
+    when given, is called with the running totals after every chunk.
+
+    With defer_indexes, the secondary indexes of the plan and installment tables are dropped
+    for the load and built again once at the end, which is much faster for large loads but
+    leaves the tables without them meanwhile.
+    Returns a dict with the number of users, plans and installments created and the seconds taken.
+    """
+    today = np.datetime64(today or timezone.now().date(), 'D')
+    now = today.astype('datetime64[s]') + np.timedelta64(12 * 3600, 's')
+    prefix = f'seed{seed}'
+    password = make_password(password)
+    started = time.perf_counter()
+    result = {'users': 0, 'plans': 0, 'installments': 0}
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        merchant_ids = _seed_users(
+            cursor, np.random.default_rng([seed, 0]), merchants, 'merchant', prefix, password, now
+        )
+        user_ids = _seed_users(cursor, np.random.default_rng([seed, 1]), users, 'user', prefix, password, now)
+    result['users'] = merchants + users
+
+    deferred = _deferred_indexes() if defer_indexes else []
+    with connection.schema_editor() as editor:
+        for model, index in deferred:
+            editor.remove_index(model, index)
+    try:
+        for chunk, start in enumerate(range(0, plans, SEED_CHUNK_SIZE)):
+            count = min(SEED_CHUNK_SIZE, plans - start)
+            rng = np.random.default_rng([seed, 2, chunk])
+            with transaction.atomic(), connection.cursor() as cursor:
+                result['installments'] += _seed_plan_chunk(cursor, rng, count, merchant_ids, user_ids, today, now)
+            result['plans'] += count
+            result['seconds'] = time.perf_counter() - started
+            if progress:
+                progress(result)
+    finally:
+        with connection.schema_editor() as editor:
+            for model, index in deferred:
+                editor.add_index(model, index)
+
+    refresh_merchant_portfolios(merchant_ids)
+    with connection.cursor() as cursor:
+        # Fresh planner statistics, so benchmarks see the plans they would get in production
+        for model in (User, PaymentPlan, Installment):
+            cursor.execute(f'ANALYZE {connection.ops.quote_name(model._meta.db_table)}')
+    result['seconds'] = time.perf_counter() - started
+    return result
@@ -1,10 +1,10 @@
 from rest_framework import serializers
 from plans.models.installment import Installment
-from .models import PaymentPlan
+from .models import PaymentPlan, MerchantPortfolio
 from django.contrib.auth import get_user_model
-from .services import create_payment_plan
+from .services import create_payment_plan, create_payment_plans_bulk
 from decimal import Decimal
-from .validators import validate_plan_creation_data
+from .validators import MAX_INSTALLMENTS, validate_plan_creation_data
 from django.core.exceptions import ValidationError as DjangoValidationError
 
 User = get_user_model()
@@ -26,6 +26,7 @@ class PaymentPlanCreateSerializer(serializers.ModelSerializer):
             'start_date',
         ]
         read_only_fields = ['merchant', 'status']
+        extra_kwargs = {'number_of_installments': {'max_value': MAX_INSTALLMENTS}}
 
     def validate(self, data):
         try:
@@ -49,15 +50,113 @@ class PaymentPlanCreateSerializer(serializers.ModelSerializer):
             **validated_data
         )
         return plan
+
+
+MAX_BULK_PLANS = 10000
+
+
+class PaymentPlanBulkItemSerializer(serializers.Serializer):
+    user = serializers.UUIDField()
+    total_amount = serializers.DecimalField(max_digits=10, decimal_places=2)
+    number_of_installments = serializers.IntegerField(max_value=MAX_INSTALLMENTS)
+    start_date = serializers.DateField()
+
+
+class PaymentPlanBulkCreateSerializer(serializers.Serializer):
+    plans = PaymentPlanBulkItemSerializer(many=True, allow_empty=False, max_length=MAX_BULK_PLANS)
+
+    def create(self, validated_data):
+        created, errors = create_payment_plans_bulk(
+            merchant=validated_data['merchant'],
+            plans_data=validated_data['plans']
+        )
+        return {
+            'created': [{'index': index, 'id': plan.id} for index, plan in created.items()],
+            'errors': [{'index': index, 'errors': item_errors} for index, item_errors in errors.items()],
+        }
+
+
+MAX_QUOTE_PLANS = 10000
+# Installment rows a single quote request may schedule across all its plans
+MAX_QUOTE_INSTALLMENTS = 120000
+
+
+class PaymentPlanQuoteItemSerializer(serializers.Serializer):
+    total_amount = serializers.DecimalField(max_digits=10, decimal_places=2)
+    number_of_installments = serializers.IntegerField(max_value=MAX_INSTALLMENTS)
+    start_date = serializers.DateField()
+
+    def validate(self, data):
+        try:
+            validate_plan_creation_data(
+                total_amount=data.get('total_amount'),
+                number_of_installments=data.get('number_of_installments'),
+                start_date=data.get('start_date')
+            )
+        except DjangoValidationError as e:
+            raise serializers.ValidationError(e.message_dict if hasattr(e, 'message_dict') else e.messages)
+
+        return data
+
+
+class PaymentPlanQuoteSerializer(serializers.Serializer):
+    plans = PaymentPlanQuoteItemSerializer(many=True, allow_empty=False, max_length=MAX_QUOTE_PLANS)
+
+    def validate_plans(self, plans):
+        if sum(plan['number_of_installments'] for plan in plans) > MAX_QUOTE_INSTALLMENTS:
+            raise serializers.ValidationError(
+                f'A quote cannot schedule more than {MAX_QUOTE_INSTALLMENTS} installments in total.'
+            )
+        return plans
+
+
 class InstallmentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Installment
         fields = ['id', 'due_date', 'amount', 'status', 'created_at', 'updated_at']
         read_only_fields = fields
-class PaymentPlanListSerializer(serializers.ModelSerializer):
-    installments = InstallmentSerializer(many=True, read_only=True)
+
+
+MAX_CALENDAR_DAYS = 92
+
+
+class InstallmentCalendarQuerySerializer(serializers.Serializer):
+    """
+    Validates the ?from=&to= date window (both ends inclusive) and optional ?plan= of the installment calendar.
+    """
+    start = serializers.DateField()
+    to = serializers.DateField()
+    plan = serializers.UUIDField(required=False)
+
+    def get_fields(self):
+        # 'from' is a Python keyword, so the field is declared as start
+        fields = super().get_fields()
+        fields['from'] = fields.pop('start')
+        return fields
+
+    def validate(self, data):
+        if data['to'] < data['from']:
+            raise serializers.ValidationError({'to': 'Must not be before from.'})
+        if (data['to'] - data['from']).days >= MAX_CALENDAR_DAYS:
+            raise serializers.ValidationError({'to': f'The window cannot span more than {MAX_CALENDAR_DAYS} days.'})
+        return data
+
+
+class InstallmentCalendarSerializer(serializers.Serializer):
+    """
+    Serializes the installment rows projected by the calendar view with values().
+    """
+    id = serializers.UUIDField(read_only=True)
+    plan = serializers.UUIDField(source='plan_id', read_only=True)
+    due_date = serializers.DateField(read_only=True)
+    amount = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
+    status = serializers.CharField(read_only=True)
+
+
+class PaymentPlanSummarySerializer(serializers.ModelSerializer):
     user_email = serializers.EmailField(source='user.email', read_only=True)
     merchant_email = serializers.EmailField(source='merchant.email', read_only=True)
+    remaining_amount = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
 
 
     class Meta:
@@ -70,12 +169,42 @@ class PaymentPlanListSerializer(serializers.ModelSerializer):
             'number_of_installments',
             'start_date',
             'status',
+            'paid_amount',
+            'remaining_amount',
+            'paid_count',
+            'late_count',
+            'next_due_date',
             'created_at',
             'updated_at',
-            'installments' 
         ]
         read_only_fields = fields
 
+class MerchantPortfolioSerializer(serializers.ModelSerializer):
+    outstanding_amount = serializers.DecimalField(max_digits=14, decimal_places=2, read_only=True)
+    late_ratio = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = MerchantPortfolio
+        fields = [
+            'plan_count',
+            'installment_count',
+            'paid_count',
+            'late_count',
+            'late_ratio',
+            'total_amount',
+            'collected_amount',
+            'outstanding_amount',
+            'updated_at',
+        ]
+        read_only_fields = fields
+
+class PaymentPlanListSerializer(PaymentPlanSummarySerializer):
+    installments = InstallmentSerializer(many=True, read_only=True)
+
+    class Meta(PaymentPlanSummarySerializer.Meta):
+        fields = PaymentPlanSummarySerializer.Meta.fields + ['installments']
+        read_only_fields = fields
+
 class InstallmentPaySerializer(serializers.Serializer):
     def validate(self, attrs):
         # Get installment from view context
@@ -96,3 +225,47 @@ class InstallmentPaySerializer(serializers.Serializer):
             raise serializers.ValidationError("Invalid installment status for payment")
 
         return attrs
+
+
+class InstallmentSelectionField(serializers.Field):
+    """
+    A list of installment ids, or "all_remaining" for every unpaid installment of the plan (None).
+    """
+    ALL_REMAINING = 'all_remaining'
+
+    def to_internal_value(self, data):
+        if data == self.ALL_REMAINING:
+            return None
+        ids = serializers.ListField(child=serializers.UUIDField(), allow_empty=False).run_validation(data)
+        return set(ids)
+
+    def to_representation(self, value):
+        return self.ALL_REMAINING if value is None else [str(installment_id) for installment_id in value]
+
+
+class PaymentPlanPaySerializer(serializers.Serializer):
+    installments = InstallmentSelectionField()
+
+    def validate(self, attrs):
+        # Get the locked plan and its unpaid installments from view context
+        plan = self.context.get('plan')
+        if not plan:
+            raise serializers.ValidationError("Payment plan not found")
+
+        user = self.context.get('request').user
+        if plan.user_id != user.id:
+            raise serializers.ValidationError("This payment plan does not belong to you")
+
+        if plan.status == 'Paid':
+            raise serializers.ValidationError("This payment plan is already paid")
+
+        unpaid = self.context['unpaid_installments']
+        installment_ids = attrs['installments']
+        if installment_ids is not None:
+            invalid = installment_ids - {installment.id for installment in unpaid}
+            if invalid:
+                raise serializers.ValidationError({
+                    'installments': [f"{installment_id} is not an unpaid installment of this plan" for installment_id in sorted(invalid, key=str)]
+                })
+
+        return attrs
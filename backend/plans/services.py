@@ -1,46 +1,60 @@
 # plans/services.py
-from decimal import Decimal, ROUND_HALF_UP
-from dateutil.relativedelta import relativedelta
+from decimal import Decimal
 from django.db import transaction
-from .models import PaymentPlan, Installment
+from django.db.models import Case, Count, DecimalField, F, Min, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.db.models.lookups import GreaterThanOrEqual
+from .models import PaymentPlan, Installment, StatusSweepCheckpoint, InstallmentReminder, MerchantPortfolio
+from .metrics import INSTALLMENTS_PAID, PLANS_CREATED, count_on_commit
+from .notifications import UpcomingInstallment, UserReminder, get_notification_backend
+from .schedule import build_schedules, from_minor_units, to_minor_units
+import numpy as np
 from django.contrib.auth import get_user_model
 from .validators import validate_plan_creation_data
 from django.utils import timezone
-from datetime import timedelta
+from datetime import date, timedelta
+from itertools import groupby
+from operator import itemgetter
 from django.core.exceptions import ValidationError
+import logging
+import time
 import uuid
 
+logger = logging.getLogger(__name__)
+
 User = get_user_model()
 
+def _build_installments(plans):
+    """
+    Builds the Installment instances of many payment plans with one vectorized schedule computation.
+    """
+    schedule = build_schedules(
+        [to_minor_units(plan.total_amount) for plan in plans],
+        [plan.number_of_installments for plan in plans],
+        [plan.start_date for plan in plans]
+    )
+    return [
+        Installment(
+            plan=plans[plan_index],
+            due_date=due_date,
+            amount=from_minor_units(amount),
+            status='Pending'
+        )
+        for plan_index, due_date, amount in zip(
+            schedule.plan_index.tolist(),
+            schedule.due_dates.astype(object).tolist(),
+            schedule.amounts.tolist()
+        )
+    ]
+
+
 def _calculate_installments(plan: PaymentPlan):
     """
     Calculates and creates installments for a given payment plan.
     This function assumes the plan object is already saved.
+    The last installment includes the remaining amount so installments have a fixed sum (see plans.schedule).
     """
-    installments_to_create = []
-    installment_amount = (plan.total_amount / plan.number_of_installments).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
-    
-    # Last installment will include the remaining amount to make sure installments have a fixed sum
-    total_calculated = installment_amount * (plan.number_of_installments - 1)
-    last_installment_amount = plan.total_amount - total_calculated
-
-    for i in range(plan.number_of_installments):
-        due_date = plan.start_date + relativedelta(months=i)
-        # Use last installment amount for the final payment, regular amount for others ( if last installment )
-        if i == plan.number_of_installments - 1:
-            amount = last_installment_amount
-        else:
-            amount = installment_amount
-        installments_to_create.append(
-            Installment(
-                plan=plan,
-                due_date=due_date,
-                amount=amount,
-                status='Pending'
-            )
-        )
-    
-    return installments_to_create
+    return _build_installments([plan])
 
 
 @transaction.atomic
@@ -55,7 +69,8 @@ def create_payment_plan(merchant: User, user: User, total_amount: Decimal, numbe
         user=user,
         total_amount=total_amount,
         number_of_installments=number_of_installments,
-        start_date=start_date
+        start_date=start_date,
+        next_due_date=start_date
     )
 
     # Calculate installments using the helper function
@@ -65,39 +80,367 @@ def create_payment_plan(merchant: User, user: User, total_amount: Decimal, numbe
     if installments:
         Installment.objects.bulk_create(installments)
 
+    _adjust_merchant_portfolio(
+        merchant.pk, plan_count=1, installment_count=number_of_installments, total_amount=total_amount
+    )
+    count_on_commit(PLANS_CREATED)
     return plan
 
 
+def quote_payment_plans(plans_data):
+    """
+    Computes the installment schedules of hypothetical plans without touching the database.
+    Each item in plans_data holds total_amount, number_of_installments and start_date.
+    Returns one JSON-ready quote per item, with amounts and dates already formatted as strings.
+    """
+    schedule = build_schedules(
+        [to_minor_units(item['total_amount']) for item in plans_data],
+        [item['number_of_installments'] for item in plans_data],
+        [item['start_date'] for item in plans_data]
+    )
+    due_dates = np.datetime_as_string(schedule.due_dates).tolist()
+    amounts = [str(from_minor_units(amount)) for amount in schedule.amounts.tolist()]
+
+    quotes = []
+    row = 0
+    for item in plans_data:
+        end = row + item['number_of_installments']
+        quotes.append({
+            'total_amount': str(item['total_amount']),
+            'number_of_installments': item['number_of_installments'],
+            'start_date': item['start_date'].isoformat(),
+            'installments': [
+                {'due_date': due_date, 'amount': amount}
+                for due_date, amount in zip(due_dates[row:end], amounts[row:end])
+            ],
+        })
+        row = end
+
+    return quotes
+
+
+BULK_CREATE_BATCH_SIZE = 1000
+
+
+@transaction.atomic
+def create_payment_plans_bulk(merchant: User, plans_data):
+    """
+    Creates many PaymentPlans and their Installments in a single transaction.
+    Each item in plans_data holds user (id), total_amount, number_of_installments and start_date.
+    All referenced users are resolved with one query and every plan and installment is
+    inserted with one bulk_create each. Invalid items are skipped.
+    Returns (created, errors): dicts keyed by item index holding the plan or the error messages.
+    """
+    user_ids = set()
+    for item in plans_data:
+        try:
+            user_ids.add(uuid.UUID(str(item.get('user'))))
+        except ValueError:
+            pass
+    users = User.objects.filter(role='user').in_bulk(user_ids)
+
+    created = {}
+    errors = {}
+    for index, item in enumerate(plans_data):
+        item_errors = {}
+        try:
+            validate_plan_creation_data(
+                item.get('total_amount'),
+                item.get('number_of_installments'),
+                item.get('start_date')
+            )
+        except ValidationError as e:
+            item_errors.update(e.message_dict)
+
+        try:
+            user = users.get(uuid.UUID(str(item.get('user'))))
+        except ValueError:
+            user = None
+        if user is None:
+            item_errors['user'] = [f'Invalid pk "{item.get("user")}" - object does not exist.']
+
+        if item_errors:
+            errors[index] = item_errors
+            continue
+
+        plan = PaymentPlan(
+            merchant=merchant,
+            user=user,
+            total_amount=item['total_amount'],
+            number_of_installments=item['number_of_installments'],
+            start_date=item['start_date'],
+            next_due_date=item['start_date']
+        )
+        created[index] = plan
+
+    if created:
+        plans = list(created.values())
+        PaymentPlan.objects.bulk_create(plans, batch_size=BULK_CREATE_BATCH_SIZE)
+        Installment.objects.bulk_create(_build_installments(plans), batch_size=BULK_CREATE_BATCH_SIZE)
+        _adjust_merchant_portfolio(
+            merchant.pk,
+            plan_count=len(plans),
+            installment_count=sum(plan.number_of_installments for plan in plans),
+            total_amount=sum(Decimal(plan.total_amount) for plan in plans)
+        )
+        count_on_commit(PLANS_CREATED, len(plans))
+
+    return created, errors
+
+
+def _plan_installments_aggregate(aggregate, *conditions, installment_model=Installment, **filters):
+    """
+    Correlated subquery aggregating the installments of the outer PaymentPlan row.
+    """
+    return Subquery(
+        installment_model.objects.filter(*conditions, plan=OuterRef('pk'), **filters)
+        .order_by()
+        .values('plan')
+        .annotate(value=aggregate)
+        .values('value')
+    )
+
+
+def plan_summary_updates(installment_model=Installment):
+    """
+    UPDATE values recomputing the summary columns and status of PaymentPlan rows from their
+    installments. installment_model lets migrations pass their historical model.
+    """
+    def aggregate(*args, **kwargs):
+        return _plan_installments_aggregate(*args, installment_model=installment_model, **kwargs)
+
+    paid_count = Coalesce(aggregate(Count('id'), status='Paid'), 0)
+    return {
+        'paid_amount': Coalesce(
+            aggregate(Sum('amount'), status='Paid'),
+            Value(Decimal('0.00')),
+            output_field=DecimalField(max_digits=10, decimal_places=2)
+        ),
+        'paid_count': paid_count,
+        'late_count': Coalesce(aggregate(Count('id'), status='Late'), 0),
+        'next_due_date': aggregate(Min('due_date'), ~Q(status='Paid')),
+        # SET expressions see the old row, so the status compares the recomputed count, not F('paid_count')
+        'status': Case(
+            When(GreaterThanOrEqual(paid_count, F('number_of_installments')), then=Value('Paid')),
+            default=Value('Active')
+        ),
+        'updated_at': timezone.now(),
+    }
+
+
+def refresh_plan_summaries(plan_ids=None) -> int:
+    """
+    Recomputes paid_amount, paid_count, late_count, next_due_date and status of plans from their
+    installments with a single set-based UPDATE. Refreshes every plan when plan_ids is None.
+    Returns the number of plans updated.
+    """
+    plans = PaymentPlan.objects.all()
+    if plan_ids is not None:
+        plans = plans.filter(id__in=plan_ids)
+
+    return plans.update(**plan_summary_updates())
+
+
+def _adjust_merchant_portfolio(merchant_id, **deltas):
+    """
+    Adds deltas (field name to amount) to the running totals of a merchant's MerchantPortfolio
+    with one UPDATE, creating the row on the merchant's first plan. The UPDATE row-locks the
+    portfolio until the surrounding transaction commits, after the plan and installment rows,
+    so concurrent writers of one merchant queue here briefly instead of deadlocking.
+    """
+    changes = {field: F(field) + value for field, value in deltas.items() if value}
+    if not changes:
+        return
+    portfolio = MerchantPortfolio.objects.filter(merchant_id=merchant_id)
+    if not portfolio.update(**changes, updated_at=timezone.now()):
+        # ON CONFLICT DO NOTHING: a concurrent first write of the same merchant may win the insert
+        MerchantPortfolio.objects.bulk_create([MerchantPortfolio(merchant_id=merchant_id)], ignore_conflicts=True)
+        portfolio.update(**changes, updated_at=timezone.now())
+
+
+def refresh_merchant_portfolios(merchant_ids=None) -> int:
+    """
+    Recomputes the MerchantPortfolio of merchants from the summary columns of their plans with one
+    aggregate query and one upsert. Refreshes every merchant with plans when merchant_ids is None.
+    The portfolios are locked before the aggregate, so a payment or sweep increment either committed
+    before it and is counted, or waits and is applied on top of the new totals.
+    Returns the number of portfolios written.
+    """
+    plans = PaymentPlan.objects.all()
+    portfolios = MerchantPortfolio.objects.all()
+    if merchant_ids is not None:
+        plans = plans.filter(merchant_id__in=merchant_ids)
+        portfolios = portfolios.filter(merchant_id__in=merchant_ids)
+
+    fields = ['plan_count', 'installment_count', 'paid_count', 'late_count', 'total_amount', 'collected_amount', 'updated_at']
+    with transaction.atomic():
+        # Merchant id order, like every writer of the portfolios
+        list(portfolios.order_by('merchant_id').select_for_update().values_list('merchant_id'))
+        totals = plans.values('merchant_id').order_by('merchant_id').annotate(
+            plan_count=Count('id'),
+            installment_count=Sum('number_of_installments'),
+            paid_count=Sum('paid_count'),
+            late_count=Sum('late_count'),
+            total_amount=Sum('total_amount'),
+            collected_amount=Sum('paid_amount')
+        )
+        rows = [MerchantPortfolio(**row, updated_at=timezone.now()) for row in totals]
+        # Merchants whose plans are all gone keep no portfolio
+        portfolios.exclude(merchant_id__in=[row.merchant_id for row in rows]).delete()
+        MerchantPortfolio.objects.bulk_create(
+            rows, batch_size=BULK_CREATE_BATCH_SIZE,
+            update_conflicts=True, unique_fields=['merchant'], update_fields=fields
+        )
+    return len(rows)
+
+
+SWEEP_CHUNK_SIZE = 5000
+SWEEP_PARTITION_DAYS = 31
+
+
+def _refresh_late_counts(plan_ids):
+    # Recount instead of incrementing so a payment racing the sweep cannot skew the counter
+    return PaymentPlan.objects.filter(id__in=plan_ids).update(
+        late_count=Coalesce(_plan_installments_aggregate(Count('id'), status='Late'), 0),
+        updated_at=timezone.now()
+    )
+
+
+def sweep_installment_statuses(run_date, partition_start, partition_end, chunk_size=SWEEP_CHUNK_SIZE):
+    """
+    Updates the status of unpaid installments due in [partition_start, partition_end) as of run_date:
+    - Sets status to 'Due' if the due date is run_date
+    - Sets status to 'Late' if the due date has passed
+    Rows are processed in bounded (due_date, id) keyset chunks, each committed in its own short
+    transaction together with the late_count of the affected plans and a StatusSweepCheckpoint,
+    so locks are held per chunk and an interrupted sweep resumes after the last committed chunk.
+    Returns a dict with rows_updated and the rows and seconds of every chunk run by this call.
+    """
+    end = min(partition_end, run_date + timedelta(days=1))
+    checkpoint, _ = StatusSweepCheckpoint.objects.get_or_create(
+        run_date=run_date,
+        partition_start=partition_start,
+        partition_end=partition_end
+    )
+    if checkpoint.completed_at is not None:
+        # A finished sweep is run again from the start to pick up rows added since
+        checkpoint.last_due_date = None
+        checkpoint.last_installment_id = None
+        checkpoint.rows_updated = 0
+        checkpoint.chunks = 0
+        checkpoint.completed_at = None
+
+    candidates = Installment.objects.filter(
+        due_date__gte=partition_start,
+        due_date__lt=end,
+        status__in=['Pending', 'Due']
+    ).order_by('due_date', 'id')
+
+    chunks = []
+    while True:
+        chunk_candidates = candidates
+        if checkpoint.last_due_date is not None:
+            chunk_candidates = candidates.filter(
+                Q(due_date__gte=checkpoint.last_due_date)
+                & (Q(due_date__gt=checkpoint.last_due_date) | Q(id__gt=checkpoint.last_installment_id))
+            )
+
+        started = time.perf_counter()
+        with transaction.atomic():
+            rows = list(chunk_candidates.values_list('id', 'due_date', 'plan_id')[:chunk_size])
+            if not rows:
+                checkpoint.completed_at = timezone.now()
+                checkpoint.save()
+                break
+
+            # Lock the plans before their installments, in id order, like payments do
+            changed_plan_ids = {plan_id for _, due_date, plan_id in rows if due_date <= run_date}
+            list(PaymentPlan.objects.filter(id__in=changed_plan_ids).order_by('id').select_for_update().values_list('id'))
+
+            # Re-check the status in the UPDATE itself so installments paid meanwhile are left alone
+            now = timezone.now()
+            due_count = Installment.objects.filter(
+                id__in=[pk for pk, due_date, _ in rows if due_date == run_date],
+                status='Pending'
+            ).update(status='Due', updated_at=now)
+            late_count = Installment.objects.filter(
+                id__in=[pk for pk, due_date, _ in rows if due_date < run_date],
+                status__in=['Pending', 'Due']
+            ).update(status='Late', updated_at=now)
+            if due_count or late_count:
+                # Also bumps updated_at of every plan whose installments changed, which the
+                # plan list's conditional GETs rely on
+                _refresh_late_counts(changed_plan_ids)
+            if late_count:
+                # Only rows this UPDATE turned late carry its timestamp
+                newly_late = Installment.objects.filter(
+                    id__in=[pk for pk, due_date, _ in rows if due_date < run_date],
+                    status='Late',
+                    updated_at=now
+                ).values('plan__merchant_id').annotate(late=Count('id')).order_by('plan__merchant_id')
+                # In merchant order, so concurrent partitions lock shared portfolios in the same order
+                for row in newly_late:
+                    _adjust_merchant_portfolio(row['plan__merchant_id'], late_count=row['late'])
+
+            checkpoint.last_installment_id, checkpoint.last_due_date, _ = rows[-1]
+            checkpoint.rows_updated += due_count + late_count
+            checkpoint.chunks += 1
+            checkpoint.save()
+
+        elapsed = time.perf_counter() - started
+        chunks.append({'rows': due_count + late_count, 'seconds': round(elapsed, 4)})
+        logger.info(
+            'Installment status sweep %s [%s, %s) chunk %d: %d row(s) in %.3fs',
+            run_date, partition_start, partition_end, checkpoint.chunks, due_count + late_count, elapsed
+        )
+
+    return {'rows_updated': checkpoint.rows_updated, 'chunks': chunks}
+
+
+def installment_status_sweep_partitions(run_date, partition_days=SWEEP_PARTITION_DAYS):
+    """
+    Splits the due dates still needing a status update as of run_date into [start, end) windows
+    of partition_days days that can be swept in parallel.
+    """
+    oldest = Installment.objects.filter(
+        due_date__lte=run_date,
+        status__in=['Pending', 'Due']
+    ).aggregate(oldest=Min('due_date'))['oldest']
+    if oldest is None:
+        return []
+
+    partitions = []
+    start = oldest
+    while start <= run_date:
+        end = min(start + timedelta(days=partition_days), run_date + timedelta(days=1))
+        partitions.append((start, end))
+        start = end
+    return partitions
+
+
 def update_installment_statuses():
     """
     Updates the status of installments based on their due dates.
     - Sets status to 'Due' if the due date is today
     - Sets status to 'Late' if the due date has passed
+    Runs sweep_installment_statuses over every due date up to today in a single process.
     Returns the number of installments updated.
     """
     today = timezone.now().date()
-    
-    # Update installments that are due today to 'Due' status
-    due_today_count = Installment.objects.filter(
-        due_date=today,
-        status='Pending'
-    ).update(status='Due')
-    
-    # Update overdue installments to 'Late' status
-    overdue_count = Installment.objects.filter(
-        due_date__lt=today,
-        status__in=['Pending', 'Due']
-    ).update(status='Late')
-    
-    return due_today_count + overdue_count
+    result = sweep_installment_statuses(today, date.min, today + timedelta(days=1))
+    return result['rows_updated']
+
 
+UPCOMING_INSTALLMENT_DAYS = 3
+NOTIFY_CHUNK_SIZE = 2000
+NOTIFY_BATCH_SIZE = 500
 
 def check_upcoming_installments():
     """
     Checks for installments that are due in 3 days.
     Returns a list of upcoming installments.
     """
-    future_date = timezone.now().date() + timedelta(days=3)
+    future_date = timezone.now().date() + timedelta(days=UPCOMING_INSTALLMENT_DAYS)
     
     upcoming_installments = Installment.objects.filter(
         due_date=future_date,
@@ -107,18 +450,178 @@ def check_upcoming_installments():
     return upcoming_installments
 
 
-def pay_installment(installment_id: uuid.UUID, user_id: uuid.UUID) -> Installment:
+def _upcoming_reminders(due_date, chunk_size):
     """
-    Processes payment for an installment. Updates the installment status to 'Paid'.
-    Validates that the installment belongs to the user and has a valid status for payment.
+    Streams one UserReminder per user for the pending installments due on due_date that were
+    not reminded yet. Rows come from a server-side cursor, projected to the columns the
+    backends need and ordered by user so they group without buffering the whole day.
+    """
+    rows = Installment.objects.filter(
+        due_date=due_date,
+        status='Pending',
+        plan__user__isnull=False,
+        reminder__isnull=True
+    ).order_by('plan__user_id', 'id').values_list(
+        'id', 'plan_id', 'amount', 'due_date', 'plan__merchant__email', 'plan__user_id', 'plan__user__email'
+    ).iterator(chunk_size=chunk_size)
+
+    for (user_id, email), group in groupby(rows, key=itemgetter(5, 6)):
+        yield UserReminder(user_id, email, UPCOMING_INSTALLMENT_DAYS, [UpcomingInstallment(*row[:5]) for row in group])
+
+
+def _deliver_reminders(backend, reminders):
+    """
+    Records the reminders and hands them to the backend in one transaction. The unique
+    installment on InstallmentReminder makes a concurrent run fail instead of reminding twice.
+    """
+    with transaction.atomic():
+        InstallmentReminder.objects.bulk_create(
+            [
+                InstallmentReminder(installment_id=installment.id, due_date=installment.due_date, backend=backend.name)
+                for reminder in reminders
+                for installment in reminder.installments
+            ],
+            batch_size=BULK_CREATE_BATCH_SIZE
+        )
+        backend.send(reminders)
+
+
+def notify_upcoming_installments(backend=None, chunk_size=NOTIFY_CHUNK_SIZE, batch_size=NOTIFY_BATCH_SIZE):
+    """
+    Reminds users about their pending installments due in 3 days, one reminder per user,
+    delivered in batches of batch_size users through the configured notification backend.
+    Installments that already have an InstallmentReminder are skipped, so re-running is safe.
+    Returns counts of the installments and users reminded and the batches sent.
+    """
+    backend = backend or get_notification_backend()
+    due_date = timezone.now().date() + timedelta(days=UPCOMING_INSTALLMENT_DAYS)
+    result = {'installments': 0, 'users': 0, 'batches': 0}
+
+    batch = []
+    for reminder in _upcoming_reminders(due_date, chunk_size):
+        batch.append(reminder)
+        result['installments'] += len(reminder.installments)
+        if len(batch) >= batch_size:
+            _deliver_reminders(backend, batch)
+            result['batches'] += 1
+            result['users'] += len(batch)
+            batch = []
+
+    if batch:
+        _deliver_reminders(backend, batch)
+        result['batches'] += 1
+        result['users'] += len(batch)
+
+    return result
+
+
+# Lock order of every write path touching existing plans: the PaymentPlan row(s) first, by id,
+# then their installments, then the MerchantPortfolio row(s), by merchant id. Payments and the
+# status sweep update the same rows, and taking them in one order keeps them from deadlocking.
+
+def lock_installment_for_payment(installment_id: uuid.UUID) -> Installment:
+    """
+    Locks the plan of an installment and then the installment (SELECT ... FOR UPDATE) and returns
+    the installment with the locked plan attached. Must run inside a transaction; concurrent
+    payments of the same installment or plan wait here and then see the committed state.
+    """
+    try:
+        plan = PaymentPlan.objects.select_for_update(of=('self',)).get(installments__id=installment_id)
+    except PaymentPlan.DoesNotExist:
+        raise Installment.DoesNotExist('Installment matching query does not exist.')
+    installment = Installment.objects.select_for_update().get(id=installment_id)
+    installment.plan = plan
+    return installment
+
+
+def apply_installment_payment(installment: Installment) -> Installment:
+    """
+    Marks a locked installment (see lock_installment_for_payment) as 'Paid' and updates its
+    plan summary columns, in two UPDATE statements. The installment UPDATE is conditional on
+    the row not being paid yet, so a payment is never counted twice.
     """
-    installment = Installment.objects.select_related('plan').get(id=installment_id)
+    now = timezone.now()
+    paid = Installment.objects.filter(id=installment.id).exclude(status='Paid').update(status='Paid', updated_at=now)
+    if not paid:
+        installment.status = 'Paid'
+        return installment
+
+    was_late = installment.status == 'Late'
     installment.status = 'Paid'
-    installment.save()
-    
-    unpaid_count = installment.plan.installments.exclude(status='Paid').count()
-    if unpaid_count == 0:
-        installment.plan.status = 'Paid'
-        installment.plan.save()
-    
-    return installment
\ No newline at end of file
+    installment.updated_at = now
+
+    plan = installment.plan
+    plan.paid_amount += installment.amount
+    plan.paid_count += 1
+    plan.late_count -= 1 if was_late else 0
+    plan.next_due_date = _plan_installments_aggregate(Min('due_date'), ~Q(status='Paid'))
+    if plan.paid_count >= plan.number_of_installments:
+        plan.status = 'Paid'
+    plan.save(update_fields=['paid_amount', 'paid_count', 'late_count', 'next_due_date', 'status', 'updated_at'])
+    # Defer the field so it reloads on access instead of holding the saved expression
+    del plan.next_due_date
+    _adjust_merchant_portfolio(
+        plan.merchant_id, collected_amount=installment.amount, paid_count=1, late_count=-1 if was_late else 0
+    )
+    count_on_commit(INSTALLMENTS_PAID)
+
+    return installment
+
+
+def lock_plan_for_payment(plan_id: uuid.UUID) -> PaymentPlan:
+    """
+    Fetches a payment plan with its user and merchant and locks the plan row (SELECT ... FOR UPDATE).
+    Must run inside a transaction.
+    """
+    return PaymentPlan.objects.select_related('user', 'merchant').select_for_update(of=('self',)).get(id=plan_id)
+
+
+def lock_unpaid_installments(plan: PaymentPlan) -> list:
+    """
+    Fetches and locks the unpaid installments of a locked plan, ordered by due date.
+    """
+    return list(plan.installments.exclude(status='Paid').order_by('due_date', 'id').select_for_update())
+
+
+def pay_plan_installments(plan: PaymentPlan, unpaid: list, installment_ids=None) -> list:
+    """
+    Pays several installments of a locked plan (see lock_plan_for_payment and lock_unpaid_installments)
+    with one bulk UPDATE and one plan save. installment_ids selects which of the unpaid installments
+    to pay; None pays all of them. The plan is marked 'Paid' in the same transaction once every
+    installment is paid. Returns the paid installments.
+    """
+    paid = [installment for installment in unpaid if installment_ids is None or installment.id in installment_ids]
+    if not paid:
+        return paid
+
+    now = timezone.now()
+    paid_ids = {installment.id for installment in paid}
+    Installment.objects.filter(id__in=paid_ids).update(status='Paid', updated_at=now)
+
+    remaining = [installment.due_date for installment in unpaid if installment.id not in paid_ids]
+    paid_amount = sum(installment.amount for installment in paid)
+    paid_late = sum(1 for installment in paid if installment.status == 'Late')
+    plan.paid_amount += paid_amount
+    plan.paid_count += len(paid)
+    plan.late_count -= paid_late
+    plan.next_due_date = min(remaining, default=None)
+    if plan.paid_count >= plan.number_of_installments:
+        plan.status = 'Paid'
+    plan.save(update_fields=['paid_amount', 'paid_count', 'late_count', 'next_due_date', 'status', 'updated_at'])
+    _adjust_merchant_portfolio(plan.merchant_id, collected_amount=paid_amount, paid_count=len(paid), late_count=-paid_late)
+    count_on_commit(INSTALLMENTS_PAID, len(paid))
+
+    for installment in paid:
+        installment.status = 'Paid'
+        installment.updated_at = now
+    return paid
+
+
+@transaction.atomic
+def pay_installment(installment_id: uuid.UUID) -> Installment:
+    """
+    Processes payment for an installment. Updates the installment status to 'Paid'.
+    The installment and its plan are row-locked first, the plan summary columns are updated
+    in place, and the plan is marked 'Paid' once its paid_count reaches number_of_installments.
+    """
+    return apply_installment_payment(lock_installment_for_payment(installment_id))
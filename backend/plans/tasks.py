@@ -1,5 +1,13 @@
-from celery import shared_task
-from .services import update_installment_statuses, check_upcoming_installments
+from celery import chord, shared_task
+from datetime import date
+from django.utils import timezone
+from .services import (
+    update_installment_statuses,
+    notify_upcoming_installments,
+    sweep_installment_statuses,
+    installment_status_sweep_partitions,
+    SWEEP_PARTITION_DAYS,
+)
 from celery.utils.log import get_task_logger
 
 logger = get_task_logger(__name__)
@@ -18,20 +26,66 @@ def update_installment_statuses_task():
         logger.error(f'Error updating installment statuses: {str(e)}')
         raise
 
+@shared_task
+def update_installment_statuses_parallel_task(partition_days=SWEEP_PARTITION_DAYS):
+    """
+    Celery task to update installment statuses in parallel.
+    Splits the due dates to sweep into partitions, sweeps each one in its own task (group)
+    and sums the results in summarize_installment_status_sweep_task (chord callback).
+    """
+    run_date = timezone.now().date()
+    partitions = installment_status_sweep_partitions(run_date, partition_days)
+    if not partitions:
+        logger.info('No installment statuses to update')
+        return 0
+
+    chord(
+        sweep_installment_statuses_partition_task.s(run_date.isoformat(), start.isoformat(), end.isoformat())
+        for start, end in partitions
+    )(summarize_installment_status_sweep_task.s())
+    logger.info(f'Dispatched installment status sweep over {len(partitions)} partition(s)')
+    return len(partitions)
+
+@shared_task
+def sweep_installment_statuses_partition_task(run_date, partition_start, partition_end):
+    """
+    Celery task sweeping the installment statuses of one due_date partition.
+    Resumes from the partition checkpoint when retried.
+    """
+    result = sweep_installment_statuses(
+        date.fromisoformat(run_date),
+        date.fromisoformat(partition_start),
+        date.fromisoformat(partition_end)
+    )
+    logger.info(
+        f'Swept [{partition_start}, {partition_end}): {result["rows_updated"]} installment(s) '
+        f'in {len(result["chunks"])} chunk(s), {sum(c["seconds"] for c in result["chunks"]):.3f}s'
+    )
+    return result
+
+@shared_task
+def summarize_installment_status_sweep_task(results):
+    """
+    Chord callback totalling the partition sweeps.
+    """
+    updated_count = sum(result['rows_updated'] for result in results)
+    logger.info(f'Successfully updated {updated_count} installment(s) across {len(results)} partition(s)')
+    return updated_count
+
 @shared_task
 def check_upcoming_installments_task():
     """
-    Celery task to check for installments due in 3 days and log notifications.
+    Celery task to remind users about installments due in 3 days.
+    Streams the upcoming installments, groups them per user and delivers them in batches
+    through the configured notification backend. Already reminded installments are skipped.
     """
     try:
-        upcoming = check_upcoming_installments()
-        for installment in upcoming:
-            logger.info(
-                f"UPCOMING INSTALLMENT NOTIFICATION: "
-                f"User {installment.plan.user.email} has an installment of "
-                f"${installment.amount} due in 3 days (Due date: {installment.due_date})"
-            )
-        return len(upcoming)
+        result = notify_upcoming_installments()
+        logger.info(
+            f'Sent {result["installments"]} upcoming installment reminder(s) to '
+            f'{result["users"]} user(s) in {result["batches"]} batch(es)'
+        )
+        return result['installments']
     except Exception as e:
         logger.error(f'Error checking upcoming installments: {str(e)}')
-        raise
\ No newline at end of file
+        raise
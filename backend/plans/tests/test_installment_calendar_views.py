@@ -0,0 +1,90 @@
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from decimal import Decimal
+from datetime import date, timedelta
+from ..models import PaymentPlan, Installment
+
+User = get_user_model()
+
+class InstallmentCalendarViewTests(APITestCase):
+    def setUp(self):
+        self.merchant = User.objects.create_user(email='m@test.com', password='p', role='merchant')
+        self.other_merchant = User.objects.create_user(email='m2@test.com', password='p', role='merchant')
+        self.user = User.objects.create_user(email='u@test.com', password='p', role='user')
+        self.other_user = User.objects.create_user(email='u2@test.com', password='p', role='user')
+        self.start_date = date(2025, 5, 1)
+
+        self.plan = self.create_plan(self.merchant, self.user)
+        self.second_plan = self.create_plan(self.merchant, self.other_user)
+        self.other_plan = self.create_plan(self.other_merchant, self.user)
+        self.url = reverse('plans:installment-calendar')
+
+    def create_plan(self, merchant, user):
+        plan = PaymentPlan.objects.create(
+            merchant=merchant, user=user, total_amount=Decimal('300.00'),
+            number_of_installments=3, start_date=self.start_date
+        )
+        for month, status_val in enumerate(['Paid', 'Late', 'Pending']):
+            Installment.objects.create(
+                plan=plan, due_date=self.start_date + timedelta(days=31 * month),
+                amount=Decimal('100.00'), status=status_val
+            )
+        return plan
+
+    def get_window(self, start, end, **params):
+        return self.client.get(self.url, {'from': start.isoformat(), 'to': end.isoformat(), **params})
+
+    def test_unauthenticated_cannot_view_calendar(self):
+        response = self.get_window(self.start_date, self.start_date)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_user_sees_own_installments_in_window(self):
+        self.client.force_authenticate(user=self.user)
+        # The first two months: Paid and Late rows of both of the user's plans
+        with self.assertNumQueries(1):
+            response = self.get_window(self.start_date, self.start_date + timedelta(days=40))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 4)
+        self.assertEqual({item['plan'] for item in response.data}, {str(self.plan.id), str(self.other_plan.id)})
+        self.assertEqual([item['due_date'] for item in response.data], sorted(item['due_date'] for item in response.data))
+        self.assertEqual(set(response.data[0]), {'id', 'plan', 'due_date', 'amount', 'status'})
+        self.assertEqual(response.data[0]['amount'], '100.00')
+
+    def test_merchant_sees_installments_of_own_plans(self):
+        self.client.force_authenticate(user=self.merchant)
+        response = self.get_window(self.start_date, self.start_date + timedelta(days=91))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual({item['plan'] for item in response.data}, {str(self.plan.id), str(self.second_plan.id)})
+        self.assertEqual(len(response.data), 6)
+
+    def test_window_bounds_are_inclusive(self):
+        self.client.force_authenticate(user=self.merchant)
+        second_due = self.start_date + timedelta(days=31)
+        response = self.get_window(second_due, second_due)
+        self.assertEqual([item['status'] for item in response.data], ['Late', 'Late'])
+
+    def test_filter_by_plan(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.get_window(self.start_date, self.start_date + timedelta(days=91), plan=self.plan.id)
+        self.assertEqual({item['plan'] for item in response.data}, {str(self.plan.id)})
+
+        # Another merchant's plan filters down to nothing rather than leaking its rows
+        self.client.force_authenticate(user=self.other_merchant)
+        response = self.get_window(self.start_date, self.start_date + timedelta(days=91), plan=self.plan.id)
+        self.assertEqual(response.data, [])
+
+    def test_invalid_windows(self):
+        self.client.force_authenticate(user=self.user)
+        cases = [
+            {},
+            {'from': 'not-a-date', 'to': '2025-05-31'},
+            {'from': '2025-05-31', 'to': '2025-05-01'},
+            {'from': '2025-01-01', 'to': '2025-12-31'},
+        ]
+        for params in cases:
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,10 +1,15 @@
-from rest_framework.test import APITestCase
+from rest_framework.test import APIClient, APITestCase
+from django.test import TransactionTestCase
+from django.db import connection
+from concurrent.futures import ThreadPoolExecutor
+import threading
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from rest_framework import status
 from decimal import Decimal
 from datetime import date, timedelta
-from ..models import PaymentPlan, Installment
+from ..models import PaymentPlan, Installment, MerchantPortfolio
+from ..services import refresh_merchant_portfolios, refresh_plan_summaries
 
 User = get_user_model()
 
@@ -46,6 +51,8 @@ class InstallmentPayViewTests(APITestCase):
                 status=status_val
             )
             self.installments.append(installment)
+        refresh_plan_summaries([self.plan.id])
+        refresh_merchant_portfolios([self.merchant.id])
 
     def get_pay_url(self, installment_id):
         return reverse('plans:pay-installment', kwargs={'id': installment_id})
@@ -97,4 +104,94 @@ class InstallmentPayViewTests(APITestCase):
         self.client.force_authenticate(user=self.merchant)
         pending_installment = next(i for i in self.installments if i.status == 'Pending')
         response = self.client.post(self.get_pay_url(pending_installment.id))
-        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_payment_query_count(self):
+        self.client.force_authenticate(user=self.user)
+        pending_installment = next(i for i in self.installments if i.status == 'Pending')
+        # Savepoint, locked plan, locked installment, installment update, plan update, portfolio update, release
+        with self.assertNumQueries(7):
+            response = self.client.post(self.get_pay_url(pending_installment.id))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'Paid')
+
+        self.plan.refresh_from_db()
+        self.assertEqual(self.plan.paid_count, 2)
+        self.assertEqual(self.plan.paid_amount, Decimal('500.00'))
+        self.assertEqual(self.plan.next_due_date, self.installments[1].due_date)
+
+
+class ConcurrentInstallmentPayViewTests(TransactionTestCase):
+    PARALLEL_PAYMENTS = 8
+
+    def setUp(self):
+        self.merchant = User.objects.create_user(
+            email='merchant@test.com',
+            password='password123',
+            role='merchant'
+        )
+
+        self.user = User.objects.create_user(
+            email='user@test.com',
+            password='password123',
+            role='user'
+        )
+
+        self.plan = PaymentPlan.objects.create(
+            merchant=self.merchant,
+            user=self.user,
+            total_amount=Decimal('500.00'),
+            number_of_installments=2,
+            start_date=date.today()
+        )
+        self.installment = Installment.objects.create(
+            plan=self.plan,
+            due_date=date.today(),
+            amount=Decimal('250.00'),
+            status='Due'
+        )
+        Installment.objects.create(
+            plan=self.plan,
+            due_date=date.today() + timedelta(days=30),
+            amount=Decimal('250.00'),
+            status='Pending'
+        )
+        refresh_plan_summaries([self.plan.id])
+        refresh_merchant_portfolios([self.merchant.id])
+
+    def test_parallel_payments_of_same_installment(self):
+        url = reverse('plans:pay-installment', kwargs={'id': self.installment.id})
+        barrier = threading.Barrier(self.PARALLEL_PAYMENTS)
+
+        def pay(_):
+            client = APIClient()
+            client.force_authenticate(user=self.user)
+            try:
+                barrier.wait()
+                return client.post(url).status_code
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=self.PARALLEL_PAYMENTS) as executor:
+            codes = list(executor.map(pay, range(self.PARALLEL_PAYMENTS)))
+
+        self.assertEqual(codes.count(status.HTTP_200_OK), 1)
+        self.assertEqual(codes.count(status.HTTP_400_BAD_REQUEST), self.PARALLEL_PAYMENTS - 1)
+        self.plan.refresh_from_db()
+        self.assertEqual(self.plan.paid_count, 1)
+        self.assertEqual(self.plan.paid_amount, Decimal('250.00'))
+        self.assertEqual(self.plan.status, 'Active')
+        portfolio = MerchantPortfolio.objects.get(merchant=self.merchant)
+        self.assertEqual(portfolio.paid_count, 1)
+        self.assertEqual(portfolio.collected_amount, Decimal('250.00'))
+
+    def test_options_and_browsable_form_outside_a_transaction(self):
+        # Both build the serializer without running create(), so no row lock may be taken there
+        url = reverse('plans:pay-installment', kwargs={'id': self.installment.id})
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+
+        self.assertEqual(client.options(url).status_code, status.HTTP_200_OK)
+        self.assertEqual(client.get(url, HTTP_ACCEPT='text/html').status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+        self.installment.refresh_from_db()
+        self.assertEqual(self.installment.status, 'Due')
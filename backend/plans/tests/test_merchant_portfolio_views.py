@@ -0,0 +1,54 @@
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework import status
+from decimal import Decimal
+from datetime import timedelta
+from django.db.models import F
+from ..models import Installment
+from ..services import create_payment_plan, update_installment_statuses
+
+User = get_user_model()
+
+class MerchantPortfolioViewTests(APITestCase):
+    def setUp(self):
+        self.merchant = User.objects.create_user(email='m@test.com', password='p', role='merchant')
+        self.user = User.objects.create_user(email='u@test.com', password='p', role='user')
+        self.url = reverse('plans:merchant-portfolio')
+
+    def test_unauthenticated_cannot_view_analytics(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_user_role_is_forbidden(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_merchant_without_plans_gets_zeros(self):
+        self.client.force_authenticate(user=self.merchant)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['plan_count'], 0)
+        self.assertEqual(response.data['outstanding_amount'], '0.00')
+        self.assertEqual(response.data['late_ratio'], 0.0)
+
+    def test_portfolio_totals_in_one_query(self):
+        today = timezone.now().date()
+        for _ in range(5):
+            create_payment_plan(self.merchant, self.user, Decimal('300.00'), 3, today)
+        # Two of the three installments of every plan are now overdue
+        Installment.objects.update(due_date=F('due_date') - timedelta(days=40))
+        update_installment_statuses()
+
+        self.client.force_authenticate(user=self.merchant)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['plan_count'], 5)
+        self.assertEqual(response.data['late_count'], 10)
+        self.assertEqual(response.data['late_ratio'], 10 / 15)
+        self.assertEqual(response.data['total_amount'], '1500.00')
+        self.assertEqual(response.data['collected_amount'], '0.00')
+        self.assertEqual(response.data['outstanding_amount'], '1500.00')
@@ -0,0 +1,54 @@
+# plans/tests/test_migrations.py
+from datetime import date
+from decimal import Decimal
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+
+class PlanSummaryBackfillMigrationTests(TransactionTestCase):
+    """
+    Migrates plans back to before the summary columns, adds a part-paid and a fully paid plan,
+    and checks 0003 backfills their summaries so the payment paths can complete them.
+    """
+    migrate_from = [('plans', '0002_paymentplan_created_at_indexes')]
+    migrate_to = [('plans', '0003_paymentplan_summary_columns')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_backfills_summaries_and_status(self):
+        apps = self.migrate(self.migrate_from)
+        User = apps.get_model('accounts', 'User')
+        PaymentPlan = apps.get_model('plans', 'PaymentPlan')
+        Installment = apps.get_model('plans', 'Installment')
+
+        merchant = User.objects.create(email='merchant@test.com', role='merchant')
+        part_paid = PaymentPlan.objects.create(
+            merchant=merchant, total_amount=Decimal('300.00'), number_of_installments=3, start_date=date(2026, 1, 1)
+        )
+        paid = PaymentPlan.objects.create(
+            merchant=merchant, total_amount=Decimal('200.00'), number_of_installments=2, start_date=date(2026, 1, 1)
+        )
+        for month, status in [(1, 'Paid'), (2, 'Late'), (3, 'Pending')]:
+            Installment.objects.create(plan=part_paid, due_date=date(2026, month, 1), amount=Decimal('100.00'), status=status)
+        for month in (1, 2):
+            Installment.objects.create(plan=paid, due_date=date(2026, month, 1), amount=Decimal('100.00'), status='Paid')
+
+        apps = self.migrate(self.migrate_to)
+        PaymentPlan = apps.get_model('plans', 'PaymentPlan')
+
+        part_paid = PaymentPlan.objects.get(id=part_paid.id)
+        self.assertEqual(
+            (part_paid.paid_amount, part_paid.paid_count, part_paid.late_count, part_paid.next_due_date, part_paid.status),
+            (Decimal('100.00'), 1, 1, date(2026, 2, 1), 'Active')
+        )
+        paid = PaymentPlan.objects.get(id=paid.id)
+        self.assertEqual((paid.paid_count, paid.next_due_date, paid.status), (2, None, 'Paid'))
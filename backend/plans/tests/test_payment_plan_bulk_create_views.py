@@ -0,0 +1,103 @@
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework import status
+from decimal import Decimal
+from datetime import timedelta
+from ..models import PaymentPlan, Installment
+
+User = get_user_model()
+
+class PaymentPlanBulkCreateViewTests(APITestCase):
+    def setUp(self):
+        self.merchant = User.objects.create_user(
+            email='merchant@test.com',
+            password='password123',
+            role='merchant'
+        )
+
+        self.user = User.objects.create_user(
+            email='user@test.com',
+            password='password123',
+            role='user'
+        )
+
+        self.other_user = User.objects.create_user(
+            email='other@test.com',
+            password='password123',
+            role='user'
+        )
+
+        self.start_date = (timezone.now().date() + timedelta(days=1)).isoformat()
+        self.url = reverse('plans:bulk-create-payment-plans')
+
+    def plan_data(self, user, total_amount='1000.00', number_of_installments=4):
+        return {
+            'user': str(user.pk),
+            'total_amount': total_amount,
+            'number_of_installments': number_of_installments,
+            'start_date': self.start_date
+        }
+
+    def test_unauthenticated_access(self):
+        response = self.client.post(self.url, {'plans': [self.plan_data(self.user)]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_non_merchant_access(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(self.url, {'plans': [self.plan_data(self.user)]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_successful_bulk_creation(self):
+        self.client.force_authenticate(user=self.merchant)
+        data = {'plans': [self.plan_data(self.user), self.plan_data(self.other_user, '300.00', 3)]}
+        response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data['created']), 2)
+        self.assertEqual(response.data['errors'], [])
+        self.assertEqual(PaymentPlan.objects.filter(merchant=self.merchant).count(), 2)
+        self.assertEqual(Installment.objects.filter(plan__merchant=self.merchant).count(), 7)
+
+    def test_partial_success_reports_item_errors(self):
+        self.client.force_authenticate(user=self.merchant)
+        data = {'plans': [
+            self.plan_data(self.user),
+            self.plan_data(self.user, total_amount='-5.00'),
+            self.plan_data(self.merchant),
+        ]}
+        response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([item['index'] for item in response.data['created']], [0])
+        errors = {item['index']: item['errors'] for item in response.data['errors']}
+        self.assertIn('total_amount', errors[1])
+        self.assertIn('user', errors[2])
+        self.assertEqual(PaymentPlan.objects.count(), 1)
+
+    def test_all_items_invalid(self):
+        self.client.force_authenticate(user=self.merchant)
+        data = {'plans': [self.plan_data(self.user, number_of_installments=0)]}
+        response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['created'], [])
+        self.assertIn('number_of_installments', response.data['errors'][0]['errors'])
+        self.assertEqual(PaymentPlan.objects.count(), 0)
+
+    def test_empty_batch(self):
+        self.client.force_authenticate(user=self.merchant)
+        response = self.client.post(self.url, {'plans': []}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('plans', response.data)
+
+    def test_malformed_item(self):
+        self.client.force_authenticate(user=self.merchant)
+        data = {'plans': [self.plan_data(self.user), {'user': 'not-a-uuid'}]}
+        response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['plans'][0], {})
+        self.assertIn('user', response.data['plans'][1])
+        self.assertEqual(PaymentPlan.objects.count(), 0)
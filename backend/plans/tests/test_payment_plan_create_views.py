@@ -7,6 +7,7 @@ from rest_framework import status
 from decimal import Decimal
 from datetime import timedelta
 from ..models import PaymentPlan, Installment
+from ..validators import MAX_INSTALLMENTS
 
 User = get_user_model()
 
@@ -105,6 +106,17 @@ class PaymentPlanCreateViewTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('number_of_installments', response.data)
 
+    def test_too_many_installments(self):
+        """Test validation of more installments than MAX_INSTALLMENTS"""
+        self.client.force_authenticate(user=self.merchant)
+        invalid_data = self.valid_data.copy()
+        invalid_data['number_of_installments'] = MAX_INSTALLMENTS + 1
+
+        response = self.client.post(self.url, invalid_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('number_of_installments', response.data)
+        self.assertEqual(PaymentPlan.objects.count(), 0)
+
     def test_negative_amount(self):
         """Test validation of negative amount"""
         self.client.force_authenticate(user=self.merchant)
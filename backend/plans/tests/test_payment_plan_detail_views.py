@@ -0,0 +1,161 @@
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from decimal import Decimal
+from datetime import date, timedelta
+import uuid
+from ..models import PaymentPlan, Installment
+from ..services import pay_installment, sweep_installment_statuses
+from accounts.serializers import RoleTokenObtainPairSerializer
+
+User = get_user_model()
+
+class PaymentPlanDetailViewTests(APITestCase):
+    def setUp(self):
+        self.merchant = User.objects.create_user(email='m@test.com', password='p', role='merchant')
+        self.user = User.objects.create_user(email='u@test.com', password='p', role='user')
+        self.other_user = User.objects.create_user(email='other@test.com', password='p', role='user')
+        start_date = date(2025, 5, 1)
+
+        self.plan = PaymentPlan.objects.create(
+            merchant=self.merchant, user=self.user, total_amount=Decimal('100.00'),
+            number_of_installments=2, start_date=start_date
+        )
+        Installment.objects.create(plan=self.plan, due_date=start_date, amount=Decimal('50.00'))
+        Installment.objects.create(plan=self.plan, due_date=start_date + timedelta(days=30), amount=Decimal('50.00'))
+        self.url = reverse('plans:payment-plan-detail', kwargs={'id': self.plan.id})
+
+    def test_unauthenticated_cannot_view_plan(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_user_and_merchant_see_plan_with_installments(self):
+        for account in (self.user, self.merchant):
+            self.client.force_authenticate(user=account)
+            # Validators, then the plan with user and merchant, then its installments
+            with self.assertNumQueries(3):
+                response = self.client.get(self.url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data['id'], str(self.plan.id))
+            self.assertEqual(response.data['user_email'], self.user.email)
+            self.assertEqual(len(response.data['installments']), 2)
+
+    def test_other_user_is_forbidden(self):
+        self.client.force_authenticate(user=self.other_user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_unknown_plan_not_found(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(reverse('plans:payment-plan-detail', kwargs={'id': uuid.uuid4()}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class PaymentPlanDetailConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.merchant = User.objects.create_user(email='m@test.com', password='p', role='merchant')
+        self.user = User.objects.create_user(email='u@test.com', password='p', role='user')
+        self.other_user = User.objects.create_user(email='other@test.com', password='p', role='user')
+        self.start_date = date(2025, 5, 1)
+        self.plan = PaymentPlan.objects.create(
+            merchant=self.merchant, user=self.user, total_amount=Decimal('100.00'),
+            number_of_installments=2, start_date=self.start_date
+        )
+        self.first = Installment.objects.create(plan=self.plan, due_date=self.start_date, amount=Decimal('50.00'))
+        Installment.objects.create(plan=self.plan, due_date=self.start_date + timedelta(days=30), amount=Decimal('50.00'))
+        self.url = reverse('plans:payment-plan-detail', kwargs={'id': self.plan.id})
+        self.client.force_authenticate(user=self.user)
+
+    def test_validators_on_full_response(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['ETag'].startswith('W/"'))
+        self.assertNotIn('Last-Modified', response)
+
+    def test_matching_etag_returns_304_after_one_query(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+    def test_merchant_shares_the_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        self.client.force_authenticate(user=self.merchant)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_payment_changes_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        pay_installment(self.first.id)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_status_sweep_changes_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        sweep_installment_statuses(self.start_date, self.start_date, self.start_date + timedelta(days=1))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        statuses = {item['id']: item['status'] for item in response.data['installments']}
+        self.assertEqual(statuses[str(self.first.id)], 'Due')
+
+    def test_other_user_gets_403_not_304(self):
+        etag = self.client.get(self.url)['ETag']
+        self.client.force_authenticate(user=self.other_user)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_if_modified_since_is_ignored(self):
+        # Two writes within one second would otherwise get a stale 304
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_email_change_changes_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        self.merchant.email = 'shop@test.com'
+        self.merchant.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['merchant_email'], 'shop@test.com')
+
+
+class AsgiPlanReadViewTests(APITestCase):
+    """
+    Drives the read views through Django's ASGI handler, which core.asgi still serves.
+    """
+    def setUp(self):
+        self.merchant = User.objects.create_user(email='m@test.com', password='p', role='merchant')
+        self.user = User.objects.create_user(email='u@test.com', password='p', role='user')
+        self.plan = PaymentPlan.objects.create(
+            merchant=self.merchant, user=self.user, total_amount=Decimal('100.00'),
+            number_of_installments=1, start_date=date(2025, 5, 1)
+        )
+        Installment.objects.create(plan=self.plan, due_date=date(2025, 5, 1), amount=Decimal('100.00'))
+        access = RoleTokenObtainPairSerializer.get_token(self.user).access_token
+        self.headers = {'Authorization': f'Bearer {access}'}
+
+    async def test_list_over_asgi(self):
+        response = await self.async_client.get(
+            reverse('plans:list-payment-plans'), {'include': 'installments'}, headers=self.headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.json()['results']
+        self.assertEqual([plan['id'] for plan in results], [str(self.plan.id)])
+        self.assertEqual(len(results[0]['installments']), 1)
+
+    async def test_detail_over_asgi(self):
+        response = await self.async_client.get(
+            reverse('plans:payment-plan-detail', kwargs={'id': self.plan.id}), headers=self.headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['merchant_email'], self.merchant.email)
+
+    async def test_invalid_token_over_asgi(self):
+        response = await self.async_client.get(
+            reverse('plans:list-payment-plans'), headers={'Authorization': f'Bearer {AccessToken()}x'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
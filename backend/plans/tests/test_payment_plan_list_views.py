@@ -5,6 +5,7 @@ from rest_framework import status
 from decimal import Decimal
 from datetime import date, timedelta
 from ..models import PaymentPlan, Installment
+from ..services import pay_installment
 
 User = get_user_model()
 
@@ -48,14 +49,14 @@ class PaymentPlanListViewTests(APITestCase):
         self.client.force_authenticate(user=self.other_user)
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, [])
+        self.assertEqual(response.data['results'], [])
 
     def test_merchant_sees_only_own_created_plans(self):
         self.client.force_authenticate(user=self.merchant1)
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
-        plan_ids_in_response = {str(plan['id']) for plan in response.data}
+        self.assertEqual(len(response.data['results']), 2)
+        plan_ids_in_response = {str(plan['id']) for plan in response.data['results']}
         expected_plan_ids = {str(self.plan_m1_u1.id), str(self.plan_m1_u2.id)}
         self.assertSetEqual(plan_ids_in_response, expected_plan_ids)
         self.assertNotIn(str(self.plan_m2_u1.id), plan_ids_in_response)
@@ -64,22 +65,22 @@ class PaymentPlanListViewTests(APITestCase):
         self.client.force_authenticate(user=self.user1)
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
-        plan_ids_in_response = {str(plan['id']) for plan in response.data}
+        self.assertEqual(len(response.data['results']), 2)
+        plan_ids_in_response = {str(plan['id']) for plan in response.data['results']}
         expected_plan_ids = {str(self.plan_m1_u1.id), str(self.plan_m2_u1.id)}
         self.assertSetEqual(plan_ids_in_response, expected_plan_ids)
         self.assertNotIn(str(self.plan_m1_u2.id), plan_ids_in_response)
 
     def test_user_sees_nested_installments(self):
         self.client.force_authenticate(user=self.user1)
-        response = self.client.get(self.url)
+        response = self.client.get(self.url, {'include': 'installments'})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        m2_plan = next((p for p in response.data if p['merchant_email'] == 'm2@test.com'), None)
+        m2_plan = next((p for p in response.data['results'] if p['merchant_email'] == 'm2@test.com'), None)
         self.assertIsNotNone(m2_plan, "Plan from merchant2 not found")
         self.assertEqual(len(m2_plan['installments']), 3)
         for installment in m2_plan['installments']:
             self.assertEqual(Decimal(installment['amount']), Decimal('100.00'))
-        m1_plan = next((p for p in response.data if p['merchant_email'] == 'm1@test.com'), None)
+        m1_plan = next((p for p in response.data['results'] if p['merchant_email'] == 'm1@test.com'), None)
         self.assertIsNotNone(m1_plan, "Plan from merchant1 not found")
         self.assertEqual(len(m1_plan['installments']), 2)
         for installment in m1_plan['installments']:
@@ -90,24 +91,25 @@ class PaymentPlanListViewTests(APITestCase):
         self.client.force_authenticate(user=merchant3)
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, [])
+        self.assertEqual(response.data['results'], [])
 
     def test_user_with_no_plans_gets_empty_list(self):
         user3 = User.objects.create_user(email='u3_empty@test.com', password='p', role='user')
         self.client.force_authenticate(user=user3)
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(response.data, [])
+        self.assertEqual(response.data['results'], [])
 
     def test_serializer_output_fields(self):
         self.client.force_authenticate(user=self.merchant1)
-        response = self.client.get(self.url)
+        response = self.client.get(self.url, {'include': 'installments'})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertGreater(len(response.data), 0, "Serializer output test requires at least one plan in the response.")
-        plan_data = response.data[0]
+        self.assertGreater(len(response.data['results']), 0, "Serializer output test requires at least one plan in the response.")
+        plan_data = response.data['results'][0]
         expected_plan_keys = [
             'id', 'merchant_email', 'user_email', 'total_amount',
             'number_of_installments', 'start_date', 'status',
+            'paid_amount', 'remaining_amount', 'paid_count', 'late_count', 'next_due_date',
             'created_at', 'updated_at', 'installments'
         ]
         self.assertCountEqual(plan_data.keys(), expected_plan_keys)
@@ -116,4 +118,134 @@ class PaymentPlanListViewTests(APITestCase):
         expected_installment_keys = [
             'id', 'due_date', 'amount', 'status', 'created_at', 'updated_at'
         ]
-        self.assertCountEqual(installment_data.keys(), expected_installment_keys)
\ No newline at end of file
+        self.assertCountEqual(installment_data.keys(), expected_installment_keys)
+
+    def test_installments_omitted_by_default(self):
+        self.client.force_authenticate(user=self.merchant1)
+        # Validators, then the page
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for plan in response.data['results']:
+            self.assertNotIn('installments', plan)
+            self.assertIsNotNone(plan['merchant_email'])
+
+
+class PaymentPlanListPaginationTests(APITestCase):
+    def setUp(self):
+        self.merchant = User.objects.create_user(email='m@test.com', password='p', role='merchant')
+        self.user = User.objects.create_user(email='u@test.com', password='p', role='user')
+        self.plans = [
+            PaymentPlan.objects.create(
+                merchant=self.merchant, user=self.user, total_amount=Decimal('100.00'),
+                number_of_installments=1, start_date=date(2025, 5, 1)
+            )
+            for _ in range(5)
+        ]
+        # Share one created_at between plans to exercise the id tie-breaker
+        PaymentPlan.objects.filter(id__in=[p.id for p in self.plans[1:4]]).update(created_at=self.plans[1].created_at)
+        self.expected_ids = [
+            str(plan_id) for plan_id in
+            PaymentPlan.objects.order_by('-created_at', '-id').values_list('id', flat=True)
+        ]
+        self.url = reverse('plans:list-payment-plans')
+        self.client.force_authenticate(user=self.merchant)
+
+    def test_walk_forward_and_back(self):
+        response = self.client.get(self.url, {'page_size': 2})
+        self.assertIsNone(response.data['previous'])
+        pages = [[p['id'] for p in response.data['results']]]
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pages.append([p['id'] for p in response.data['results']])
+
+        self.assertEqual([plan_id for page in pages for plan_id in page], self.expected_ids)
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+
+        response = self.client.get(response.data['previous'])
+        self.assertEqual([p['id'] for p in response.data['results']], pages[1])
+        response = self.client.get(response.data['previous'])
+        self.assertEqual([p['id'] for p in response.data['results']], pages[0])
+        self.assertIsNone(response.data['previous'])
+
+    def test_page_size_is_capped(self):
+        response = self.client.get(self.url, {'page_size': 100000})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 5)
+        self.assertIsNone(response.data['next'])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class PaymentPlanListConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.merchant = User.objects.create_user(email='m@test.com', password='p', role='merchant')
+        self.user = User.objects.create_user(email='u@test.com', password='p', role='user')
+        self.plan = PaymentPlan.objects.create(
+            merchant=self.merchant, user=self.user, total_amount=Decimal('100.00'),
+            number_of_installments=1, start_date=date(2025, 5, 1)
+        )
+        self.installment = Installment.objects.create(plan=self.plan, due_date=date(2025, 5, 1), amount=Decimal('100.00'))
+        self.url = reverse('plans:list-payment-plans')
+        self.client.force_authenticate(user=self.user)
+
+    def test_matching_etag_returns_304_after_one_query(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_etag_depends_on_query_and_user(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.get(self.url, {'include': 'installments'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.client.force_authenticate(user=self.merchant)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_new_plan_changes_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        PaymentPlan.objects.create(
+            merchant=self.merchant, user=self.user, total_amount=Decimal('50.00'),
+            number_of_installments=1, start_date=date(2025, 5, 1)
+        )
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_deleted_plan_changes_etag(self):
+        PaymentPlan.objects.create(
+            merchant=self.merchant, user=self.user, total_amount=Decimal('50.00'),
+            number_of_installments=1, start_date=date(2025, 5, 1)
+        )
+        etag = self.client.get(self.url)['ETag']
+        self.plan.delete()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_email_change_changes_etag(self):
+        self.client.force_authenticate(user=self.merchant)
+        etag = self.client.get(self.url)['ETag']
+        self.user.email = 'renamed@test.com'
+        self.user.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['user_email'], 'renamed@test.com')
+
+    def test_removed_user_changes_etag(self):
+        self.client.force_authenticate(user=self.merchant)
+        etag = self.client.get(self.url)['ETag']
+        self.user.delete()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_payment_changes_etag_of_nested_installments(self):
+        etag = self.client.get(self.url, {'include': 'installments'})['ETag']
+        pay_installment(self.installment.id)
+        response = self.client.get(self.url, {'include': 'installments'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['installments'][0]['status'], 'Paid')
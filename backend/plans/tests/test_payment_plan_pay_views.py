@@ -0,0 +1,178 @@
+from rest_framework.test import APIClient, APITestCase
+from django.test import TransactionTestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from decimal import Decimal
+from datetime import date, timedelta
+from ..models import PaymentPlan, Installment
+from ..services import refresh_merchant_portfolios, refresh_plan_summaries
+
+User = get_user_model()
+
+class PaymentPlanPayViewTests(APITestCase):
+    def setUp(self):
+        self.merchant = User.objects.create_user(
+            email='merchant@test.com',
+            password='password123',
+            role='merchant'
+        )
+
+        self.user = User.objects.create_user(
+            email='user@test.com',
+            password='password123',
+            role='user'
+        )
+
+        self.other_user = User.objects.create_user(
+            email='other@test.com',
+            password='password123',
+            role='user'
+        )
+
+        self.plan = PaymentPlan.objects.create(
+            merchant=self.merchant,
+            user=self.user,
+            total_amount=Decimal('1000.00'),
+            number_of_installments=4,
+            start_date=date.today()
+        )
+
+        self.installments = []
+        statuses = ['Paid', 'Late', 'Due', 'Pending']
+        for i, status_val in enumerate(statuses):
+            installment = Installment.objects.create(
+                plan=self.plan,
+                due_date=date.today() + timedelta(days=30*i),
+                amount=Decimal('250.00'),
+                status=status_val
+            )
+            self.installments.append(installment)
+        refresh_plan_summaries([self.plan.id])
+        refresh_merchant_portfolios([self.merchant.id])
+
+        self.url = reverse('plans:pay-payment-plan', kwargs={'id': self.plan.id})
+
+    def test_pay_selected_installments(self):
+        self.client.force_authenticate(user=self.user)
+        selected = [str(self.installments[1].id), str(self.installments[2].id)]
+        response = self.client.post(self.url, {'installments': selected}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(sorted(item['id'] for item in response.data['paid']), sorted(selected))
+        self.assertEqual(response.data['plan']['status'], 'Active')
+        self.assertEqual(response.data['plan']['paid_count'], 3)
+        self.assertEqual(response.data['plan']['late_count'], 0)
+        self.assertEqual(response.data['plan']['next_due_date'], self.installments[3].due_date.isoformat())
+
+        self.plan.refresh_from_db()
+        self.assertEqual(self.plan.paid_amount, Decimal('750.00'))
+        self.assertEqual(Installment.objects.get(id=self.installments[3].id).status, 'Pending')
+
+    def test_pay_all_remaining(self):
+        self.client.force_authenticate(user=self.user)
+        # Savepoint, plan lock, installments lock, installments update, plan update, portfolio update, release
+        with self.assertNumQueries(7):
+            response = self.client.post(self.url, {'installments': 'all_remaining'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['paid']), 3)
+        self.plan.refresh_from_db()
+        self.assertEqual(self.plan.status, 'Paid')
+        self.assertEqual(self.plan.paid_count, 4)
+        self.assertEqual(self.plan.paid_amount, Decimal('1000.00'))
+        self.assertIsNone(self.plan.next_due_date)
+        self.assertFalse(self.plan.installments.exclude(status='Paid').exists())
+
+    def test_paid_installment_rejected(self):
+        self.client.force_authenticate(user=self.user)
+        data = {'installments': [str(self.installments[0].id), str(self.installments[1].id)]}
+        response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(str(self.installments[0].id), str(response.data['installments']))
+        self.assertEqual(Installment.objects.get(id=self.installments[1].id).status, 'Late')
+
+    def test_installment_of_other_plan_rejected(self):
+        other_plan = PaymentPlan.objects.create(
+            merchant=self.merchant,
+            user=self.user,
+            total_amount=Decimal('100.00'),
+            number_of_installments=1,
+            start_date=date.today()
+        )
+        other_installment = Installment.objects.create(
+            plan=other_plan,
+            due_date=date.today(),
+            amount=Decimal('100.00')
+        )
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(self.url, {'installments': [str(other_installment.id)]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        other_installment.refresh_from_db()
+        self.assertEqual(other_installment.status, 'Pending')
+
+    def test_invalid_selection(self):
+        self.client.force_authenticate(user=self.user)
+        for installments in [[], 'everything', ['not-a-uuid']]:
+            response = self.client.post(self.url, {'installments': installments}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('installments', response.data)
+
+    def test_already_paid_plan(self):
+        PaymentPlan.objects.filter(id=self.plan.id).update(status='Paid')
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(self.url, {'installments': 'all_remaining'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('already paid', str(response.data))
+
+    def test_other_user_access(self):
+        self.client.force_authenticate(user=self.other_user)
+        response = self.client.post(self.url, {'installments': 'all_remaining'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('does not belong to you', str(response.data))
+
+    def test_unauthenticated_access(self):
+        response = self.client.post(self.url, {'installments': 'all_remaining'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_merchant_cannot_pay(self):
+        self.client.force_authenticate(user=self.merchant)
+        response = self.client.post(self.url, {'installments': 'all_remaining'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_nonexistent_plan(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(
+            reverse('plans:pay-payment-plan', kwargs={'id': '12345678-1234-5678-1234-567812345678'}),
+            {'installments': 'all_remaining'},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class PaymentPlanPayOutsideTransactionTests(TransactionTestCase):
+    def setUp(self):
+        merchant = User.objects.create_user(email='merchant@test.com', password='password123', role='merchant')
+        self.user = User.objects.create_user(email='user@test.com', password='password123', role='user')
+        self.plan = PaymentPlan.objects.create(
+            merchant=merchant,
+            user=self.user,
+            total_amount=Decimal('500.00'),
+            number_of_installments=2,
+            start_date=date.today()
+        )
+        for i in range(2):
+            Installment.objects.create(
+                plan=self.plan, due_date=date.today() + timedelta(days=30*i), amount=Decimal('250.00')
+            )
+
+    def test_options_and_browsable_form(self):
+        # Both build the serializer without running post(), so no row lock may be taken there
+        url = reverse('plans:pay-payment-plan', kwargs={'id': self.plan.id})
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+
+        self.assertEqual(client.options(url).status_code, status.HTTP_200_OK)
+        self.assertEqual(client.get(url, HTTP_ACCEPT='text/html').status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+        self.assertFalse(Installment.objects.filter(plan=self.plan, status='Paid').exists())
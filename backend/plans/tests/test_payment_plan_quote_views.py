@@ -0,0 +1,91 @@
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework import status
+from datetime import timedelta
+from ..models import PaymentPlan
+from ..serializers import MAX_QUOTE_INSTALLMENTS
+from ..validators import MAX_INSTALLMENTS
+
+User = get_user_model()
+
+class PaymentPlanQuoteViewTests(APITestCase):
+    def setUp(self):
+        self.merchant = User.objects.create_user(
+            email='merchant@test.com',
+            password='password123',
+            role='merchant'
+        )
+
+        self.user = User.objects.create_user(
+            email='user@test.com',
+            password='password123',
+            role='user'
+        )
+
+        self.start_date = timezone.now().date() + timedelta(days=1)
+        self.url = reverse('plans:quote-payment-plans')
+
+    def test_non_merchant_access(self):
+        self.client.force_authenticate(user=self.user)
+        data = {'plans': [{'total_amount': '100.00', 'number_of_installments': 2, 'start_date': self.start_date.isoformat()}]}
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_quote_plans(self):
+        self.client.force_authenticate(user=self.merchant)
+        data = {'plans': [
+            {'total_amount': '100.01', 'number_of_installments': 3, 'start_date': self.start_date.isoformat()},
+            {'total_amount': '50.00', 'number_of_installments': 1, 'start_date': self.start_date.isoformat()},
+        ]}
+        response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        first, second = response.data['quotes']
+        self.assertEqual([i['amount'] for i in first['installments']], ['33.34', '33.34', '33.33'])
+        self.assertEqual(first['installments'][0]['due_date'], self.start_date.isoformat())
+        self.assertEqual(second['installments'], [{'due_date': self.start_date.isoformat(), 'amount': '50.00'}])
+        self.assertEqual(PaymentPlan.objects.count(), 0)
+
+    def test_quote_does_not_query_database(self):
+        self.client.force_authenticate(user=self.merchant)
+        data = {'plans': [
+            {'total_amount': '1000.00', 'number_of_installments': 12, 'start_date': self.start_date.isoformat()}
+            for _ in range(100)
+        ]}
+        with self.assertNumQueries(0):
+            response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['quotes']), 100)
+
+    def test_invalid_items_are_reported(self):
+        self.client.force_authenticate(user=self.merchant)
+        data = {'plans': [
+            {'total_amount': '100.00', 'number_of_installments': 2, 'start_date': self.start_date.isoformat()},
+            {'total_amount': '100.00', 'number_of_installments': 0, 'start_date': self.start_date.isoformat()},
+        ]}
+        response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['plans'][0], {})
+        self.assertIn('number_of_installments', response.data['plans'][1])
+
+    def test_installments_per_plan_are_capped(self):
+        self.client.force_authenticate(user=self.merchant)
+        data = {'plans': [
+            {'total_amount': '100.00', 'number_of_installments': MAX_INSTALLMENTS + 1, 'start_date': self.start_date.isoformat()},
+        ]}
+        response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('number_of_installments', response.data['plans'][0])
+
+    def test_installments_per_request_are_capped(self):
+        self.client.force_authenticate(user=self.merchant)
+        plan = {'total_amount': '1000.00', 'number_of_installments': MAX_INSTALLMENTS, 'start_date': self.start_date.isoformat()}
+        data = {'plans': [plan] * (MAX_QUOTE_INSTALLMENTS // MAX_INSTALLMENTS + 1)}
+        response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('plans', response.data)
@@ -0,0 +1,122 @@
+# plans/tests/test_query_plans.py
+import os
+import re
+from unittest import skipUnless
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.contrib.auth import get_user_model
+from plans.models import PaymentPlan, Installment
+from plans.services import (
+    update_installment_statuses, check_upcoming_installments, notify_upcoming_installments, pay_installment,
+    installment_status_sweep_partitions, refresh_plan_summaries
+)
+from django.utils import timezone
+from django.test import RequestFactory
+from rest_framework.test import force_authenticate
+from asgiref.sync import async_to_sync
+from datetime import timedelta
+from plans.views import InstallmentCalendarView
+from unittest.mock import Mock
+
+User = get_user_model()
+
+INSTALLMENT_SEQ_SCAN = re.compile(r'Seq Scan on plans_installment\b')
+DECLARE_CURSOR = re.compile(r'^DECLARE .*? CURSOR (WITH(OUT)? HOLD )?FOR ')
+
+@skipUnless(os.environ.get('SLOW_TESTS') == 'True', 'Seeds 1M installments; set SLOW_TESTS=True to run')
+class InstallmentQueryPlanTests(TestCase):
+    """
+    Runs the hot installment queries against a seeded 1M-row table and fails if
+    PostgreSQL plans any of them as a sequential scan over plans_installment.
+    """
+    PLANS = 250_000
+    INSTALLMENTS_PER_PLAN = 4
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.merchant = User.objects.create_user(email='merchant@test.com', password='p', role='merchant')
+        cls.user = User.objects.create_user(email='user@test.com', password='p', role='user')
+
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT setseed(0.42)')
+            cursor.execute(
+                '''
+                INSERT INTO plans_paymentplan (
+                    id, merchant_id, user_id, total_amount, number_of_installments, start_date, status,
+                    paid_amount, paid_count, late_count, next_due_date, created_at, updated_at
+                )
+                SELECT gen_random_uuid(), %s, %s, 400, %s, CURRENT_DATE, 'Active', 0, 0, 0, NULL, now(), now()
+                FROM generate_series(1, %s)
+                ''',
+                [cls.merchant.id, cls.user.id, cls.INSTALLMENTS_PER_PLAN, cls.PLANS]
+            )
+            # Mostly settled history, a late tail, a few days of unswept rows and a pending future
+            cursor.execute(
+                '''
+                INSERT INTO plans_installment (id, plan_id, due_date, amount, status, created_at, updated_at)
+                SELECT gen_random_uuid(), plan_id, due_date, 100,
+                       CASE
+                           WHEN due_date >= CURRENT_DATE - 3 THEN 'Pending'
+                           WHEN random() < 0.95 THEN 'Paid'
+                           ELSE 'Late'
+                       END,
+                       now(), now()
+                FROM (
+                    SELECT p.id AS plan_id, CURRENT_DATE - 700 + (random() * 1100)::int AS due_date
+                    FROM plans_paymentplan p CROSS JOIN generate_series(1, %s)
+                ) rows
+                ''',
+                [cls.INSTALLMENTS_PER_PLAN]
+            )
+            cursor.execute('ANALYZE plans_paymentplan')
+            cursor.execute('ANALYZE plans_installment')
+
+    def assertNoInstallmentSeqScan(self, run):
+        with CaptureQueriesContext(connection) as captured:
+            run()
+
+        # Server-side cursors (QuerySet.iterator) are captured as DECLARE ... CURSOR ... FOR SELECT
+        statements = [
+            DECLARE_CURSOR.sub('', query['sql']) for query in captured.captured_queries
+            if 'plans_installment' in query['sql']
+            and DECLARE_CURSOR.sub('', query['sql']).lstrip().upper().startswith(('SELECT', 'UPDATE'))
+        ]
+        self.assertTrue(statements, 'No installment query was captured')
+        for sql in statements:
+            with connection.cursor() as cursor:
+                cursor.execute('EXPLAIN ' + sql)
+                plan = '\n'.join(row[0] for row in cursor.fetchall())
+            self.assertNotRegex(plan, INSTALLMENT_SEQ_SCAN, f'{sql}\n\n{plan}')
+
+    def test_seeded_table_size(self):
+        self.assertEqual(Installment.objects.count(), self.PLANS * self.INSTALLMENTS_PER_PLAN)
+
+    def test_status_sweep(self):
+        self.assertNoInstallmentSeqScan(update_installment_statuses)
+
+    def test_status_sweep_partitions(self):
+        self.assertNoInstallmentSeqScan(lambda: installment_status_sweep_partitions(timezone.now().date()))
+
+    def test_upcoming_installments(self):
+        self.assertNoInstallmentSeqScan(lambda: list(check_upcoming_installments()))
+
+    def test_upcoming_reminders(self):
+        backend = Mock(name='backend')
+        backend.name = 'mock'
+        self.assertNoInstallmentSeqScan(lambda: notify_upcoming_installments(backend=backend))
+
+    def test_pay_installment(self):
+        installment = Installment.objects.filter(status='Pending').first()
+        self.assertNoInstallmentSeqScan(lambda: pay_installment(installment.id))
+
+    def test_refresh_plan_summaries(self):
+        plan_ids = list(PaymentPlan.objects.values_list('id', flat=True)[:10])
+        self.assertNoInstallmentSeqScan(lambda: refresh_plan_summaries(plan_ids))
+
+    def test_installment_calendar(self):
+        today = timezone.now().date()
+        request = RequestFactory().get('/', {'from': today.replace(day=1), 'to': today.replace(day=1) + timedelta(days=41)})
+        force_authenticate(request, user=self.merchant)
+        view = InstallmentCalendarView.as_view()
+        self.assertNoInstallmentSeqScan(lambda: async_to_sync(view)(request))
@@ -0,0 +1,43 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.renderers import JSONRenderer
+from decimal import Decimal
+from datetime import date, timedelta
+from ..models import PaymentPlan, Installment
+from ..rows import installment_rows, plan_rows, serialize_plan_rows
+from ..serializers import PaymentPlanListSerializer, PaymentPlanSummarySerializer
+from ..services import create_payment_plan, pay_installment
+
+User = get_user_model()
+
+class SerializePlanRowsTests(TestCase):
+    def setUp(self):
+        self.merchant = User.objects.create_user(email='m@test.com', password='p', role='merchant')
+        self.user = User.objects.create_user(email='u@test.com', password='p', role='user')
+        today = date.today()
+        self.paid_plan = create_payment_plan(self.merchant, self.user, Decimal('100.01'), 3, today)
+        pay_installment(self.paid_plan.installments.order_by('due_date').first().id)
+        create_payment_plan(self.merchant, self.user, Decimal('50.00'), 1, today + timedelta(days=3))
+        # A plan without a user and without installments
+        PaymentPlan.objects.create(
+            merchant=self.merchant, total_amount=Decimal('10.00'), number_of_installments=1, start_date=today
+        )
+        self.plans = PaymentPlan.objects.order_by('-created_at', '-id')
+
+    def render(self, data):
+        return JSONRenderer().render(data)
+
+    def test_matches_summary_serializer(self):
+        expected = PaymentPlanSummarySerializer(self.plans.select_related('user', 'merchant'), many=True).data
+        self.assertEqual(self.render(serialize_plan_rows(plan_rows(self.plans))), self.render(expected))
+
+    def test_matches_list_serializer_with_installments(self):
+        rows = list(plan_rows(self.plans))
+        data = serialize_plan_rows(rows, installment_rows([row.id for row in rows]))
+
+        expected = PaymentPlanListSerializer(self.plans.select_related('user', 'merchant'), many=True).data
+        for plan in expected:
+            # The serializer nests installments in database order; the rows come by due date
+            plan['installments'] = sorted(plan['installments'], key=lambda item: (item['due_date'], item['id']))
+        self.assertEqual(self.render(data), self.render(expected))
+        self.assertEqual(sum(len(plan['installments']) for plan in data), Installment.objects.count())
@@ -0,0 +1,67 @@
+# plans/tests/test_schedule.py
+from django.test import SimpleTestCase
+from decimal import Decimal, ROUND_HALF_UP
+from datetime import date
+from dateutil.relativedelta import relativedelta
+import random
+from plans.schedule import build_schedules, from_minor_units, to_minor_units
+
+
+class BuildSchedulesTests(SimpleTestCase):
+    def rows(self, schedule):
+        return list(zip(
+            schedule.plan_index.tolist(),
+            schedule.due_dates.astype(object).tolist(),
+            schedule.amounts.tolist()
+        ))
+
+    def test_remainder_goes_on_last_installment(self):
+        """Test the rounded share is used for every installment but the last"""
+        schedule = build_schedules([10001], [3], [date(2025, 5, 1)])
+        self.assertEqual(schedule.amounts.tolist(), [3334, 3334, 3333])
+        self.assertEqual(int(schedule.amounts.sum()), 10001)
+
+    def test_rounds_half_up(self):
+        """Test a share ending in half a cent is rounded up"""
+        schedule = build_schedules([5], [2], [date(2025, 5, 1)])
+        self.assertEqual(schedule.amounts.tolist(), [3, 2])
+
+    def test_month_end_clamping(self):
+        """Test due dates clamp to shorter months like relativedelta"""
+        schedule = build_schedules([400], [4], [date(2024, 1, 31)])
+        self.assertEqual(
+            schedule.due_dates.astype(object).tolist(),
+            [date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 30)]
+        )
+
+    def test_multiple_plans_are_grouped_in_order(self):
+        """Test rows are grouped by plan in input order"""
+        schedule = build_schedules([100, 300], [1, 2], [date(2025, 5, 1), date(2025, 6, 15)])
+        self.assertEqual(self.rows(schedule), [
+            (0, date(2025, 5, 1), 100),
+            (1, date(2025, 6, 15), 150),
+            (1, date(2025, 7, 15), 150),
+        ])
+
+    def test_matches_decimal_relativedelta_reference(self):
+        """Test the engine matches per-month Decimal/relativedelta arithmetic"""
+        rng = random.Random(42)
+        totals = [Decimal(rng.randint(1, 10 ** 7)) / 100 for _ in range(500)]
+        counts = [rng.randint(1, 36) for _ in range(500)]
+        starts = [date(2024, 1, 1) + relativedelta(days=rng.randint(0, 800)) for _ in range(500)]
+
+        expected = []
+        for plan_index, (total, count, start) in enumerate(zip(totals, counts, starts)):
+            share = (total / count).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+            for i in range(count):
+                amount = total - share * (count - 1) if i == count - 1 else share
+                expected.append((plan_index, start + relativedelta(months=i), amount))
+
+        schedule = build_schedules([to_minor_units(t) for t in totals], counts, starts)
+        actual = [(p, d, from_minor_units(a)) for p, d, a in self.rows(schedule)]
+        self.assertEqual(actual, expected)
+
+    def test_minor_unit_conversion(self):
+        self.assertEqual(to_minor_units(Decimal('1000.57')), 100057)
+        self.assertEqual(from_minor_units(100057), Decimal('1000.57'))
+        self.assertEqual(str(from_minor_units(25000)), '250.00')
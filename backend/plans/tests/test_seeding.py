@@ -0,0 +1,98 @@
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.models import F, Sum
+from django.test import TestCase, TransactionTestCase
+
+from plans.models import Installment, MerchantPortfolio, PaymentPlan
+from plans.seeding import seed_portfolio
+from plans.services import refresh_merchant_portfolios, refresh_plan_summaries
+
+User = get_user_model()
+
+TODAY = date(2026, 3, 15)
+
+
+class SeedPortfolioTests(TestCase):
+    def snapshot(self):
+        return (
+            list(User.objects.order_by('email').values_list('id', 'email', 'role', 'created_at')),
+            list(PaymentPlan.objects.order_by('id').values_list()),
+            list(Installment.objects.order_by('id').values_list()),
+        )
+
+    def test_creates_requested_rows(self):
+        result = seed_portfolio(3, 20, 500, seed=7, today=TODAY)
+
+        self.assertEqual(result['users'], 23)
+        self.assertEqual(User.objects.filter(role='merchant', email__startswith='seed7-').count(), 3)
+        self.assertEqual(User.objects.filter(role='user', groups__name='User').count(), 20)
+        self.assertEqual(PaymentPlan.objects.count(), 500)
+        self.assertEqual(Installment.objects.count(), result['installments'])
+        self.assertEqual(
+            Installment.objects.count(), PaymentPlan.objects.aggregate(n=Sum('number_of_installments'))['n']
+        )
+
+    def test_same_seed_same_rows(self):
+        seed_portfolio(2, 10, 300, seed=3, today=TODAY)
+        first = self.snapshot()
+        PaymentPlan.objects.all().delete()
+        User.objects.all().delete()
+
+        seed_portfolio(2, 10, 300, seed=3, today=TODAY)
+        self.assertEqual(self.snapshot(), first)
+
+    def test_statuses_follow_the_reference_date(self):
+        seed_portfolio(2, 10, 1000, seed=1, today=TODAY)
+
+        self.assertFalse(Installment.objects.filter(due_date__lt=TODAY, status__in=['Pending', 'Due']).exists())
+        self.assertFalse(Installment.objects.filter(due_date__gte=TODAY, status='Late').exists())
+        self.assertFalse(Installment.objects.exclude(due_date=TODAY).filter(status='Due').exists())
+        self.assertTrue(Installment.objects.filter(status='Late').exists())
+        self.assertTrue(Installment.objects.filter(status='Pending').exists())
+        for plan in PaymentPlan.objects.annotate(installment_total=Sum('installments__amount'))[:50]:
+            self.assertEqual(plan.installment_total, plan.total_amount)
+
+    def test_summaries_and_portfolios_are_consistent(self):
+        seed_portfolio(3, 10, 400, seed=2, today=TODAY)
+
+        columns = ('id', 'status', 'paid_amount', 'paid_count', 'late_count', 'next_due_date')
+        seeded = list(PaymentPlan.objects.order_by('id').values_list(*columns))
+        refresh_plan_summaries()
+        self.assertEqual(list(PaymentPlan.objects.order_by('id').values_list(*columns)), seeded)
+        self.assertEqual(
+            PaymentPlan.objects.filter(status='Paid').count(),
+            PaymentPlan.objects.filter(paid_count=F('number_of_installments')).count()
+        )
+
+        portfolios = list(MerchantPortfolio.objects.order_by('merchant_id').values_list())
+        refresh_merchant_portfolios()
+        refreshed = MerchantPortfolio.objects.order_by('merchant_id').values_list()
+        self.assertEqual([row[:-1] for row in refreshed], [row[:-1] for row in portfolios])
+
+    def test_command_rejects_a_loaded_seed(self):
+        out = StringIO()
+        call_command('seed_portfolio', merchants=1, users=2, plans=10, seed=5, today=TODAY, stdout=out)
+        self.assertIn('Loaded 3 user(s), 10 plan(s)', out.getvalue())
+
+        with self.assertRaisesMessage(CommandError, 'Seed 5 is already loaded'):
+            call_command('seed_portfolio', merchants=1, users=2, plans=10, seed=5, today=TODAY, stdout=StringIO())
+
+
+class SeedPortfolioDeferredIndexTests(TransactionTestCase):
+    # Chunks must commit: the deferred foreign key checks of an open transaction block CREATE INDEX
+    def index_names(self):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, Installment._meta.db_table)
+        return {name for name, details in constraints.items() if details['index']}
+
+    def test_deferred_indexes_are_rebuilt(self):
+        before = self.index_names()
+        seed_portfolio(1, 5, 100, seed=4, today=TODAY, defer_indexes=True)
+        self.assertEqual(self.index_names(), before)
+        self.assertIn('installment_unpaid_due_idx', before)
+        self.assertEqual(PaymentPlan.objects.count(), 100)
@@ -1,14 +1,26 @@
-from django.test import TestCase
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 from decimal import Decimal
-from plans.services import create_payment_plan, update_installment_statuses, pay_installment
-from plans.models import PaymentPlan, Installment
+from plans.services import (
+    create_payment_plan, create_payment_plans_bulk, update_installment_statuses, pay_installment, refresh_plan_summaries,
+    refresh_merchant_portfolios, sweep_installment_statuses, installment_status_sweep_partitions, notify_upcoming_installments,
+    lock_plan_for_payment, lock_unpaid_installments, pay_plan_installments
+)
+from plans.models import PaymentPlan, Installment, StatusSweepCheckpoint, InstallmentReminder, WebhookOutbox, MerchantPortfolio
+from plans.notifications import EmailNotificationBackend, WebhookOutboxNotificationBackend
 from dateutil.relativedelta import relativedelta
-from django.db import transaction
+from django.db import connection, transaction
+from django.db.models import F
 from django.core.exceptions import ValidationError
+import threading
 import uuid
-from datetime import timedelta
+from datetime import date, timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.core import mail
+from unittest.mock import Mock
 
 User = get_user_model()
 
@@ -175,6 +187,71 @@ class CreatePaymentPlanServiceTests(TestCase):
                 start_date=self.start_date
             )
 
+class CreatePaymentPlansBulkServiceTests(TestCase):
+    def setUp(self):
+        self.merchant = User.objects.create_user(
+            email='merchant@test.com',
+            password='password123',
+            role='merchant'
+        )
+
+        self.user = User.objects.create_user(
+            email='user@test.com',
+            password='password123',
+            role='user'
+        )
+
+        self.start_date = timezone.now().date()
+
+    def plan_data(self, total_amount=Decimal('1000.00'), number_of_installments=4, user=None):
+        return {
+            'user': (user or self.user).id,
+            'total_amount': total_amount,
+            'number_of_installments': number_of_installments,
+            'start_date': self.start_date
+        }
+
+    def test_bulk_create_matches_single_create(self):
+        """Test bulk creation produces the same installments as create_payment_plan"""
+        created, errors = create_payment_plans_bulk(self.merchant, [self.plan_data(Decimal('100.01'), 3)])
+        single = create_payment_plan(self.merchant, self.user, Decimal('100.01'), 3, self.start_date)
+
+        self.assertEqual(errors, {})
+        bulk_installments = created[0].installments.order_by('due_date')
+        single_installments = single.installments.order_by('due_date')
+        self.assertEqual(
+            [(i.due_date, i.amount, i.status) for i in bulk_installments],
+            [(i.due_date, i.amount, i.status) for i in single_installments]
+        )
+
+    def test_bulk_create_query_count(self):
+        """Test users are resolved once and plans/installments are inserted with one query each"""
+        plans_data = [self.plan_data() for _ in range(20)]
+        # Savepoint, user lookup, plan insert, installment insert, portfolio update, release
+        MerchantPortfolio.objects.create(merchant=self.merchant)
+        with self.assertNumQueries(6):
+            created, errors = create_payment_plans_bulk(self.merchant, plans_data)
+
+        self.assertEqual(len(created), 20)
+        self.assertEqual(Installment.objects.count(), 80)
+
+    def test_bulk_create_reports_item_errors(self):
+        """Test invalid items are reported by index and skipped"""
+        plans_data = [
+            self.plan_data(),
+            self.plan_data(total_amount=Decimal('0.00')),
+            self.plan_data(user=self.merchant),
+            {**self.plan_data(), 'user': uuid.uuid4()},
+        ]
+        created, errors = create_payment_plans_bulk(self.merchant, plans_data)
+
+        self.assertEqual(list(created), [0])
+        self.assertEqual(sorted(errors), [1, 2, 3])
+        self.assertIn('total_amount', errors[1])
+        self.assertIn('user', errors[2])
+        self.assertIn('user', errors[3])
+        self.assertEqual(PaymentPlan.objects.count(), 1)
+
 class UpdateInstallmentStatusesTests(TestCase):
     def setUp(self):
         # Create test users
@@ -281,6 +358,239 @@ class UpdateInstallmentStatusesTests(TestCase):
         self.assertEqual(paid_installment.status, 'Paid')
         self.assertEqual(updated_count, 0)
 
+class SweepInstallmentStatusesTests(TestCase):
+    def setUp(self):
+        self.merchant = User.objects.create_user(
+            email='merchant@test.com',
+            password='password123',
+            role='merchant'
+        )
+
+        self.user = User.objects.create_user(
+            email='user@test.com',
+            password='password123',
+            role='user'
+        )
+
+        self.today = timezone.now().date()
+        self.plan = PaymentPlan.objects.create(
+            merchant=self.merchant,
+            user=self.user,
+            total_amount=Decimal('500.00'),
+            number_of_installments=5,
+            start_date=self.today - timedelta(days=40)
+        )
+        self.installments = [
+            Installment.objects.create(
+                plan=self.plan,
+                due_date=self.today - timedelta(days=days),
+                amount=Decimal('100.00'),
+                status=status
+            )
+            for days, status in [(40, 'Pending'), (20, 'Due'), (10, 'Paid'), (0, 'Pending'), (-10, 'Pending')]
+        ]
+
+    def statuses(self):
+        return [Installment.objects.get(id=i.id).status for i in self.installments]
+
+    def test_sweep_in_chunks(self):
+        """Test each chunk is bounded and reported"""
+        result = sweep_installment_statuses(self.today, date.min, self.today + timedelta(days=1), chunk_size=1)
+
+        self.assertEqual(result['rows_updated'], 3)
+        self.assertEqual([chunk['rows'] for chunk in result['chunks']], [1, 1, 1])
+        self.assertEqual(self.statuses(), ['Late', 'Late', 'Paid', 'Due', 'Pending'])
+        self.plan.refresh_from_db()
+        self.assertEqual(self.plan.late_count, 2)
+
+        checkpoint = StatusSweepCheckpoint.objects.get(run_date=self.today)
+        self.assertIsNotNone(checkpoint.completed_at)
+        self.assertEqual(checkpoint.rows_updated, 3)
+        self.assertEqual(checkpoint.chunks, 3)
+
+    def test_sweep_resumes_from_checkpoint(self):
+        """Test an interrupted sweep continues after the last committed chunk"""
+        first = self.installments[0]
+        StatusSweepCheckpoint.objects.create(
+            run_date=self.today,
+            partition_start=date.min,
+            partition_end=self.today + timedelta(days=1),
+            last_due_date=first.due_date,
+            last_installment_id=first.id,
+            rows_updated=1,
+            chunks=1
+        )
+
+        result = sweep_installment_statuses(self.today, date.min, self.today + timedelta(days=1), chunk_size=1)
+
+        # The checkpoint says the first installment was handled already, so it is not revisited
+        self.assertEqual(self.statuses(), ['Pending', 'Late', 'Paid', 'Due', 'Pending'])
+        self.assertEqual(result['rows_updated'], 3)
+        self.assertEqual(len(result['chunks']), 2)
+
+    def test_sweep_respects_partition_bounds(self):
+        """Test only installments due inside the partition are updated"""
+        result = sweep_installment_statuses(self.today, self.today - timedelta(days=30), self.today)
+
+        self.assertEqual(result['rows_updated'], 1)
+        self.assertEqual(self.statuses(), ['Pending', 'Late', 'Paid', 'Pending', 'Pending'])
+
+    def test_partitions_cover_due_dates_to_sweep(self):
+        """Test partitions start at the oldest unpaid installment and end after today"""
+        partitions = installment_status_sweep_partitions(self.today, partition_days=15)
+
+        self.assertEqual(partitions[0][0], self.today - timedelta(days=40))
+        self.assertEqual(partitions[-1][1], self.today + timedelta(days=1))
+        for (_, end), (start, _) in zip(partitions, partitions[1:]):
+            self.assertEqual(end, start)
+
+    def test_no_partitions_when_nothing_to_sweep(self):
+        Installment.objects.update(status='Paid')
+        self.assertEqual(installment_status_sweep_partitions(self.today), [])
+
+class SweepPaymentLockOrderTests(TransactionTestCase):
+    def setUp(self):
+        merchant = User.objects.create_user(email='merchant@test.com', password='password123', role='merchant')
+        user = User.objects.create_user(email='user@test.com', password='password123', role='user')
+        self.today = timezone.now().date()
+        self.plan = PaymentPlan.objects.create(
+            merchant=merchant,
+            user=user,
+            total_amount=Decimal('300.00'),
+            number_of_installments=3,
+            start_date=self.today - timedelta(days=60)
+        )
+        self.installments = [
+            Installment.objects.create(
+                plan=self.plan, due_date=self.today - timedelta(days=days), amount=Decimal('100.00'), status='Pending'
+            )
+            for days in (60, 30, -30)
+        ]
+        refresh_plan_summaries([self.plan.id])
+        refresh_merchant_portfolios([merchant.id])
+
+    def test_sweep_waits_for_a_payment_of_the_same_plan(self):
+        # A pay-many holding the plan lock while the sweep starts: the sweep must queue on the
+        # plan, not lock the installments the payment is about to lock
+        outcome = {}
+
+        def sweep():
+            try:
+                outcome['sweep'] = sweep_installment_statuses(self.today, date.min, self.today + timedelta(days=1))
+            except Exception as exc:
+                outcome['sweep'] = exc
+            finally:
+                connection.close()
+
+        with transaction.atomic():
+            plan = lock_plan_for_payment(self.plan.id)
+            thread = threading.Thread(target=sweep)
+            thread.start()
+            thread.join(0.5)
+            unpaid = lock_unpaid_installments(plan)
+            pay_plan_installments(plan, unpaid, {self.installments[0].id})
+        thread.join()
+
+        self.assertEqual(outcome['sweep']['rows_updated'], 1)
+        statuses = [Installment.objects.get(id=installment.id).status for installment in self.installments]
+        self.assertEqual(statuses, ['Paid', 'Late', 'Pending'])
+        self.plan.refresh_from_db()
+        self.assertEqual((self.plan.paid_count, self.plan.late_count), (1, 1))
+
+
+    def test_portfolio_refresh_keeps_a_concurrent_payment(self):
+        # The refresh starts while a payment holds its portfolio increment uncommitted: it must
+        # wait for it instead of aggregating without it and overwriting it afterwards
+        outcome = {}
+
+        def refresh():
+            try:
+                outcome['refresh'] = refresh_merchant_portfolios([self.plan.merchant_id])
+            except Exception as exc:
+                outcome['refresh'] = exc
+            finally:
+                connection.close()
+
+        with transaction.atomic():
+            pay_installment(self.installments[0].id)
+            thread = threading.Thread(target=refresh)
+            thread.start()
+            thread.join(0.5)
+            self.assertTrue(thread.is_alive())
+        thread.join()
+
+        self.assertEqual(outcome['refresh'], 1)
+        portfolio = MerchantPortfolio.objects.get(merchant_id=self.plan.merchant_id)
+        self.assertEqual((portfolio.paid_count, portfolio.collected_amount), (1, Decimal('100.00')))
+
+
+class ParallelSweepPartitionTests(TransactionTestCase):
+    MERCHANTS = 6
+
+    def setUp(self):
+        self.today = timezone.now().date()
+        user = User.objects.create_user(email='user@test.com', password='password123', role='user')
+        self.merchants = [
+            User.objects.create_user(email=f'merchant{i}@test.com', password='password123', role='merchant')
+            for i in range(self.MERCHANTS)
+        ]
+        # Both partitions hold late installments of every merchant
+        self.partitions = [
+            (self.today - timedelta(days=60), self.today - timedelta(days=30)),
+            (self.today - timedelta(days=30), self.today),
+        ]
+        for merchant in self.merchants:
+            for start, _ in self.partitions:
+                plan = PaymentPlan.objects.create(
+                    merchant=merchant, user=user, total_amount=Decimal('300.00'),
+                    number_of_installments=3, start_date=start
+                )
+                for days in range(3):
+                    Installment.objects.create(
+                        plan=plan, due_date=start + timedelta(days=days), amount=Decimal('100.00'), status='Pending'
+                    )
+        refresh_plan_summaries()
+        refresh_merchant_portfolios()
+
+    def test_portfolios_are_updated_in_merchant_order(self):
+        # Hash aggregation, as on large tables, returns the groups in no particular order
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_sort = off')
+        self.addCleanup(connection.close)
+        with CaptureQueriesContext(connection) as queries:
+            sweep_installment_statuses(self.today, *self.partitions[0])
+
+        table = MerchantPortfolio._meta.db_table
+        updated = [
+            query['sql'] for query in queries.captured_queries if query['sql'].startswith(f'UPDATE "{table}"')
+        ]
+        self.assertEqual(len(updated), self.MERCHANTS)
+        self.assertEqual(updated, sorted(updated, key=lambda sql: sql.rsplit("merchant_id\" = ", 1)[1]))
+
+    def test_concurrent_partitions_sharing_merchants(self):
+        barrier = threading.Barrier(len(self.partitions))
+        outcomes = []
+
+        def sweep(partition):
+            try:
+                barrier.wait()
+                outcomes.append(sweep_installment_statuses(self.today, *partition, chunk_size=2))
+            except Exception as exc:
+                outcomes.append(exc)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=sweep, args=(partition,)) for partition in self.partitions]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sum(outcome['rows_updated'] for outcome in outcomes), self.MERCHANTS * 6)
+        swept = list(MerchantPortfolio.objects.order_by('merchant_id').values_list('merchant_id', 'late_count'))
+        self.assertEqual(swept, [(merchant_id, 6) for merchant_id in sorted(m.id for m in self.merchants)])
+
+
 class PayInstallmentServiceTests(TestCase):
     def setUp(self):
         # Create a user
@@ -340,33 +650,328 @@ class PayInstallmentServiceTests(TestCase):
             status='Paid'
         )
 
+        # Installments were created directly, so bring the plan summary in line with them
+        refresh_plan_summaries([self.plan.id])
+
     def test_successful_payment_pending(self):
         """Test successful payment of a pending installment"""
-        updated_installment = pay_installment(self.pending_installment.id, self.user.id)
+        updated_installment = pay_installment(self.pending_installment.id)
         self.assertEqual(updated_installment.status, 'Paid')
         
     def test_successful_payment_due(self):
         """Test successful payment of a due installment"""
-        updated_installment = pay_installment(self.due_installment.id, self.user.id)
+        updated_installment = pay_installment(self.due_installment.id)
         self.assertEqual(updated_installment.status, 'Paid')
         
     def test_successful_payment_late(self):
         """Test successful payment of a late installment"""
-        updated_installment = pay_installment(self.late_installment.id, self.user.id)
+        updated_installment = pay_installment(self.late_installment.id)
         self.assertEqual(updated_installment.status, 'Paid')
 
     def test_nonexistent_installment(self):
         """Test payment of non-existent installment"""
         with self.assertRaises(Installment.DoesNotExist):
-            pay_installment(uuid.uuid4(), self.user.id)
+            pay_installment(uuid.uuid4())
 
     def test_plan_status_update(self):
         """Test that plan status updates to Paid when all installments are paid"""
         # Pay all unpaid installments
-        pay_installment(self.pending_installment.id, self.user.id)
-        pay_installment(self.due_installment.id, self.user.id)
-        pay_installment(self.late_installment.id, self.user.id)
+        pay_installment(self.pending_installment.id)
+        pay_installment(self.due_installment.id)
+        pay_installment(self.late_installment.id)
         
         # Refresh plan from database
         self.plan.refresh_from_db()
-        self.assertEqual(self.plan.status, 'Paid')
\ No newline at end of file
+        self.assertEqual(self.plan.status, 'Paid')
+
+    def test_plan_summary_updated(self):
+        """Test paying an installment updates the plan summary columns"""
+        pay_installment(self.late_installment.id)
+
+        self.plan.refresh_from_db()
+        self.assertEqual(self.plan.paid_amount, Decimal('500.00'))
+        self.assertEqual(self.plan.remaining_amount, Decimal('500.00'))
+        self.assertEqual(self.plan.paid_count, 2)
+        self.assertEqual(self.plan.late_count, 0)
+        self.assertEqual(self.plan.next_due_date, timezone.now().date())
+        self.assertEqual(self.plan.status, 'Active')
+
+    def test_paying_paid_installment_is_noop(self):
+        """Test paying an already paid installment does not count it twice"""
+        pay_installment(self.paid_installment.id)
+
+        self.plan.refresh_from_db()
+        self.assertEqual(self.plan.paid_amount, Decimal('250.00'))
+        self.assertEqual(self.plan.paid_count, 1)
+
+class RefreshPlanSummariesTests(TestCase):
+    def setUp(self):
+        self.merchant = User.objects.create_user(
+            email='merchant@test.com',
+            password='password123',
+            role='merchant'
+        )
+
+        self.user = User.objects.create_user(
+            email='user@test.com',
+            password='password123',
+            role='user'
+        )
+
+        self.today = timezone.now().date()
+        self.plan = PaymentPlan.objects.create(
+            merchant=self.merchant,
+            user=self.user,
+            total_amount=Decimal('600.00'),
+            number_of_installments=3,
+            start_date=self.today
+        )
+        for days, status in [(-10, 'Paid'), (-5, 'Late'), (20, 'Pending')]:
+            Installment.objects.create(
+                plan=self.plan,
+                due_date=self.today + timedelta(days=days),
+                amount=Decimal('200.00'),
+                status=status
+            )
+
+    def test_refresh_plan_summaries(self):
+        """Test summary columns are recomputed from the installments"""
+        updated = refresh_plan_summaries()
+
+        self.plan.refresh_from_db()
+        self.assertEqual(updated, 1)
+        self.assertEqual(self.plan.paid_amount, Decimal('200.00'))
+        self.assertEqual(self.plan.paid_count, 1)
+        self.assertEqual(self.plan.late_count, 1)
+        self.assertEqual(self.plan.next_due_date, self.today - timedelta(days=5))
+
+    def test_refresh_plan_summaries_command(self):
+        """Test the management command repairs drifted summary columns"""
+        PaymentPlan.objects.filter(id=self.plan.id).update(paid_count=7, late_count=3)
+
+        out = StringIO()
+        call_command('refresh_plan_summaries', batch_size=1, stdout=out)
+
+        self.plan.refresh_from_db()
+        self.assertEqual(self.plan.paid_count, 1)
+        self.assertEqual(self.plan.late_count, 1)
+        self.assertIn('Refreshed 1 plan(s)', out.getvalue())
+
+    def test_refresh_plan_summaries_sets_status(self):
+        """Test the plan status follows the recomputed paid count"""
+        Installment.objects.filter(plan=self.plan).update(status='Paid')
+        PaymentPlan.objects.filter(id=self.plan.id).update(paid_count=0, status='Active')
+
+        refresh_plan_summaries([self.plan.id])
+        self.plan.refresh_from_db()
+        self.assertEqual(self.plan.paid_count, 3)
+        self.assertEqual(self.plan.status, 'Paid')
+        self.assertIsNone(self.plan.next_due_date)
+
+        Installment.objects.filter(plan=self.plan, due_date__gt=self.today).update(status='Pending')
+        refresh_plan_summaries([self.plan.id])
+        self.plan.refresh_from_db()
+        self.assertEqual(self.plan.status, 'Active')
+
+    def test_sweep_updates_late_count(self):
+        """Test the status sweep counts newly late installments on their plan"""
+        Installment.objects.create(
+            plan=self.plan,
+            due_date=self.today - timedelta(days=1),
+            amount=Decimal('0.01'),
+            status='Due'
+        )
+        refresh_plan_summaries()
+
+        update_installment_statuses()
+
+        self.plan.refresh_from_db()
+        self.assertEqual(self.plan.late_count, 2)
+
+
+class MerchantPortfolioTests(TestCase):
+    def setUp(self):
+        self.merchant = User.objects.create_user(email='merchant@test.com', password='password123', role='merchant')
+        self.other_merchant = User.objects.create_user(email='other@test.com', password='password123', role='merchant')
+        self.user = User.objects.create_user(email='user@test.com', password='password123', role='user')
+        self.today = timezone.now().date()
+
+    def totals(self, merchant):
+        portfolio = MerchantPortfolio.objects.get(merchant=merchant)
+        return (
+            portfolio.plan_count, portfolio.installment_count, portfolio.paid_count, portfolio.late_count,
+            portfolio.total_amount, portfolio.collected_amount
+        )
+
+    def assertMatchesRebuild(self, merchant):
+        incremental = self.totals(merchant)
+        refresh_merchant_portfolios([merchant.id])
+        self.assertEqual(incremental, self.totals(merchant))
+
+    def test_create_and_pay_adjust_portfolio(self):
+        """Test plan creation and payments adjust the merchant's running totals"""
+        plan = create_payment_plan(self.merchant, self.user, Decimal('300.00'), 3, self.today)
+        create_payment_plans_bulk(self.merchant, [{
+            'user': self.user.id, 'total_amount': Decimal('100.00'),
+            'number_of_installments': 2, 'start_date': self.today
+        }])
+        pay_installment(plan.installments.order_by('due_date').first().id)
+
+        self.assertEqual(self.totals(self.merchant), (2, 5, 1, 0, Decimal('400.00'), Decimal('100.00')))
+        self.assertFalse(MerchantPortfolio.objects.filter(merchant=self.other_merchant).exists())
+        self.assertMatchesRebuild(self.merchant)
+
+    def test_sweep_and_late_payment_adjust_late_count(self):
+        """Test installments turning late and late installments being paid move the late count"""
+        plan = create_payment_plan(self.merchant, self.user, Decimal('300.00'), 3, self.today)
+        create_payment_plan(self.other_merchant, self.user, Decimal('100.00'), 1, self.today)
+        # Two of the three installments are now overdue
+        plan.installments.update(due_date=F('due_date') - timedelta(days=40))
+
+        update_installment_statuses()
+        self.assertEqual(self.totals(self.merchant)[3], 2)
+        self.assertEqual(self.totals(self.other_merchant)[3], 0)
+        self.assertMatchesRebuild(self.merchant)
+
+        # Re-running the sweep changes nothing
+        update_installment_statuses()
+        self.assertEqual(self.totals(self.merchant)[3], 2)
+
+        pay_installment(plan.installments.order_by('due_date').first().id)
+        portfolio = MerchantPortfolio.objects.get(merchant=self.merchant)
+        self.assertEqual(portfolio.late_count, 1)
+        self.assertEqual(portfolio.outstanding_amount, Decimal('200.00'))
+        self.assertEqual(portfolio.late_ratio, 0.5)
+        self.assertMatchesRebuild(self.merchant)
+
+    def test_refresh_merchant_portfolios_command(self):
+        """Test the management command repairs drifted portfolios and drops empty ones"""
+        create_payment_plan(self.merchant, self.user, Decimal('300.00'), 3, self.today)
+        MerchantPortfolio.objects.filter(merchant=self.merchant).update(plan_count=9, late_count=4)
+        MerchantPortfolio.objects.create(merchant=self.other_merchant, plan_count=1)
+
+        out = StringIO()
+        call_command('refresh_merchant_portfolios', stdout=out)
+
+        self.assertEqual(self.totals(self.merchant), (1, 3, 0, 0, Decimal('300.00'), Decimal('0.00')))
+        self.assertFalse(MerchantPortfolio.objects.filter(merchant=self.other_merchant).exists())
+        self.assertIn('Refreshed 1 merchant portfolio(s)', out.getvalue())
+
+
+class NotifyUpcomingInstallmentsTests(TestCase):
+    def setUp(self):
+        self.merchant = User.objects.create_user(
+            email='merchant@test.com',
+            password='password123',
+            role='merchant'
+        )
+
+        self.user = User.objects.create_user(
+            email='user@test.com',
+            password='password123',
+            role='user'
+        )
+
+        self.other_user = User.objects.create_user(
+            email='other@test.com',
+            password='password123',
+            role='user'
+        )
+
+        self.due_date = timezone.now().date() + timedelta(days=3)
+        self.installments = []
+        for user, count in [(self.user, 2), (self.other_user, 1)]:
+            plan = PaymentPlan.objects.create(
+                merchant=self.merchant,
+                user=user,
+                total_amount=Decimal('300.00'),
+                number_of_installments=3,
+                start_date=self.due_date
+            )
+            for i in range(count):
+                self.installments.append(Installment.objects.create(
+                    plan=plan,
+                    due_date=self.due_date,
+                    amount=Decimal('100.00'),
+                    status='Pending'
+                ))
+        # Not due in 3 days, or already paid
+        Installment.objects.create(plan=plan, due_date=self.due_date + timedelta(days=1), amount=Decimal('100.00'))
+        Installment.objects.create(plan=plan, due_date=self.due_date, amount=Decimal('100.00'), status='Paid')
+
+    def test_groups_installments_per_user(self):
+        """Test one reminder is sent per user, in batches of batch_size users"""
+        backend = Mock(name='backend')
+        backend.name = 'mock'
+
+        result = notify_upcoming_installments(backend=backend, chunk_size=1, batch_size=1)
+
+        self.assertEqual(result, {'installments': 3, 'users': 2, 'batches': 2})
+        reminders = [call.args[0][0] for call in backend.send.call_args_list]
+        self.assertEqual(
+            sorted((reminder.email, len(reminder.installments)) for reminder in reminders),
+            [('other@test.com', 1), ('user@test.com', 2)]
+        )
+        self.assertEqual(
+            set(InstallmentReminder.objects.values_list('installment_id', flat=True)),
+            {installment.id for installment in self.installments}
+        )
+        self.assertEqual(set(InstallmentReminder.objects.values_list('backend', flat=True)), {'mock'})
+
+    def test_rerun_skips_reminded_installments(self):
+        """Test installments with an idempotency record are not reminded again"""
+        backend = Mock(name='backend')
+        backend.name = 'mock'
+        notify_upcoming_installments(backend=backend)
+        backend.send.reset_mock()
+
+        result = notify_upcoming_installments(backend=backend)
+
+        self.assertEqual(result, {'installments': 0, 'users': 0, 'batches': 0})
+        backend.send.assert_not_called()
+
+    def test_failed_delivery_is_retried(self):
+        """Test a backend error rolls back the batch records so the next run retries it"""
+        backend = Mock(name='backend')
+        backend.name = 'mock'
+        backend.send.side_effect = ConnectionError('backend down')
+
+        with self.assertRaises(ConnectionError):
+            notify_upcoming_installments(backend=backend)
+        self.assertEqual(InstallmentReminder.objects.count(), 0)
+
+        backend.send.side_effect = None
+        self.assertEqual(notify_upcoming_installments(backend=backend)['installments'], 3)
+
+    def test_plan_without_user_is_skipped(self):
+        """Test installments of plans whose user was deleted are not reminded"""
+        self.other_user.delete()
+        backend = Mock(name='backend')
+        backend.name = 'mock'
+
+        result = notify_upcoming_installments(backend=backend)
+
+        self.assertEqual(result, {'installments': 2, 'users': 1, 'batches': 1})
+
+    def test_email_backend(self):
+        """Test the email backend sends one message per user"""
+        notify_upcoming_installments(backend=EmailNotificationBackend())
+
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), ['other@test.com', 'user@test.com'])
+        body = next(message.body for message in mail.outbox if message.to == ['user@test.com'])
+        self.assertIn('2 installment(s) due in 3 days', body)
+        self.assertIn(f'Due date: {self.due_date}', body)
+
+    def test_webhook_outbox_backend(self):
+        """Test the webhook outbox backend writes one pending event per user"""
+        notify_upcoming_installments(backend=WebhookOutboxNotificationBackend())
+
+        events = {event.payload['email']: event for event in WebhookOutbox.objects.all()}
+        self.assertEqual(set(events), {'user@test.com', 'other@test.com'})
+        payload = events['user@test.com'].payload
+        self.assertEqual(events['user@test.com'].event, 'installments.upcoming')
+        self.assertIsNone(events['user@test.com'].delivered_at)
+        self.assertEqual(payload['user_id'], str(self.user.id))
+        self.assertEqual(len(payload['installments']), 2)
+        self.assertEqual(payload['installments'][0]['amount'], '100.00')
+        self.assertEqual(payload['installments'][0]['due_date'], self.due_date.isoformat())
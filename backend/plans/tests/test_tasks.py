@@ -2,8 +2,11 @@
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from decimal import Decimal
-from plans.models import PaymentPlan, Installment
-from plans.tasks import update_installment_statuses_task, check_upcoming_installments_task
+from plans.models import PaymentPlan, Installment, InstallmentReminder
+from plans.tasks import (
+    update_installment_statuses_task, check_upcoming_installments_task, update_installment_statuses_parallel_task,
+    sweep_installment_statuses_partition_task, summarize_installment_status_sweep_task
+)
 from unittest.mock import patch, Mock
 from datetime import date, timedelta
 from freezegun import freeze_time
@@ -69,6 +72,43 @@ class UpdateInstallmentStatusesTaskTests(TestCase):
 
         mock_update.assert_called_once() 
 
+    @patch('plans.tasks.chord')
+    def test_parallel_task_dispatches_partitions(self, mock_chord):
+        """Test the parallel sweep fans out one task per partition into a chord"""
+        Installment.objects.create(
+            plan=self.plan,
+            due_date=self.today - timedelta(days=45),
+            amount=Decimal('250.00'),
+            status='Pending'
+        )
+        result = update_installment_statuses_parallel_task.apply(kwargs={'partition_days': 30})
+
+        self.assertEqual(result.get(), 2)
+        header = list(mock_chord.call_args[0][0])
+        self.assertEqual(
+            [signature.args for signature in header],
+            [
+                (self.today.isoformat(), (self.today - timedelta(days=45)).isoformat(), (self.today - timedelta(days=15)).isoformat()),
+                (self.today.isoformat(), (self.today - timedelta(days=15)).isoformat(), (self.today + timedelta(days=1)).isoformat()),
+            ]
+        )
+
+    def test_partition_task_and_summary(self):
+        """Test a partition sweep result feeds the chord callback"""
+        Installment.objects.create(
+            plan=self.plan,
+            due_date=self.today - timedelta(days=5),
+            amount=Decimal('250.00'),
+            status='Pending'
+        )
+        result = sweep_installment_statuses_partition_task.apply(
+            args=[self.today.isoformat(), (self.today - timedelta(days=10)).isoformat(), self.today.isoformat()]
+        ).get()
+
+        self.assertEqual(result['rows_updated'], 1)
+        self.assertEqual(len(result['chunks']), 1)
+        self.assertEqual(summarize_installment_status_sweep_task.apply(args=[[result, result]]).get(), 2)
+
     def test_check_upcoming_installments(self):
         """Test that upcoming installments are correctly identified with frozen time"""
         # Calculate future date relative to the frozen date
@@ -86,7 +126,7 @@ class UpdateInstallmentStatusesTaskTests(TestCase):
             amount=Decimal('250.00'),
             status='Pending'
         )
-        with self.assertLogs('plans.tasks', level='INFO') as logs:
+        with self.assertLogs('plans.notifications', level='INFO') as logs:
             result = check_upcoming_installments_task.apply()
         self.assertTrue(result.successful())
         self.assertEqual(result.get(), 1) 
@@ -138,7 +178,7 @@ class UpdateInstallmentStatusesTaskTests(TestCase):
             amount=Decimal('500.00'),
             status='Pending'
         )
-        with self.assertLogs('plans.tasks', level='INFO') as logs:
+        with self.assertLogs('plans.notifications', level='INFO') as logs:
             result = check_upcoming_installments_task.apply()
         self.assertTrue(result.successful())
         self.assertEqual(result.get(), 2)
@@ -161,4 +201,16 @@ class UpdateInstallmentStatusesTaskTests(TestCase):
         )
         result = check_upcoming_installments_task.apply()
         self.assertTrue(result.successful())
-        self.assertEqual(result.get(), 0)
\ No newline at end of file
+        self.assertEqual(result.get(), 0)
+
+    def test_rerun_does_not_notify_twice(self):
+        """Test that re-running the task skips installments that were already reminded"""
+        Installment.objects.create(
+            plan=self.plan,
+            due_date=self.today + timedelta(days=3),
+            amount=Decimal('250.00'),
+            status='Pending'
+        )
+        self.assertEqual(check_upcoming_installments_task.apply().get(), 1)
+        self.assertEqual(check_upcoming_installments_task.apply().get(), 0)
+        self.assertEqual(InstallmentReminder.objects.count(), 1)
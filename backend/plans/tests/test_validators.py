@@ -4,7 +4,7 @@ from django.core.exceptions import ValidationError
 from django.utils import timezone
 from datetime import timedelta
 from decimal import Decimal
-from plans.validators import validate_plan_creation_data
+from plans.validators import MAX_INSTALLMENTS, validate_plan_creation_data
 
 class PlanCreationValidatorTests(TestCase):
 
@@ -48,6 +48,21 @@ class PlanCreationValidatorTests(TestCase):
                 start_date=self.valid_start_date
             )
 
+    def test_validator_number_of_installments_above_maximum(self):
+        with self.assertRaisesRegex(ValidationError, f'Number of installments cannot exceed {MAX_INSTALLMENTS}.'):
+            validate_plan_creation_data(
+                total_amount=self.valid_total_amount,
+                number_of_installments=MAX_INSTALLMENTS + 1,
+                start_date=self.valid_start_date
+            )
+
+    def test_validator_number_of_installments_at_maximum(self):
+        validate_plan_creation_data(
+            total_amount=self.valid_total_amount,
+            number_of_installments=MAX_INSTALLMENTS,
+            start_date=self.valid_start_date
+        )
+
     def test_validator_total_amount_zero(self):
         with self.assertRaisesRegex(ValidationError, 'Total amount must be positive.'):
              validate_plan_creation_data(
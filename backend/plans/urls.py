@@ -5,6 +5,12 @@ app_name = 'plans'
 
 urlpatterns = [
     path('create/', views.PaymentPlanCreateView.as_view(), name='create-payment-plan'),
+    path('bulk-create/', views.PaymentPlanBulkCreateView.as_view(), name='bulk-create-payment-plans'),
+    path('quote/', views.PaymentPlanQuoteView.as_view(), name='quote-payment-plans'),
+    path('analytics/', views.MerchantPortfolioView.as_view(), name='merchant-portfolio'),
     path('', views.PaymentPlanListView.as_view(), name='list-payment-plans'),
+    path('<uuid:id>/', views.PaymentPlanDetailView.as_view(), name='payment-plan-detail'),
+    path('<uuid:id>/pay/', views.PaymentPlanPayView.as_view(), name='pay-payment-plan'),
+    path('installments/', views.InstallmentCalendarView.as_view(), name='installment-calendar'),
     path('installments/<uuid:id>/pay/', views.InstallmentPayView.as_view(), name='pay-installment'),
 ]
\ No newline at end of file
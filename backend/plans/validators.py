@@ -3,6 +3,9 @@ from decimal import Decimal, InvalidOperation
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 
+# Every installment is a row, so plans are capped at 10 years of monthly installments
+MAX_INSTALLMENTS = 120
+
 def validate_plan_creation_data(total_amount, number_of_installments, start_date):
     """
     Performs common validation checks for payment plan creation data.
@@ -24,6 +27,8 @@ def validate_plan_creation_data(total_amount, number_of_installments, start_date
     # Validate number_of_installments
     if not isinstance(number_of_installments, int) or number_of_installments <= 0:
         errors['number_of_installments'] = "Number of installments must be a positive integer."
+    elif number_of_installments > MAX_INSTALLMENTS:
+        errors['number_of_installments'] = f"Number of installments cannot exceed {MAX_INSTALLMENTS}."
 
     # Validate start_date
     # Ensure start_date is a date object for comparison
@@ -3,11 +3,21 @@ from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError
 from rest_framework import status
 from accounts.permissions import IsMerchantRole, IsUserRole, IsOwnerOrMerchantOfPlan
-from .models import PaymentPlan, Installment
-from .serializers import PaymentPlanCreateSerializer, PaymentPlanListSerializer, InstallmentPaySerializer, InstallmentSerializer
-from .services import pay_installment
+from .models import PaymentPlan, Installment, MerchantPortfolio
+from .serializers import InstallmentCalendarQuerySerializer, InstallmentCalendarSerializer, MerchantPortfolioSerializer, PaymentPlanCreateSerializer, PaymentPlanBulkCreateSerializer, PaymentPlanListSerializer, PaymentPlanSummarySerializer, PaymentPlanQuoteSerializer, PaymentPlanPaySerializer, InstallmentPaySerializer, InstallmentSerializer
+from .services import (
+    apply_installment_payment, lock_installment_for_payment, lock_plan_for_payment, lock_unpaid_installments,
+    pay_plan_installments, quote_payment_plans
+)
+from .pagination import CreatedAtKeysetPagination
+from .rows import installment_rows, plan_rows, serialize_plan_rows
 from django.contrib.auth import get_user_model
 from django.http import Http404
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+import hashlib
 
 User = get_user_model()
 
@@ -20,28 +30,199 @@ class PaymentPlanCreateView(generics.CreateAPIView):
         serializer.save(merchant=self.request.user)
 
 
-class PaymentPlanListView(generics.ListAPIView):
+class PaymentPlanBulkCreateView(generics.GenericAPIView):
+    serializer_class = PaymentPlanBulkCreateSerializer
+    permission_classes = [permissions.IsAuthenticated, IsMerchantRole]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        result = serializer.save(merchant=request.user)
+
+        # Valid items are created even when others fail; only an all-invalid batch is a bad request
+        response_status = status.HTTP_201_CREATED if result['created'] else status.HTTP_400_BAD_REQUEST
+        return Response(result, status=response_status)
+
+
+class PaymentPlanQuoteView(generics.GenericAPIView):
+    """
+    Prices hypothetical plans without touching the database: returns the installment
+    schedule each plan would get if it were created.
+    """
+    serializer_class = PaymentPlanQuoteSerializer
+    permission_classes = [permissions.IsAuthenticated, IsMerchantRole]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        quotes = quote_payment_plans(serializer.validated_data['plans'])
+        return Response({'quotes': quotes})
+
+
+class ConditionalGetMixin:
+    """
+    Answers a GET whose If-None-Match still matches with 304 Not Modified before anything is
+    fetched or serialized, and sets the ETag on full responses. There is no Last-Modified:
+    its one-second granularity would answer 304 across two writes in the same second.
+
+    Views implement get_fingerprint(), which returns a fingerprint of what the response depends
+    on from one aggregate query, or None to answer normally.
+    """
+    def get(self, request, *args, **kwargs):
+        fingerprint = self.get_fingerprint()
+        if fingerprint is None:
+            return super().get(request, *args, **kwargs)
+
+        # Weak: the same data may be rendered by different renderers
+        etag = 'W/' + quote_etag(hashlib.md5(fingerprint.encode()).hexdigest())
+        response = get_conditional_response(request._request, etag=etag)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = etag
+        return response
+
+
+class PaymentPlanListView(ConditionalGetMixin, generics.ListAPIView):
+    """
+    Lists the plans of the current merchant or user, newest first, one keyset page at a time.
+    Installments are only fetched and nested when requested with ?include=installments.
+    Rows are fetched with values_list() and serialized by plans.rows.
+    """
     serializer_class = PaymentPlanListSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CreatedAtKeysetPagination
 
-    def get_queryset(self):
-        user = self.request.user
-        queryset = PaymentPlan.objects.none()
+    def include_installments(self):
+        return 'installments' in self.request.query_params.get('include', '').split(',')
 
+    def get_serializer_class(self):
+        if self.include_installments():
+            return PaymentPlanListSerializer
+        return PaymentPlanSummarySerializer
+
+    def get_owned_plans(self):
+        user = self.request.user
         if user.role == 'merchant':
-            queryset = PaymentPlan.objects.filter(merchant=user)
+            return PaymentPlan.objects.filter(merchant=user)
         elif user.role == 'user':
-            queryset = PaymentPlan.objects.filter(user=user)
+            return PaymentPlan.objects.filter(user=user)
+        return PaymentPlan.objects.none()
+
+    def get_queryset(self):
+        return plan_rows(self.get_owned_plans()).order_by('-created_at', '-id')
+
+    def list(self, request, *args, **kwargs):
+        # Serialized from value rows rather than model instances (see plans.rows); the shape is
+        # still the one of get_serializer_class()
+        queryset = self.get_queryset()
+        page = self.paginate_queryset(queryset)
+        plans = page if page is not None else list(queryset)
+
+        installments = None
+        if self.include_installments():
+            installments = list(installment_rows([plan.id for plan in plans])) if plans else []
+
+        data = serialize_plan_rows(plans, installments)
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
 
-        return queryset.prefetch_related('installments').order_by('-created_at')
+    def get_fingerprint(self):
+        # Every change to a plan's installments also bumps the plan's updated_at, so the owner's
+        # plans alone cover ?include=installments. The counts catch deleted plans and users, and
+        # the users' updated_at their email changes.
+        aggregate = self.get_owned_plans().aggregate(
+            last_modified=Max('updated_at'), plans=Count('id'), users=Count('user'),
+            users_modified=Max('user__updated_at'), merchants_modified=Max('merchant__updated_at')
+        )
+        modified = '|'.join(
+            aggregate[key].isoformat() if aggregate[key] else ''
+            for key in ('last_modified', 'users_modified', 'merchants_modified')
+        )
+        return (
+            f'{self.request.user.pk}|{self.request.get_full_path()}|{self.get_serializer_class().__name__}|'
+            f'{aggregate["plans"]}|{aggregate["users"]}|{modified}'
+        )
 
 
-class PaymentPlanDetailView(generics.RetrieveAPIView):
-    queryset = PaymentPlan.objects.all().prefetch_related('installments')
+class PaymentPlanDetailView(ConditionalGetMixin, generics.RetrieveAPIView):
+    """
+    Returns one plan with its installments to its user or merchant.
+    """
+    queryset = PaymentPlan.objects.select_related('user', 'merchant').prefetch_related('installments')
     serializer_class = PaymentPlanListSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrMerchantOfPlan]
     lookup_field = 'id'
 
+    def get_fingerprint(self):
+        try:
+            plan = PaymentPlan.objects.filter(id=self.kwargs['id']).values(
+                'user_id', 'merchant_id', 'user__email', 'merchant__email', 'updated_at'
+            ).annotate(
+                installments_updated_at=Max('installments__updated_at'), installment_count=Count('installments')
+            ).get()
+        except PaymentPlan.DoesNotExist:
+            plan = None
+        # Unknown plans and other people's plans take the normal path to their 404 or 403
+        if plan is None or self.request.user.pk not in (plan['user_id'], plan['merchant_id']):
+            return None
+
+        last_modified = max(filter(None, [plan['updated_at'], plan['installments_updated_at']]))
+        return (
+            f'{self.kwargs["id"]}|{plan["installment_count"]}|{last_modified.isoformat()}|'
+            f'{plan["user__email"]}|{plan["merchant__email"]}'
+        )
+
+
+class InstallmentCalendarView(generics.ListAPIView):
+    """
+    Lists the installments of the current merchant's or user's plans due in the ?from=&to= window,
+    optionally of one ?plan=, ordered by due date. Only the calendar fields are fetched, with one
+    query that ranges over the due_date index and joins the plans for ownership.
+    """
+    serializer_class = InstallmentCalendarSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = None
+
+    def get_queryset(self):
+        window = InstallmentCalendarQuerySerializer(data=self.request.query_params)
+        window.is_valid(raise_exception=True)
+        window = window.validated_data
+
+        user = self.request.user
+        if user.role == 'merchant':
+            installments = Installment.objects.filter(plan__merchant=user)
+        elif user.role == 'user':
+            installments = Installment.objects.filter(plan__user=user)
+        else:
+            installments = Installment.objects.none()
+        if 'plan' in window:
+            installments = installments.filter(plan_id=window['plan'])
+
+        return installments.filter(
+            due_date__gte=window['from'], due_date__lte=window['to']
+        ).order_by('due_date', 'id').values('id', 'plan_id', 'due_date', 'amount', 'status')
+
+    def list(self, request, *args, **kwargs):
+        # The date window bounds the result, so it is not paginated
+        rows = list(self.get_queryset())
+        return Response(self.get_serializer(rows, many=True).data)
+
+
+class MerchantPortfolioView(generics.RetrieveAPIView):
+    """
+    Returns the outstanding balance, collected amount, late count and late ratio across all plans
+    of the current merchant, read from its MerchantPortfolio row in one query whatever the number
+    of plans. A merchant without plans gets zeros.
+    """
+    serializer_class = MerchantPortfolioSerializer
+    permission_classes = [permissions.IsAuthenticated, IsMerchantRole]
+
+    def get_object(self):
+        portfolio = MerchantPortfolio.objects.filter(merchant_id=self.request.user.pk).first()
+        return portfolio or MerchantPortfolio(merchant_id=self.request.user.pk)
+
 
 class InstallmentPayView(generics.CreateAPIView):
     serializer_class = InstallmentPaySerializer
@@ -49,27 +230,46 @@ class InstallmentPayView(generics.CreateAPIView):
     queryset = Installment.objects.all()
     lookup_url_kwarg = 'id'
 
-    def get_serializer_context(self):
-        context = super().get_serializer_context()
-
-        if getattr(self, 'swagger_fake_view', False):
-            return context
-
-        installment_id = self.kwargs.get('id')
-        if installment_id:
-            try:
-                context['installment'] = self.queryset.get(id=installment_id)
-            except Installment.DoesNotExist:
-                raise Http404("Installment not found")
-        return context
-
+    @transaction.atomic
     def create(self, request, *args, **kwargs):
-        installment_id = self.kwargs.get('id')
-        serializer = self.get_serializer(data=request.data)
+        # The installment is locked and fetched once, inside the transaction, then validated by the
+        # serializer and paid here. get_serializer() also runs for OPTIONS and the browsable API form,
+        # outside any transaction, so the lock must not be taken while building the serializer.
+        try:
+            installment = lock_installment_for_payment(self.kwargs['id'])
+        except Installment.DoesNotExist:
+            raise Http404("Installment not found")
+        context = {**self.get_serializer_context(), 'installment': installment}
+        serializer = self.get_serializer(data=request.data, context=context)
         serializer.is_valid(raise_exception=True)
 
         try:
-            updated_installment = pay_installment(installment_id, request.user.id)
+            updated_installment = apply_installment_payment(installment)
             return Response(InstallmentSerializer(updated_installment).data)
         except ValidationError as e:
-            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class PaymentPlanPayView(generics.GenericAPIView):
+    serializer_class = PaymentPlanPaySerializer
+    permission_classes = [permissions.IsAuthenticated, IsUserRole]
+    lookup_url_kwarg = 'id'
+
+    @transaction.atomic
+    def post(self, request, *args, **kwargs):
+        # The plan and its unpaid installments are locked once, inside the transaction, then
+        # validated by the serializer and paid here (see InstallmentPayView.create)
+        try:
+            plan = lock_plan_for_payment(self.kwargs['id'])
+        except PaymentPlan.DoesNotExist:
+            raise Http404("Payment plan not found")
+        unpaid = lock_unpaid_installments(plan)
+        context = {**self.get_serializer_context(), 'plan': plan, 'unpaid_installments': unpaid}
+        serializer = self.get_serializer(data=request.data, context=context)
+        serializer.is_valid(raise_exception=True)
+
+        paid = pay_plan_installments(plan, unpaid, serializer.validated_data['installments'])
+        return Response({
+            'paid': InstallmentSerializer(paid, many=True).data,
+            'plan': PaymentPlanSummarySerializer(plan).data,
+        })
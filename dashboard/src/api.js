@@ -102,12 +102,26 @@ const fetchAuthenticated = async (url, options = {}) => {
   return processResponse(response);
 };
 
-export const getUsers = async () => {
-  return fetchAuthenticated(`${API_URL}/accounts/users/`);
+export const getUsers = async (q = "") => {
+  const params = new URLSearchParams(q ? { q } : {});
+  const page = await fetchAuthenticated(`${API_URL}/accounts/users/?${params}`);
+  return page.results;
 };
 
-export const getPlans = async () => {
-  return fetchAuthenticated(`${API_URL}/plans/`);
+// The plan list is cursor paginated: each call returns one page, starting
+// from the cursor of the previous page's next link (the first page if none).
+export const getPlans = async ({ pageParam = null } = {}) => {
+  const params = new URLSearchParams(pageParam ? { cursor: pageParam } : {});
+  return fetchAuthenticated(`${API_URL}/plans/?${params}`);
+};
+
+export const getNextPlansCursor = (page) =>
+  page.next ? new URL(page.next).searchParams.get("cursor") : undefined;
+
+export const getInstallmentCalendar = async ({ from, to, plan }) => {
+  const params = new URLSearchParams({ from, to });
+  if (plan) params.set("plan", plan);
+  return fetchAuthenticated(`${API_URL}/plans/installments/?${params}`);
 };
 
 export const createPlan = async (planData) => {
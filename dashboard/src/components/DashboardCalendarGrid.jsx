@@ -1,5 +1,7 @@
 import { useState, useEffect } from "react";
+import { useQuery } from "@tanstack/react-query";
 import { ChevronLeftIcon, ChevronRightIcon } from "@heroicons/react/20/solid";
+import { getInstallmentCalendar } from "../api";
 
 function classNames(...classes) {
   return classes.filter(Boolean).join(" ");
@@ -90,12 +92,24 @@ const getDaysInMonth = (year, month, installments) => {
   return days.slice(0, 42);
 };
 
-const DashboardCalendarGrid = ({ installments, onDateStringSelect }) => {
+const getMonthWindow = (year, month) => ({
+  from: new Date(Date.UTC(year, month, 1)).toISOString().split("T")[0],
+  to: new Date(Date.UTC(year, month + 1, 0)).toISOString().split("T")[0],
+});
+
+const DashboardCalendarGrid = ({ planId, onDateStringSelect }) => {
   const [currentMonth, setCurrentMonth] = useState(new Date().getMonth());
   const [currentYear, setCurrentYear] = useState(new Date().getFullYear());
   const [days, setDays] = useState([]);
   const [selectedDateStr, setSelectedDateStr] = useState(null);
 
+  // Only the installments due in the visible month are fetched
+  const { from, to } = getMonthWindow(currentYear, currentMonth);
+  const { data: installments } = useQuery({
+    queryKey: ["installmentCalendar", planId, from, to],
+    queryFn: () => getInstallmentCalendar({ from, to, plan: planId }),
+  });
+
   useEffect(() => {
     setDays(getDaysInMonth(currentYear, currentMonth, installments));
   }, [currentYear, currentMonth, installments]);
@@ -132,7 +146,10 @@ const DashboardCalendarGrid = ({ installments, onDateStringSelect }) => {
     setSelectedDateStr(day.date);
 
     if (onDateStringSelect) {
-      onDateStringSelect(day.date);
+      onDateStringSelect(
+        day.date,
+        installments?.filter((inst) => inst.due_date === day.date) || []
+      );
     }
   };
 
@@ -12,6 +12,7 @@ const InstallmentDetails = ({ installments }) => {
     mutationFn: payInstallment,
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ["userPlans"] });
+      queryClient.invalidateQueries({ queryKey: ["installmentCalendar"] });
     },
     onError: (error) => {
       console.error("Payment failed:", error);
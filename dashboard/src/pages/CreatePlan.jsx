@@ -8,6 +8,7 @@ const CreatePlanPage = () => {
   const navigate = useNavigate();
   const queryClient = useQueryClient();
 
+  const [userSearch, setUserSearch] = useState("");
   const [selectedUser, setSelectedUser] = useState("");
   const [amount, setAmount] = useState("");
   const [installments, setInstallments] = useState("");
@@ -19,8 +20,9 @@ const CreatePlanPage = () => {
     isError: isErrorUsers,
     error: errorUsers,
   } = useQuery({
-    queryKey: ["users"],
-    queryFn: getUsers,
+    // Customers are searched by email prefix on the server, one page at a time
+    queryKey: ["users", userSearch],
+    queryFn: () => getUsers(userSearch),
   });
 
   const mutation = useMutation({
@@ -62,6 +64,14 @@ const CreatePlanPage = () => {
           >
             Select User
           </label>
+          <input
+            type="search"
+            id="user-search"
+            value={userSearch}
+            onChange={(e) => setUserSearch(e.target.value.trim())}
+            placeholder="Search by email"
+            className="mt-1 block w-full rounded-lg border-border-default shadow-sm focus:border-input-focus focus:ring focus:ring-input-focus focus:ring-opacity-50 py-2 px-3 text-text-primary"
+          />
           <select
             id="user"
             value={selectedUser}
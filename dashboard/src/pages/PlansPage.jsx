@@ -1,8 +1,8 @@
-import { useState, useEffect } from "react";
-import { useQuery } from "@tanstack/react-query";
+import { useState, useEffect, useMemo } from "react";
+import { useInfiniteQuery } from "@tanstack/react-query";
 import DashboardCalendarGrid from "../components/DashboardCalendarGrid";
 import InstallmentDetails from "../components/InstallmentDetails";
-import { getPlans } from "../api";
+import { getPlans, getNextPlansCursor } from "../api";
 import DashboardContent from "../components/DashboardContent";
 import { useNavigate } from "react-router-dom";
 import { useCurrentUser } from "../hooks/useCurrentUser";
@@ -18,14 +18,23 @@ const PlansPage = () => {
   const user = useCurrentUser();
 
   const {
-    data: plans,
+    data,
     isLoading,
     isError,
     error,
-  } = useQuery({
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+  } = useInfiniteQuery({
     queryKey: ["userPlans"],
     queryFn: getPlans,
+    initialPageParam: null,
+    getNextPageParam: getNextPlansCursor,
   });
+  const plans = useMemo(
+    () => data?.pages.flatMap((page) => page.results),
+    [data]
+  );
 
   useEffect(() => {
     if (plans && plans.length > 0 && !selectedPlan) {
@@ -59,17 +68,8 @@ const PlansPage = () => {
     );
   }
 
-  const allInstallments = selectedPlan?.installments || [];
-
-  const handleDateStringSelect = (selectedDateString) => {
-    if (selectedDateString) {
-      const matchingInstallments = allInstallments.filter(
-        (inst) => inst.due_date === selectedDateString
-      );
-      setSelectedInstallmentsList(matchingInstallments);
-    } else {
-      setSelectedInstallmentsList([]);
-    }
+  const handleDateStringSelect = (selectedDateString, dayInstallments) => {
+    setSelectedInstallmentsList(selectedDateString ? dayInstallments : []);
   };
 
   const handlePlanSelect = (plan) => {
@@ -117,7 +117,7 @@ const PlansPage = () => {
                     {plan.user_email}
                   </p>
                   <p className="text-xs text-text-secondary">
-                    {plan?.installments?.length} Installments
+                    {plan?.number_of_installments} Installments
                   </p>
                   <p className="text-xs text-text-secondary">
                     Total:{" "}
@@ -128,6 +128,16 @@ const PlansPage = () => {
                   </p>
                 </button>
               ))}
+              {hasNextPage && (
+                <button
+                  type="button"
+                  onClick={() => fetchNextPage()}
+                  disabled={isFetchingNextPage}
+                  className="p-2 rounded-lg w-full border border-divider text-sm text-text-secondary hover:bg-gray-50 disabled:opacity-50"
+                >
+                  {isFetchingNextPage ? "Loading..." : "Load more"}
+                </button>
+              )}
             </div>
           ) : (
             <div className="text-text-secondary mt-6">
@@ -150,7 +160,7 @@ const PlansPage = () => {
                   </span>
                 </h3>
                 <DashboardCalendarGrid
-                  installments={allInstallments}
+                  planId={selectedPlan.id}
                   onDateStringSelect={handleDateStringSelect}
                 />
               </div>